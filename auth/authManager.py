@@ -5,9 +5,12 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.database import get_db
+from auth.password_hashing import password_hashing_pool
+from auth.principal_cache import principal_cache
+from db.database import get_async_db
 # Import new models, schemas, and db dependency
 from entities.entities import TUser
 
@@ -28,6 +31,10 @@ def get_password_hash(password):
     """Hashes a password."""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password, hashed_password):
+    """Verifies a password on the bounded hashing pool instead of the event loop."""
+    return await password_hashing_pool.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(user: TUser, expires_delta: Optional[timedelta] = None):
     """Creates a new access token for a given user."""
     to_encode = {"sub": str(user.id), "user_type": user.user_type}
@@ -41,22 +48,24 @@ def create_access_token(user: TUser, expires_delta: Optional[timedelta] = None):
 
 # --- Database User Functions ---
 
-def get_user(db: Session, login_id: str) -> Optional[TUser]:
+async def get_user(db: AsyncSession, login_id: str) -> Optional[TUser]:
     """Finds a user by login_id in the database."""
-    return db.query(TUser).filter(TUser.login_id == login_id).first()
+    result = await db.execute(select(TUser).filter(TUser.login_id == login_id).limit(1))
+    return result.scalars().first()
 
-def get_user_by_line_id(db: Session, line_id: str) -> Optional[TUser]:
+async def get_user_by_line_id(db: AsyncSession, line_id: str) -> Optional[TUser]:
     """Finds a user by line_id in the database."""
-    return db.query(TUser).filter(TUser.line_id == line_id).first()
+    result = await db.execute(select(TUser).filter(TUser.line_id == line_id).limit(1))
+    return result.scalars().first()
 
-def get_user_by_id(db: Session, user_id: int) -> Optional[TUser]:
+async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[TUser]:
     """Finds a user by ID in the database."""
-    return db.query(TUser).filter(TUser.id == user_id).first()
+    return await db.get(TUser, user_id)
 
 # --- Authentication Dependencies ---
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> TUser:
-    """Decodes token and returns the current user from DB."""
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> TUser:
+    """Decodes token and returns the current user (from the principal cache, or DB on a miss)."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -71,7 +80,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except (JWTError, ValueError):
         raise credentials_exception
     
-    user = get_user_by_id(db=db, user_id=user_id)
+    cached = principal_cache.get(user_id, token)
+    if cached is not None:
+        # load=False: 캐시된 스냅샷을 SELECT 없이 이 세션의 객체로 복사한다. (스냅샷 자체는 공유되지 않음)
+        user = await db.merge(cached, load=False)
+    else:
+        user = await get_user_by_id(db=db, user_id=user_id)
+        if user is not None:
+            principal_cache.set(user_id, token, user)
     if user is None or user.user_type != user_type_from_token:
         raise credentials_exception
     return user
@@ -0,0 +1,26 @@
+"""운영용 엔드포인트(GET /metrics, /health/db-pool, /health/password-hashing) 접근 제어.
+
+풀 상태, 라우트별 지연, SQL 횟수는 외부에 공개하지 않는다. METRICS_TOKEN 을 설정한 경우에만 열리며,
+`Authorization: Bearer <METRICS_TOKEN>` 이 일치하는 요청만 받는다. (Prometheus 의 bearer_token 설정과 같은 형식)
+설정하지 않으면 엔드포인트가 없는 것처럼 404 를 반환한다.
+"""
+import hmac
+import os
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+METRICS_TOKEN: Optional[str] = os.environ.get("METRICS_TOKEN") or None
+
+
+def require_metrics_token(request: Request) -> None:
+    """운영용 엔드포인트의 의존성. 토큰이 없거나 다르면 HTTPException."""
+    if METRICS_TOKEN is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
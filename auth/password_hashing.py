@@ -0,0 +1,90 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# bcrypt 는 해시 계산 중 GIL 을 해제하므로 스레드 풀에서 병렬로 실행된다.
+# 0 이면 이벤트 루프에서 직접 실행한다. (이전 동작, 벤치마크 비교용)
+WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "2"))
+
+
+class PasswordHashingPool:
+    """bcrypt 검증(로그인)을 전용 스레드 풀에서 실행하고 대기열 지표를 기록합니다.
+
+    동시에 실행되는 작업 수는 workers 로 제한되며, 초과분은 세마포어에서 대기한다.
+    """
+
+    def __init__(self, workers: int = WORKERS):
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.submitted = 0
+        self.completed = 0
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.run_seconds_total = 0.0
+
+    def _ensure_started(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 세마포어는 이벤트 루프에 묶이므로 루프가 바뀌면 새로 만든다. (테스트 클라이언트 등)
+            self._semaphore = asyncio.Semaphore(self.workers)
+            self._loop = loop
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers <= 0:
+            return fn(*args)
+        self._ensure_started()
+        submitted_at = time.perf_counter()
+        self.submitted += 1
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            waited = time.perf_counter() - submitted_at
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            self.running += 1
+            started_at = time.perf_counter()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            finally:
+                self.running -= 1
+                self.completed += 1
+                self.run_seconds_total += time.perf_counter() - started_at
+        finally:
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.completed
+        return {
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "completed": completed,
+            "waiting": self.waiting,
+            "running": self.running,
+            "max_waiting": self.max_waiting,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "run_seconds_avg": round(self.run_seconds_total / completed, 6) if completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._semaphore = None
+            self._loop = None
+
+
+password_hashing_pool = PasswordHashingPool()
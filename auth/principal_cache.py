@@ -0,0 +1,108 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from entities.entities import TUser
+
+# 다른 워커에서의 변경(정보 수정, 소프트 삭제)은 최대 이 시간(초)까지 늦게 반영된다. 0 이면 캐시하지 않는다.
+TTL_SECONDS = float(os.environ.get("AUTH_CACHE_TTL_SECONDS", "30"))
+MAX_ENTRIES = int(os.environ.get("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+_PENDING_KEY = "principal_cache_invalidations"
+
+
+def snapshot_user(user: TUser) -> TUser:
+    """세션에 속하지 않는(detached) 읽기 전용 복사본을 만듭니다. 원본은 건드리지 않습니다."""
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(TUser).column_attrs}
+    copy = TUser(**values)
+    make_transient_to_detached(copy)
+    return copy
+
+
+class PrincipalCache:
+    """(user_id, token) 을 키로 인증된 사용자 스냅샷을 보관하는 TTL + LRU 캐시."""
+
+    def __init__(self, ttl_seconds: float = TTL_SECONDS, max_entries: int = MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, TUser]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[Tuple[int, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, token: str) -> Optional[TUser]:
+        key = (user_id, token)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry[0]:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, user_id: int, token: str, user: TUser) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        key = (user_id, token)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, snapshot_user(user))
+        self._entries.move_to_end(key)
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        for key in self._keys_by_user.pop(user_id, ()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_user.clear()
+
+    def _remove(self, key: Tuple[int, str]) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+
+principal_cache = PrincipalCache()
+
+
+def _schedule_invalidation(session: Session, user_id: int) -> None:
+    session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+def invalidate_user_on_commit(db: AsyncSession, user_id: int) -> None:
+    """커밋 후 해당 사용자의 캐시를 무효화하도록 예약합니다. (utils.availability_cache.invalidate_on_commit 과 같은 형태)
+
+    ORM 을 거치지 않는 UPDATE(update(TUser) 등)처럼 after_flush 에서 잡히지 않는 변경에 사용한다.
+    """
+    _schedule_invalidation(db.sync_session, user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    # update_users_me, update_patient_info, 소프트 삭제(deleted_flag) 등 TUser 행이 바뀌면 무효화 대상에 넣는다.
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, TUser) and obj.id is not None:
+            _schedule_invalidation(session, obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
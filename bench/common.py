@@ -0,0 +1,106 @@
+"""벤치마크 공용 도우미: 로컬 SQLite(aiosqlite) 로 앱을 띄우고 기본 데이터를 넣는다.
+
+main 을 import 하기 전에 환경 변수를 설정해야 하므로, 벤치마크 스크립트는
+다른 앱 모듈보다 먼저 `bench.common.load_app()` 을 호출한다.
+"""
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+
+BENCH_DB_PATH = os.path.join(tempfile.gettempdir(), "badara_bench.db")
+
+
+def load_app(db_path: str = BENCH_DB_PATH, url: Optional[str] = None):
+    """SQLite 파일 DB 를 사용하도록 환경을 설정하고 FastAPI 앱을 반환합니다.
+
+    url 을 주면 그 DB(MySQL 등)를 사용한다. 고정 ID 로 데이터를 넣으므로 빈 데이터베이스여야 한다.
+    """
+    if url is None and os.path.exists(db_path):
+        os.remove(db_path)
+    os.environ["USE_REAL_DB"] = "false"
+    os.environ["DATABASE_URL"] = url or f"sqlite+aiosqlite:///{db_path}"
+    os.environ.pop("DATABASE_REPLICA_URL", None)
+    os.environ.setdefault("DB_ECHO", "false")
+    import logging
+    logging.disable(logging.INFO)
+    import main
+    return main.app
+
+
+async def create_schema() -> None:
+    import db.database
+    from entities.entities import TUser
+    async with db.database.async_engine.begin() as conn:
+        await conn.run_sync(TUser.metadata.create_all)
+
+
+async def seed_hospital(admin_password: str = "password") -> None:
+    """병원 1곳과 병원 관리자(login_id=admin) 1명을 넣습니다."""
+    import db.database
+    from auth import authManager
+    from entities.entities import THospital, TUser
+    async with db.database.AsyncSessionLocal() as session:
+        session.add(THospital(
+            id=1, hospital_code="H001", name="ベンチ病院", postal_code="000-0000",
+            address="東京都", phone="03-0000-0000", line_qr_code=b"\x89PNG" + bytes(2048), treatment="一般歯科,矯正",
+        ))
+        session.add(TUser(
+            id=1, hospital_id=1, login_id="admin", email="admin@example.com",
+            password=authManager.get_password_hash(admin_password), user_type="1",
+            last_name="管理", first_name="者", contact="000",
+        ))
+        await session.commit()
+
+
+
+def patient_values(i: int) -> Dict[str, Any]:
+    """i 번째 벤치 환자의 컬럼 값. id = 100 + i, line_id = LINE{i}, medical_record_no = MR{i}, 병원 1."""
+    return {
+        "id": 100 + i, "hospital_id": 1, "line_id": f"LINE{i}", "medical_record_no": f"MR{i}", "user_type": "0",
+        "last_name": "患者", "first_name": str(i), "contact": "000",
+    }
+
+
+async def seed_patients(count: int, **columns: Union[Any, Callable[[int], Any]]) -> None:
+    """patient_values(0..count-1) 의 환자를 일괄 INSERT 합니다.
+
+    columns 로 컬럼 값을 바꾼다. 호출 가능한 값은 i 를 받아 행마다의 값을 반환한다.
+    (예: medical_record_no=lambda i: f"MR{i}" if i % 5 else None)
+    """
+    import db.database
+    from sqlalchemy import insert
+    from entities.entities import TUser
+    rows = []
+    for i in range(count):
+        row = patient_values(i)
+        for name, value in columns.items():
+            row[name] = value(i) if callable(value) else value
+        rows.append(row)
+    async with db.database.AsyncSessionLocal() as session:
+        await session.execute(insert(TUser.__table__), rows)
+        await session.commit()
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """초 단위 샘플을 ms 단위 요약 통계로 변환합니다."""
+    ordered = sorted(samples)
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(pct(0.50), 3),
+        "p95_ms": round(pct(0.95), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def timed(fn, *args, repeat: int = 1000, **kwargs) -> Dict[str, float]:
+    """동기 함수를 repeat 회 실행하여 1회당 소요 시간을 요약합니다."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
@@ -0,0 +1,249 @@
+"""요청마다 실행되는 순수 함수(핫 패스) 마이크로벤치마크와 기준값(baseline) 비교.
+
+사용법:
+    python -m bench.hot_paths                  # 측정 후 bench/baseline.json 과 비교 (회귀 시 종료 코드 1)
+    python -m bench.hot_paths --save           # 측정 결과로 bench/baseline.json 을 갱신
+    python -m bench.hot_paths --only cursor    # 이름에 cursor 가 들어간 항목만
+
+DB 와 HTTP 를 거치지 않고 다음을 1회 호출 단위(µs)로 잰다.
+
+- slot_engine.compute_availability: GET /api/reservations/available_slots 의 15일치 슬롯 계산 (휴일 set / 휴무일 캘린더)
+- holiday_calendar: 15일치 휴무 여부 판정 (예약 생성 시의 휴일 확인과 같은 연산)
+- authManager.create_access_token / JWT 디코드 (get_current_user 와 같은 jwt.decode 호출)
+- hashid_manager.encode_id / decode_id (메모 캐시 적중), id_codec 직접 호출 (캐시 미적중에 해당)
+- utils.cursor.encode_cursor / decode_cursor
+- utils.i18n.translate_detail: 고정 문구, 동적 문구, 번역 대상이 아닌 문구
+- Hospital / UserWithLastReserve: 엔티티 → 스키마 검증 → JSON 직렬화
+
+각 항목은 한 라운드가 --round-ms 이상 걸리도록 호출 횟수를 정해 --rounds 라운드 반복하고,
+라운드별 1회 평균의 중앙값(median_us)과 최솟값(min_us)을 기록한다. 다른 프로세스의 간섭을 덜 받도록
+비교는 min_us 기준이며, 기준값 대비 --tolerance 배(기본 2배)를 넘으면 회귀로 본다.
+기준값은 측정한 머신에 따라 달라지므로, 같은 머신에서 변경 전 --save → 변경 후 비교 순으로 쓰고
+의도한 성능 변화가 있으면 baseline.json 갱신분을 PR 에 함께 올린다.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Callable, Dict, List, Optional
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _slot_cases() -> Dict[str, Callable[[], object]]:
+    from routers.reservationRouter import RESERVATION_LEAD_TIME
+    from utils import holiday_calendar, slot_engine
+
+    now = datetime(2025, 1, 6, 10, 15)
+    date_range = [now.date() + timedelta(days=i) for i in range(15)]
+    holidays = {date_range[6], date_range[13]}
+    # 평일 오전이 대부분 찬 병원: 날마다 슬롯의 절반 정도가 예약되어 있다.
+    booked = {d: [dtime(9 + h, m) for h in range(5) for m in (0, 30)] for d in date_range[:10]}
+    week = slot_engine.DEFAULT_WEEK
+
+    # 단일 휴일 + 매주 일요일 + 국가 공휴일 + 여름 휴업 기간을 가진 병원
+    calendar = holiday_calendar.compile_calendar(holidays, [
+        holiday_calendar.HolidayRule("weekly", 6, None, None, None),
+        holiday_calendar.HolidayRule("national", None, "jp", None, None),
+        holiday_calendar.HolidayRule("range", None, None, date(2025, 8, 13), date(2025, 8, 16)),
+    ])
+    return {
+        "slot_engine.compute_availability[15d]": lambda: slot_engine.compute_availability(
+            week, date_range, holidays, booked, now, RESERVATION_LEAD_TIME
+        ),
+        "slot_engine.compute_availability[15d,calendar]": lambda: slot_engine.compute_availability(
+            week, date_range, calendar, booked, now, RESERVATION_LEAD_TIME
+        ),
+        "holiday_calendar.is_closed[15d]": lambda: [day in calendar for day in date_range],
+    }
+
+
+def _auth_cases() -> Dict[str, Callable[[], object]]:
+    from jose import jwt
+    from auth import authManager
+    from entities.entities import TUser
+
+    user = TUser(id=12345, user_type="0")
+    token = authManager.create_access_token(user)
+
+    def decode():
+        return jwt.decode(token, authManager.TOKEN_SECRET_KEY, algorithms=[authManager.TOKEN_ALGORITHM])
+
+    return {
+        "authManager.create_access_token": lambda: authManager.create_access_token(user),
+        "jwt.decode": decode,
+    }
+
+
+def _hashid_cases() -> Dict[str, Callable[[], object]]:
+    from utils import hashid_manager
+
+    hashed = hashid_manager.encode_id(12345)
+    hashid_manager.decode_id(hashed)
+    codec = hashid_manager.codec
+    return {
+        "hashid_manager.encode_id": lambda: hashid_manager.encode_id(12345),
+        "hashid_manager.decode_id": lambda: hashid_manager.decode_id(hashed),
+        "id_codec.encode": lambda: codec.encode(12345),
+        "id_codec.decode": lambda: codec.decode(hashed),
+    }
+
+
+def _cursor_cases() -> Dict[str, Callable[[], object]]:
+    from utils import cursor
+
+    # 예약 목록 커서와 같은 형태
+    payload = {"date": "2025-01-06", "time": "10:30:00", "id": 123456}
+    token = cursor.encode_cursor(payload)
+    return {
+        "cursor.encode_cursor": lambda: cursor.encode_cursor(payload),
+        "cursor.decode_cursor": lambda: cursor.decode_cursor(token),
+    }
+
+
+def _i18n_cases() -> Dict[str, Callable[[], object]]:
+    from utils.i18n import translate_detail
+
+    dynamic = "Patient with medical record number 'MR0001' not found in this hospital."
+    return {
+        "translate_detail[exact]": lambda: translate_detail("Reservation not found"),
+        "translate_detail[dynamic]": lambda: translate_detail(dynamic),
+        "translate_detail[unknown]": lambda: translate_detail("Something unexpected happened"),
+    }
+
+
+def _schema_cases() -> Dict[str, Callable[[], object]]:
+    from entities.entities import THospital, TUser
+    from schemas.hospital import Hospital
+    from schemas.user import UserWithLastReserve
+
+    hospital = THospital(
+        id=1, hospital_code="H001", name="ベンチ病院", postal_code="000-0000", address="東京都",
+        phone="03-0000-0000", line_qr_code=b"\x89PNG" + bytes(2048), treatment="一般歯科,矯正,小児歯科",
+    )
+    patient = TUser(
+        id=100, hospital_id=1, line_id="LINE100", login_id=None, email=None, user_type="0",
+        last_name="患者", first_name="太郎", contact="090-0000-0000", medical_record_no="MR100",
+    )
+    last_reserve = datetime(2025, 1, 6, 10, 30)
+
+    def patient_row():
+        data = UserWithLastReserve.model_validate(patient).model_dump()
+        data["last_reserve_date"] = last_reserve
+        return UserWithLastReserve.model_validate(data).model_dump_json()
+
+    return {
+        "Hospital.from_entity+dump_json": lambda: Hospital.from_entity(hospital).model_dump_json(),
+        "UserWithLastReserve.validate+dump_json": patient_row,
+    }
+
+
+CASE_GROUPS = (_slot_cases, _auth_cases, _hashid_cases, _cursor_cases, _i18n_cases, _schema_cases)
+
+
+def _calibrate(fn: Callable[[], object], round_seconds: float) -> int:
+    """한 라운드가 round_seconds 이상 걸리는 호출 횟수를 구합니다. (timeit.autorange 와 같은 방식)"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= round_seconds:
+            return number
+        number *= 2
+
+
+def measure(fn: Callable[[], object], rounds: int, round_seconds: float) -> Dict[str, float]:
+    """한 라운드가 round_seconds 이상이 되도록 호출 횟수를 정해 rounds 라운드 반복하고, 1회당 µs 를 요약합니다."""
+    number = _calibrate(fn, round_seconds)
+    per_call: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        "number": number,
+        "median_us": round(statistics.median(per_call), 3),
+        "min_us": round(min(per_call), 3),
+    }
+
+
+def run(rounds: int, round_seconds: float, only: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for group in CASE_GROUPS:
+        for name, fn in group().items():
+            if only and only not in name:
+                continue
+            results[name] = measure(fn, rounds, round_seconds)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """기준값 대비 결과를 출력하고, tolerance 배를 넘은 항목 이름을 반환합니다."""
+    regressions = []
+    width = max(len(name) for name in results)
+    print(f"{'case':<{width}}  {'baseline_us':>12}  {'min_us':>12}  {'ratio':>6}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<{width}}  {'-':>12}  {result['min_us']:>12.3f}  {'new':>6}")
+            continue
+        ratio = result["min_us"] / base["min_us"] if base["min_us"] else float("inf")
+        flag = ""
+        if ratio > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<{width}}  {base['min_us']:>12.3f}  {result['min_us']:>12.3f}  {ratio:>6.2f}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--round-ms", type=float, default=50, help="라운드당 최소 측정 시간")
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 항목만 측정")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=2.0, help="회귀로 판단하는 기준값 대비 배율")
+    parser.add_argument("--save", action="store_true", help="비교하지 않고 결과를 기준값으로 저장")
+    args = parser.parse_args()
+
+    results = run(args.rounds, args.round_ms / 1000, args.only)
+
+    if args.save:
+        baseline = {}
+        if args.only and os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)["cases"]
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "rounds": args.rounds,
+                "round_ms": args.round_ms,
+                "cases": baseline,
+            }, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    if not os.path.exists(args.baseline):
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        print(f"baseline not found: {args.baseline} (--save 로 생성)", file=sys.stderr)
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["cases"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"REGRESSION: {', '.join(regressions)} (> x{args.tolerance})", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
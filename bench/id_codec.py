@@ -0,0 +1,66 @@
+"""공개 ID 코덱 마이크로벤치마크: hashids 라이브러리 vs utils.id_codec vs hashid_manager(메모 캐시).
+
+사용법:
+    python -m bench.id_codec [--ids 2000] [--repeat 50]
+
+2000 명 환자 목록 한 페이지처럼 연속된 ID --ids 개를 인코딩/디코딩하는 시간을 잰다.
+먼저 세 경로의 결과가 같은지 확인한다.
+"""
+import argparse
+import json
+import random
+
+from bench.common import timed
+
+
+def _check_compatible(reference, codec, samples: int = 50000) -> None:
+    ids = list(range(samples)) + [random.randrange(10 ** 12) for _ in range(samples)]
+    for n in ids:
+        hashed = reference.encode(n)
+        assert codec.encode(n) == hashed, n
+        assert codec.decode(hashed) == n, hashed
+
+
+def run(count: int, repeat: int) -> dict:
+    from utils import hashid_manager
+
+    reference = hashid_manager.hashids
+    codec = hashid_manager.codec
+    _check_compatible(reference, codec)
+
+    ids = list(range(1, count + 1))
+    hashed = [reference.encode(n) for n in ids]
+
+    def page(fn, values):
+        for v in values:
+            fn(v)
+
+    # 메모 캐시를 채운 뒤(같은 페이지를 다시 요청하는 경우)의 시간
+    page(hashid_manager.encode_id, ids)
+    page(hashid_manager.decode_id, hashed)
+
+    return {
+        "ids": count,
+        "encode_page": {
+            "hashids": timed(page, reference.encode, ids, repeat=repeat),
+            "id_codec": timed(page, codec.encode, ids, repeat=repeat),
+            "hashid_manager (cached)": timed(page, hashid_manager.encode_id, ids, repeat=repeat),
+        },
+        "decode_page": {
+            "hashids": timed(page, reference.decode, hashed, repeat=repeat),
+            "id_codec": timed(page, codec.decode, hashed, repeat=repeat),
+            "hashid_manager (cached)": timed(page, hashid_manager.decode_id, hashed, repeat=repeat),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ids", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.ids, args.repeat), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""목록 엔드포인트 응답 직렬화 마이크로벤치마크.
+
+사용법:
+    python -m bench.json_response [--rows 2000] [--repeat 30]
+
+환자 목록(GET /api/me/patients)과 환자 정보를 포함한 예약 목록(GET /api/hospital/reservations)
+한 페이지 분량의 데이터로 다음 경로를 비교한다. (DB 조회 제외, 응답 본문 bytes 를 만드는 데까지)
+
+- patients: 라우터에서 조립한 dict → JSONResponse(json.dumps) vs FastJSONResponse(orjson)
+- reservations: response_model 검증 후
+    - json.dumps:   field.serialize → JSONResponse (기본 응답 클래스를 명시한 경우의 경로)
+    - orjson:       field.serialize → FastJSONResponse
+    - dump_json:    Pydantic 이 바로 JSON bytes 생성 (FastJSONRoute 가 유지하는 현재 경로)
+"""
+import argparse
+import json
+from datetime import date, datetime, time as dtime, timedelta
+
+from bench.common import patient_values, timed
+
+
+def _patient_page(rows: int) -> dict:
+    from utils import hashid_manager
+    base = datetime(2025, 1, 1, 9, 0)
+    return {
+        "patients": [
+            {
+                "email": None, "line_id": f"LINE{i}", "login_id": None, "user_type": "0",
+                "last_name": f"患者{i % 97:02d}", "first_name": f"太郎{i}", "contact": "090-0000-0000",
+                "id": hashid_manager.encode_id(100 + i), "hospital_id": hashid_manager.encode_id(1),
+                "medical_record_no": f"MR{i}",
+                "last_reserve_date": (base + timedelta(hours=i)).isoformat(" ", "seconds") if i % 3 else None,
+            }
+            for i in range(rows)
+        ],
+        "next_cursor": None,
+        "hasnext": False,
+    }
+
+
+def _reservation_page(rows: int) -> dict:
+    from entities.entities import TReservation, TUser
+    patients = [
+        TUser(**patient_values(i), email=None, login_id=None)
+        for i in range(500)
+    ]
+    reservations = []
+    for i in range(rows):
+        r = TReservation(
+            id=1000 + i, user_id=100 + i % 500, hospital_id=1,
+            reservation_date=date(2025, 1, 1) + timedelta(days=i // 20), reservation_time=dtime(9 + (i % 20) // 2, 30 * (i % 2)),
+            treatment="定期検診", cancel_date=None, deleted_flag=False,
+        )
+        r.patient = patients[i % 500]
+        reservations.append(r)
+    return {"reservations": reservations, "next_cursor": None, "hasnext": False}
+
+
+def run(rows: int, repeat: int) -> dict:
+    from fastapi._compat import ModelField
+    from fastapi.utils import create_model_field
+    from starlette.responses import JSONResponse
+    from schemas import ReservationListCursorResponse
+    from utils.json_response import FastJSONResponse
+
+    patients = _patient_page(rows)
+    assert json.loads(JSONResponse(patients).body) == json.loads(FastJSONResponse(patients).body)
+
+    field: ModelField = create_model_field(name="response", type_=ReservationListCursorResponse, mode="serialization")
+    content = _reservation_page(rows)
+
+    def validate():
+        value, errors = field.validate(content, {}, loc=("response",))
+        assert not errors, errors
+        return value
+
+    def via_json_dumps():
+        return JSONResponse(field.serialize(validate())).body
+
+    def via_orjson():
+        return FastJSONResponse(field.serialize(validate())).body
+
+    def via_dump_json():
+        return field.serialize_json(validate())
+
+    assert json.loads(via_json_dumps()) == json.loads(via_orjson()) == json.loads(via_dump_json())
+
+    return {
+        "rows": rows,
+        "patients": {
+            "json.dumps": timed(lambda: JSONResponse(patients).body, repeat=repeat),
+            "orjson": timed(lambda: FastJSONResponse(patients).body, repeat=repeat),
+        },
+        "reservations_with_patient": {
+            "validate_only": timed(validate, repeat=repeat),
+            "json.dumps": timed(via_json_dumps, repeat=repeat),
+            "orjson": timed(via_orjson, repeat=repeat),
+            "dump_json": timed(via_dump_json, repeat=repeat),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeat), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
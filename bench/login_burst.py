@@ -0,0 +1,71 @@
+"""관리자 로그인(bcrypt) 폭주가 다른 엔드포인트 지연에 주는 영향을 측정합니다.
+
+사용법:
+    python -m bench.login_burst [--logins 40] [--workers 2]
+
+같은 프로세스에서 두 가지 모드를 비교한다.
+- inline: bcrypt 를 이벤트 루프에서 직접 실행 (이전 동작)
+- pool:   auth.password_hashing 의 전용 스레드 풀에서 실행
+로그인 요청을 동시에 보내는 동안 `GET /` 를 계속 호출하여 그 지연을 기록한다.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from bench.common import create_schema, load_app, seed_hospital, summarize
+
+
+async def _burst(client, logins: int) -> dict:
+    probe_samples = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/")
+            probe_samples.append(time.perf_counter() - start)
+            await asyncio.sleep(0.002)
+
+    async def login():
+        r = await client.post("/token", data={"username": "admin", "password": "password"})
+        assert r.status_code == 200, r.text
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+    return {"logins": logins, "burst_seconds": round(elapsed, 3), "unrelated_GET_/": summarize(probe_samples)}
+
+
+async def run(logins: int, workers: int) -> dict:
+    import httpx
+    from auth.password_hashing import password_hashing_pool
+
+    app = load_app()
+    await create_schema()
+    await seed_hospital()
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode, mode_workers in (("inline", 0), ("pool", workers)):
+            password_hashing_pool.shutdown()
+            password_hashing_pool.workers = mode_workers
+            results[mode] = await _burst(client, logins)
+    results["pool_stats"] = password_hashing_pool.stats()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.logins, args.workers)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""환자 목록(GET /api/me/patients) 2000건 한 페이지의 응답 시간을 측정합니다.
+
+사용법:
+    python -m bench.patient_list [--patients 2000] [--repeat 30]
+
+- endpoint: 현재 구현을 HTTP 로 호출한 전체 응답 시간
+- legacy_serialize: 이전 구현의 직렬화 경로(TUser 전체 로드 → model_validate → model_dump
+  → 응답 모델 재검증)를 같은 데이터로 재현한 시간 (DB 조회 제외)
+두 경로의 JSON 결과가 같은지도 확인한다.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from bench.common import create_schema, load_app, seed_hospital, seed_patients, summarize
+
+
+async def _legacy_serialize(limit: int) -> Tuple[bytes, float]:
+    """이전 get_my_hospital_patients 의 조회 결과 → 응답 JSON 변환을 재현합니다."""
+    import db.database
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import select
+    from entities.entities import TUser
+    from schemas import PatientListCursorResponse, UserWithLastReserve
+    async with db.database.AsyncSessionLocal() as session:
+        result = await session.execute(select(TUser).filter(
+            TUser.hospital_id == 1, TUser.user_type == "0", TUser.deleted_flag == False
+        ).order_by(TUser.last_name, TUser.first_name, TUser.id).limit(limit + 1))
+        patients = result.scalars().all()
+
+    started = time.perf_counter()
+    items = []
+    for p in patients:
+        res_date = None
+        if getattr(p, 'last_reserve_date', None) is not None:
+            res_date = p.last_reserve_date.strftime('%Y-%m-%d %H:%M:%S')
+        item = UserWithLastReserve.model_validate(p).model_dump()
+        item.pop('email', None)
+        item.pop('login_id', None)
+        item['last_reserve_date'] = res_date
+        items.append(item)
+    items = items[:limit]
+    # FastAPI 가 response_model 로 다시 검증/직렬화하는 단계
+    validated = PatientListCursorResponse.model_validate({"patients": items, "hasnext": True, "next_cursor": None})
+    body = json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return body, time.perf_counter() - started
+
+
+async def run(patients: int, repeat: int) -> dict:
+    import httpx
+
+    app = load_app()
+    await create_schema()
+    await seed_hospital()
+    base = datetime(2025, 1, 1, 9, 0)
+    await seed_patients(
+        patients,
+        email=lambda i: f"p{i}@example.com", password="x" * 60,
+        last_name=lambda i: f"患者{i % 97:02d}", first_name=lambda i: f"太郎{i}", contact="090-0000-0000",
+        last_reserve_date=lambda i: base + timedelta(hours=i) if i % 3 else None,
+    )
+    limit = min(patients, 2000)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.post("/token", data={"username": "admin", "password": "password"})
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        endpoint_samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            r = await client.get("/api/me/patients", headers=headers, params={"limit": limit})
+            endpoint_samples.append(time.perf_counter() - start)
+            assert r.status_code == 200, r.text
+        current = r.json()
+
+    legacy_samples = []
+    for _ in range(repeat):
+        body, elapsed = await _legacy_serialize(limit)
+        legacy_samples.append(elapsed)
+    legacy = json.loads(body)
+
+    assert current["patients"] == legacy["patients"], "response bodies differ"
+    return {
+        "rows": len(current["patients"]),
+        "endpoint": summarize(endpoint_samples),
+        "legacy_serialize_only": summarize(legacy_samples),
+        "bytes": len(r.content),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.patients, args.repeat)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
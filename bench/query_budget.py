@@ -0,0 +1,331 @@
+"""엔드포인트별 SQL 실행 횟수 예산(query budget) 검사.
+
+사용법:
+    python -m bench.query_budget [--patients 40] [--verbose]
+
+로컬 SQLite 에 병원 1곳, 환자 --patients 명, 환자당 예약 3건, 휴일 몇 건을 넣은 뒤 앱의 모든 엔드포인트를
+한 번씩 호출하여 요청 하나가 실행한 SQL 문 수를 센다. 프로세스 내 캐시(인증, 공개 병원 정보, 스케줄,
+예약 가능 시간)는 매 요청 전에 비우므로 캐시 미적중 시의 횟수이다.
+
+다음 중 하나라도 있으면 종료 코드 1.
+- 예산(BUDGETS)을 넘은 엔드포인트 (N+1 조회, 불필요한 refresh 등)
+- 예상한 상태 코드가 아닌 응답
+- 앱에 등록되어 있지만 이 검사가 호출하지 않는 엔드포인트 (새 엔드포인트는 케이스와 예산을 함께 추가한다)
+
+쿼리를 줄였다면 BUDGETS 도 낮춰서 이후 회귀를 잡을 수 있게 한다.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import date, time as dtime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from bench.common import create_schema, load_app, seed_hospital, seed_patients
+
+QUERY_BUDGET_DB_PATH = os.path.join(tempfile.gettempdir(), "badara_query_budget.db")
+
+# (method, 라우트 템플릿) -> 요청 1건당 허용하는 최대 SQL 문 수
+BUDGETS: Dict[Tuple[str, str], int] = {
+    ("GET", "/"): 0,
+    ("GET", "/health/db-pool"): 0,
+    ("GET", "/health/password-hashing"): 0,
+    ("GET", "/metrics"): 0,
+    ("GET", "/metrics [no token]"): 0,  # 401
+    # auth
+    ("POST", "/token/line"): 1,
+    ("POST", "/token"): 1,
+    ("GET", "/api/users/me"): 1,
+    ("PUT", "/api/users/me"): 2,
+    ("GET", "/api/token/verify"): 1,
+    ("GET", "/api/token/verify/hospital"): 1,
+    # hospital
+    ("GET", "/api/hospital/{hospital_code}"): 1,
+    ("GET", "/api/hospital/{hospital_code}/line-qr"): 1,
+    ("GET", "/api/hospitals/me"): 2,
+    ("PATCH", "/api/hospitals/me"): 4,
+    ("GET", "/api/hospitals/me/holidays"): 2,
+    ("POST", "/api/hospitals/me/holidays"): 3,
+    ("DELETE", "/api/hospitals/me/holidays/{holiday_id}"): 3,
+    ("POST", "/api/hospitals/me/holidays/bulk"): 4,  # 기존 행 조회 + 복원 UPDATE + 다중 행 INSERT
+    ("POST", "/api/hospitals/me/holidays/bulk [empty holiday_dates]"): 1,  # 422 (인증만)
+    ("POST", "/api/hospitals/me/holidays/bulk-delete"): 2,
+    ("POST", "/api/hospitals/me/holidays/bulk-delete [empty holiday_dates]"): 1,
+    ("GET", "/api/hospitals/me/schedule"): 2,
+    ("GET", "/api/hospitals/me/holiday-rules"): 2,
+    ("POST", "/api/hospitals/me/holiday-rules"): 3,
+    ("DELETE", "/api/hospitals/me/holiday-rules/{rule_id}"): 3,
+    ("PUT", "/api/hospitals/me/schedule"): 9,  # 요일 7건 INSERT 포함
+    # patient
+    ("POST", "/api/users/patient"): 3,
+    ("PUT", "/api/users/patient/{user_hash_id}"): 4,
+    ("GET", "/api/users/patient/{user_hash_id}"): 3,
+    ("GET", "/api/me/patients"): 2,
+    ("GET", "/api/me/patients/mrn-unconfirmed"): 2,
+    ("GET", "/api/me/patients/by-mrn/{medical_record_no}"): 2,
+    # 배치(BATCH_SIZE 행)마다 line_id / MRN 중복 조회 + 일괄 INSERT 3회
+    ("POST", "/api/me/patients/import"): 4,
+    ("GET", "/api/me/id"): 1,
+    # reservation
+    # 휴무일 캘린더 미적중 시 휴일/휴일 규칙 2회 (적중 시 0회)
+    ("GET", "/api/reservations/available_slots"): 5,
+    ("POST", "/api/reservations"): 11,
+    ("POST", "/api/reservations/admin"): 12,
+    # 환자/휴무일 캘린더(2)/스케줄/슬롯 점유 조회 + 슬롯 행 INSERT + 슬롯별 UPDATE 5 + 예약 INSERT 8 + 환자 UPDATE
+    # (예약 INSERT 는 생성된 ID 를 받아야 하므로 ORM 이 건별로 실행한다. MR5, MR10 은 MRN 이 없어 오류 항목)
+    ("POST", "/api/reservations/admin/batch"): 21,
+    ("GET", "/api/me/reservations"): 2,
+    ("GET", "/api/reservations"): 2,
+    ("GET", "/api/hospital/reservations"): 2,
+    ("GET", "/api/hospital/reservations/export"): 2,
+    ("GET", "/api/reservations/{reservation_hash_id}"): 2,
+    ("DELETE", "/api/reservations/{reservation_hash_id}"): 4,
+}
+
+
+class _Counter:
+    """요청 하나 동안 실행된 SQL 문 수. (요청은 한 번에 하나씩 보낸다)"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.statements: List[str] = []
+
+    def reset(self) -> None:
+        self.count = 0
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+        self.statements.append(" ".join(statement.split())[:200])
+
+
+class Context:
+    def __init__(self, client, counter: _Counter) -> None:
+        self.client = client
+        self.counter = counter
+        self.admin: Dict[str, str] = {}
+        self.patient: Dict[str, str] = {}
+        self.results: Dict[Tuple[str, str], Tuple[int, int, Optional[str], List[str]]] = {}
+
+    async def measured(self, method: str, route: str, url: str, expected_status: int = 200, case: Optional[str] = None, **kwargs):
+        """캐시를 비우고 요청 1건의 SQL 문 수를 기록합니다.
+
+        같은 엔드포인트의 다른 입력(오류 응답 등)은 case 를 붙여 "<route> [<case>]" 로 따로 기록한다.
+        """
+        _clear_caches()
+        self.counter.reset()
+        response = await self.client.request(method, url, **kwargs)
+        error = None
+        if response.status_code != expected_status:
+            error = f"status {response.status_code} != {expected_status}: {response.text[:200]}"
+        self.results[(method, f"{route} [{case}]" if case else route)] = (self.counter.count, response.status_code, error, self.counter.statements)
+        return response
+
+
+def _clear_caches() -> None:
+    from auth.principal_cache import principal_cache
+    from utils.availability_cache import availability_cache
+    from utils.http_cache import hospital_qr_cache, hospital_response_cache
+    from utils.holiday_calendar import holiday_calendar_cache
+    from utils.slot_engine import week_schedule_cache
+    for cache in (principal_cache, availability_cache, hospital_response_cache, hospital_qr_cache, week_schedule_cache,
+                  holiday_calendar_cache):
+        cache.clear()
+
+
+async def _seed(patients: int, today: date) -> None:
+    import db.database
+    from entities.entities import THoliday, THolidayRule, TReservation
+    # 5명 중 1명은 MRN 이 없다. (MRN 미확인 목록, 관리자 일괄 예약의 오류 항목)
+    await seed_patients(patients, medical_record_no=lambda i: f"MR{i}" if i % 5 else None)
+    async with db.database.AsyncSessionLocal() as session:
+        session.add_all(
+            TReservation(user_id=100 + i, hospital_id=1, reservation_date=today + timedelta(days=1 + (i * 3 + k) % 14),
+                         reservation_time=dtime(9 + (i * 3 + k) % 4, 30 * (k % 2)), treatment="定期検診")
+            for i in range(patients) for k in range(3)
+        )
+        session.add_all(THoliday(hospital_id=1, holiday_date=today + timedelta(days=d)) for d in (7, 14, 21))
+        session.add(THolidayRule(hospital_id=1, rule_type="range", start_date=today + timedelta(days=40),
+                                 end_date=today + timedelta(days=45), name="夏季休業"))
+        await session.commit()
+
+
+async def _run_cases(ctx: Context, today: date) -> None:
+    from utils import hashid_manager
+
+    client = ctx.client
+    r = await client.post("/token", data={"username": "admin", "password": "password"})
+    ctx.admin = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    r = await client.post("/token/line", json={"line_id": "LINE1"})
+    ctx.patient = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    admin, patient = ctx.admin, ctx.patient
+    patient_hash = hashid_manager.encode_id(101)
+    day = (today + timedelta(days=3)).isoformat()
+    period = {"from_date": today.isoformat(), "to_date": (today + timedelta(days=30)).isoformat()}
+
+    await ctx.measured("GET", "/", "/")
+    ops = {"Authorization": f"Bearer {os.environ['METRICS_TOKEN']}"}
+    await ctx.measured("GET", "/health/db-pool", "/health/db-pool", headers=ops)
+    await ctx.measured("GET", "/health/password-hashing", "/health/password-hashing", headers=ops)
+    await ctx.measured("GET", "/metrics", "/metrics", headers=ops)
+    await ctx.measured("GET", "/metrics", "/metrics", 401, case="no token")
+
+    # auth
+    await ctx.measured("POST", "/token/line", "/token/line", json={"line_id": "LINE1"})
+    await ctx.measured("POST", "/token", "/token", data={"username": "admin", "password": "password"})
+    await ctx.measured("GET", "/api/users/me", "/api/users/me", headers=admin)
+    await ctx.measured("PUT", "/api/users/me", "/api/users/me", headers=admin, json={"contact": "03-1111-1111"})
+    await ctx.measured("GET", "/api/token/verify", "/api/token/verify", headers=patient)
+    await ctx.measured("GET", "/api/token/verify/hospital", "/api/token/verify/hospital", headers=admin)
+
+    # hospital
+    await ctx.measured("GET", "/api/hospital/{hospital_code}", "/api/hospital/H001")
+    await ctx.measured("GET", "/api/hospital/{hospital_code}/line-qr", "/api/hospital/H001/line-qr")
+    await ctx.measured("GET", "/api/hospitals/me", "/api/hospitals/me", headers=admin)
+    await ctx.measured("PATCH", "/api/hospitals/me", "/api/hospitals/me", headers=admin, json={"phone": "03-2222-2222"})
+    await ctx.measured("GET", "/api/hospitals/me/holidays", "/api/hospitals/me/holidays", headers=admin,
+                       params={"target_date": (today + timedelta(days=10)).isoformat()})
+    r = await ctx.measured("POST", "/api/hospitals/me/holidays", "/api/hospitals/me/holidays", headers=admin,
+                           json={"holiday_date": (today + timedelta(days=60)).isoformat()})
+    holiday_id = r.json().get("id") if r.status_code == 200 else 0
+    await ctx.measured("DELETE", "/api/hospitals/me/holidays/{holiday_id}", f"/api/hospitals/me/holidays/{holiday_id}",
+                       expected_status=204, headers=admin)
+    # 60일 뒤는 위에서 삭제한 휴일(복원), 90~179일 뒤는 신규 등록
+    await ctx.measured("POST", "/api/hospitals/me/holidays/bulk", "/api/hospitals/me/holidays/bulk", headers=admin,
+                       json={"holiday_dates": [(today + timedelta(days=d)).isoformat() for d in [60] + list(range(90, 180))]})
+    await ctx.measured("POST", "/api/hospitals/me/holidays/bulk", "/api/hospitals/me/holidays/bulk", expected_status=422,
+                       case="empty holiday_dates", headers=admin, json={"holiday_dates": []})
+    await ctx.measured("POST", "/api/hospitals/me/holidays/bulk-delete", "/api/hospitals/me/holidays/bulk-delete", expected_status=422,
+                       case="empty holiday_dates", headers=admin, json={"holiday_dates": []})
+    await ctx.measured("POST", "/api/hospitals/me/holidays/bulk-delete", "/api/hospitals/me/holidays/bulk-delete", headers=admin,
+                       json={"start_date": (today + timedelta(days=90)).isoformat(), "end_date": (today + timedelta(days=179)).isoformat()})
+    await ctx.measured("GET", "/api/hospitals/me/holiday-rules", "/api/hospitals/me/holiday-rules", headers=admin)
+    r = await ctx.measured("POST", "/api/hospitals/me/holiday-rules", "/api/hospitals/me/holiday-rules", headers=admin,
+                           json={"rule_type": "weekly", "weekday": 6, "start_date": (today + timedelta(days=60)).isoformat()})
+    rule_id = r.json().get("id") if r.status_code == 200 else 0
+    await ctx.measured("DELETE", "/api/hospitals/me/holiday-rules/{rule_id}", f"/api/hospitals/me/holiday-rules/{rule_id}",
+                       expected_status=204, headers=admin)
+    await ctx.measured("GET", "/api/hospitals/me/schedule", "/api/hospitals/me/schedule", headers=admin)
+    week = [{"weekday": w, "open_time": "09:00", "close_time": "19:00", "slot_minutes": 30, "capacity": 2} for w in range(7)]
+    await ctx.measured("PUT", "/api/hospitals/me/schedule", "/api/hospitals/me/schedule", headers=admin, json=week)
+
+    # patient
+    await ctx.measured("POST", "/api/users/patient", "/api/users/patient", expected_status=201, json={
+        "line_id": "LINE-NEW", "last_name": "新規", "first_name": "患者", "contact": "000", "hospital_code": "H001",
+    })
+    await ctx.measured("PUT", "/api/users/patient/{user_hash_id}", f"/api/users/patient/{patient_hash}", headers=admin,
+                       json={"contact": "090-1234-5678"})
+    await ctx.measured("GET", "/api/users/patient/{user_hash_id}", f"/api/users/patient/{patient_hash}", headers=admin)
+    await ctx.measured("GET", "/api/me/patients", "/api/me/patients", headers=admin)
+    await ctx.measured("GET", "/api/me/patients/mrn-unconfirmed", "/api/me/patients/mrn-unconfirmed", headers=admin)
+    await ctx.measured("GET", "/api/me/patients/by-mrn/{medical_record_no}", "/api/me/patients/by-mrn/MR1", headers=admin)
+    # 5행: 신규 3, 등록된 line_id (LINE3) 1, 등록된 MRN (MR4) 1
+    patients_csv = "line_id,last_name,first_name,contact,medical_record_no\n" + "".join(
+        f"{line_id},一括,{n},000,{mrn}\n"
+        for n, (line_id, mrn) in enumerate([("IMPORT1", "IM1"), ("LINE3", ""), ("IMPORT2", "MR4"), ("IMPORT3", ""), ("IMPORT4", "IM4")])
+    )
+    await ctx.measured("POST", "/api/me/patients/import", "/api/me/patients/import", headers=admin,
+                       params={"format": "csv"}, content=patients_csv.encode())
+    await ctx.measured("GET", "/api/me/id", "/api/me/id", headers=patient)
+
+    # reservation
+    await ctx.measured("GET", "/api/reservations/available_slots", "/api/reservations/available_slots", headers=patient)
+    r = await ctx.measured("POST", "/api/reservations", "/api/reservations", expected_status=201, headers=patient,
+                           json={"reservation_date": day, "reservation_time": "17:00:00", "treatment": "検診"})
+    reservation_hash = r.json().get("id") if r.status_code == 201 else "x"
+    await ctx.measured("POST", "/api/reservations/admin", "/api/reservations/admin", expected_status=201, headers=admin,
+                       json={"reservation_date": day, "reservation_time": "17:30:00", "medical_record_no": "MR2"})
+    # 10건, 5개 슬롯 (17:00 / 17:30 은 위에서 1건씩 찬 슬롯)
+    batch = [
+        {"reservation_date": day, "reservation_time": f"{h}:{m}:00", "medical_record_no": f"MR{n}"}
+        for n, (h, m) in enumerate([(h, m) for h in (16, 17) for m in ("00", "30")] * 2 + [("18", "00")] * 2, start=1)
+    ]
+    await ctx.measured("POST", "/api/reservations/admin/batch", "/api/reservations/admin/batch", headers=admin, json=batch)
+    await ctx.measured("GET", "/api/me/reservations", "/api/me/reservations", headers=patient)
+    await ctx.measured("GET", "/api/reservations", "/api/reservations", headers=admin, params=period)
+    await ctx.measured("GET", "/api/hospital/reservations", "/api/hospital/reservations", headers=admin, params=period)
+    await ctx.measured("GET", "/api/hospital/reservations/export", "/api/hospital/reservations/export", headers=admin,
+                       params={**period, "format": "csv"})
+    await ctx.measured("GET", "/api/reservations/{reservation_hash_id}", f"/api/reservations/{reservation_hash}", headers=patient)
+    await ctx.measured("DELETE", "/api/reservations/{reservation_hash_id}", f"/api/reservations/{reservation_hash}",
+                       expected_status=204, headers=patient)
+
+
+def _registered_routes(app) -> List[Tuple[str, str]]:
+    from fastapi.routing import APIRoute
+    routes = []
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            routes.extend((method, route.path_format) for method in sorted(route.methods))
+    return routes
+
+
+async def run(patients: int) -> Tuple[Context, List[Tuple[str, str]]]:
+    import httpx
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    # 운영용 엔드포인트(/metrics, /health/*)는 METRICS_TOKEN 이 있어야 열린다.
+    os.environ["METRICS_TOKEN"] = "query-budget"
+    app = load_app(QUERY_BUDGET_DB_PATH)
+    await create_schema()
+    await seed_hospital()
+    today = date.today()
+    await _seed(patients, today)
+
+    counter = _Counter()
+    event.listen(Engine, "after_cursor_execute", counter)
+    try:
+        # 처리되지 않은 예외는 500 응답으로 받아 상태 코드 불일치로 보고한다.
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            ctx = Context(client, counter)
+            await _run_cases(ctx, today)
+    finally:
+        event.remove(Engine, "after_cursor_execute", counter)
+    return ctx, _registered_routes(app)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=40)
+    parser.add_argument("--verbose", action="store_true", help="예산을 넘은 엔드포인트의 SQL 을 출력")
+    args = parser.parse_args()
+
+    ctx, routes = asyncio.run(run(args.patients))
+
+    failures = []
+    width = max(len(f"{m} {r}") for m, r in BUDGETS)
+    print(f"{'endpoint':<{width}}  {'queries':>7}  {'budget':>6}")
+    for key, (count, status_code, error, statements) in ctx.results.items():
+        budget = BUDGETS.get(key)
+        label = f"{key[0]} {key[1]}"
+        flag = ""
+        if budget is None:
+            failures.append(f"{label}: no budget")
+            flag = "  NO BUDGET"
+        elif count > budget:
+            failures.append(f"{label}: {count} queries > budget {budget}")
+            flag = "  OVER BUDGET"
+            if args.verbose:
+                flag += "".join(f"\n    {s}" for s in statements)
+        if error:
+            failures.append(f"{label}: {error}")
+            flag += f"  {error}"
+        print(f"{label:<{width}}  {count:>7}  {budget if budget is not None else '-':>6}{flag}")
+
+    for key in routes:
+        if key not in ctx.results:
+            failures.append(f"{key[0]} {key[1]}: not exercised by bench.query_budget")
+
+    if failures:
+        print("\nFAILED:", file=sys.stderr)
+        for failure in failures:
+            print(f"  {failure}", file=sys.stderr)
+        sys.exit(1)
+    print("\nall endpoints within budget")
+
+
+if __name__ == "__main__":
+    main()
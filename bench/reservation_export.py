@@ -0,0 +1,131 @@
+"""예약 내보내기(GET /api/hospital/reservations/export) 의 첫 바이트 시간과 메모리 사용량을 측정합니다.
+
+사용법:
+    python -m bench.reservation_export [--sizes 5000 20000 80000] [--format ndjson]
+
+행 수를 늘려 가며 같은 엔드포인트를 호출한다. 스트리밍이면 첫 바이트까지의 시간과
+tracemalloc 최대 메모리가 행 수와 관계없이 거의 일정해야 한다.
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from datetime import date, datetime, time as dtime, timedelta
+from urllib.parse import urlencode
+
+from bench.common import create_schema, load_app, seed_hospital
+
+PATIENTS = 500
+
+
+async def _seed_reservations(total: int, already: int) -> None:
+    import db.database
+    from sqlalchemy import insert
+    from entities.entities import TReservation, TUser
+    async with db.database.AsyncSessionLocal() as session:
+        if already == 0:
+            await session.execute(insert(TUser), [
+                {"id": 100 + i, "hospital_id": 1, "line_id": f"LINE{i}", "medical_record_no": f"MR{i}", "user_type": "0",
+                 "last_name": "患者", "first_name": str(i), "contact": "000"}
+                for i in range(PATIENTS)
+            ])
+        start = date(2020, 1, 1)
+        batch = []
+        for n in range(already, total):
+            reservation_date, reservation_time = start + timedelta(days=n // 20), dtime(9 + (n % 20) // 2, 30 * (n % 2))
+            batch.append({
+                "user_id": 100 + n % PATIENTS, "hospital_id": 1,
+                "reservation_date": reservation_date, "reservation_time": reservation_time,
+                "reservation_at": datetime.combine(reservation_date, reservation_time),
+                "treatment": "定期検診", "deleted_flag": False,
+            })
+            if len(batch) == 5000:
+                await session.execute(insert(TReservation), batch)
+                batch = []
+        if batch:
+            await session.execute(insert(TReservation), batch)
+        await session.commit()
+
+
+async def _export(app, token: str, export_format: str) -> dict:
+    """ASGI 앱을 직접 호출하여 body 청크가 도착하는 시점을 기록한다. (httpx 의 ASGITransport 는 응답 전체를 모은 뒤 반환한다)"""
+    query = urlencode({"from_date": "2000-01-01", "to_date": "2100-12-31", "format": export_format})
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/hospital/reservations/export", "raw_path": b"/api/hospital/reservations/export",
+        "query_string": query.encode(), "root_path": "",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "server": ("bench", 80), "client": ("127.0.0.1", 50000),
+    }
+    finished = asyncio.Event()
+    request_sent = False
+    stats = {"status": None, "first_byte": None, "bytes": 0, "lines": 0}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            stats["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            if body and stats["first_byte"] is None:
+                stats["first_byte"] = time.perf_counter() - started
+            stats["bytes"] += len(body)
+            stats["lines"] += body.count(b"\n")
+            if not message.get("more_body", False):
+                finished.set()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert stats["status"] == 200, stats
+    return {
+        "lines": stats["lines"],
+        "bytes": stats["bytes"],
+        "first_byte_ms": round(stats["first_byte"] * 1000, 1),
+        "total_seconds": round(elapsed, 3),
+        "rows_per_second": round(stats["lines"] / elapsed),
+        "peak_traced_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+async def run(sizes, export_format: str) -> dict:
+    import httpx
+
+    app = load_app()
+    await create_schema()
+    await seed_hospital()
+
+    results = {}
+    seeded = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        r = await client.post("/token", data={"username": "admin", "password": "password"})
+        token = r.json()["access_token"]
+        for size in sorted(sizes):
+            await _seed_reservations(size, seeded)
+            seeded = size
+            results[str(size)] = await _export(app, token, export_format)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 80000])
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.sizes, args.format)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 import os
-from sqlalchemy import create_engine
+from contextlib import AsyncExitStack
+from typing import Optional
+
+from sqlalchemy import URL, create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from fastapi import Depends
+from starlette.requests import Request
+
+from db import read_routing
+from db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, engine_options, pool_stats
 
 # 예약 가능 시간 및 휴일 정보 (reservation.json에서 가져옴)
 available_slots_data = {
@@ -44,25 +53,113 @@ available_slots_data = {
   ]
 }
 
-# --- 실제 데이터베이스 설정 (환경 변수 사용) ---
+# --- 데이터베이스 설정 (환경 변수 사용) ---
+# 우선순위: DATABASE_URL > ASYNC_DATABASE_URL > USE_REAL_DB=true 일 때 DB_* 로 구성한 MySQL URL
+# DATABASE_URL 은 동기/비동기 드라이버 어느 쪽으로 적어도 된다. (예: mysql://..., sqlite:///./badara_local.db)
+# DATABASE_REPLICA_URL 을 지정하면 GET 핸들러(get_async_read_db)는 읽기 전용 레플리카를 사용한다.
 engine = None
 SessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
+async_replica_engine = None
+AsyncReadSessionLocal = None
 Base = declarative_base()
 
-if os.environ.get("USE_REAL_DB") == "true":
+# 동기 드라이버 → 비동기 드라이버
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+mysqlconnector": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+# 비동기 드라이버 → 동기 드라이버 (db.migrate, db.explain_check 용 동기 엔진)
+# requirements.txt 에 포함된 mysql-connector-python 을 사용한다.
+_SYNC_DRIVERS = {
+    "mysql": "mysql+mysqlconnector",
+    "mysql+pymysql": "mysql+mysqlconnector",
+    "mysql+aiomysql": "mysql+mysqlconnector",
+    "sqlite+aiosqlite": "sqlite",
+}
+
+
+def async_url(url: str) -> URL:
+    """URL 의 드라이버를 대응하는 비동기 드라이버로 바꿉니다. 이미 비동기 드라이버면 그대로 둡니다."""
+    parsed = make_url(url)
+    return parsed.set(drivername=_ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername))
+
+
+def sync_url(url: str) -> URL:
+    """URL 의 드라이버를 대응하는 동기 드라이버로 바꿉니다."""
+    parsed = make_url(url)
+    return parsed.set(drivername=_SYNC_DRIVERS.get(parsed.drivername, parsed.drivername))
+
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL")
+
+if not DATABASE_URL and os.environ.get("USE_REAL_DB") == "true":
     DB_USER = os.environ.get("DB_USER", "root")
     DB_PASSWORD = os.environ.get("DB_PASSWORD", "0000")
     DB_HOST = os.environ.get("DB_HOST", "localhost")
     DB_PORT = os.environ.get("DB_PORT", "3306")
     DB_NAME = os.environ.get("DB_NAME", "badara")
-    SQLALCHEMY_DATABASE_URL = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=True)
+    DATABASE_URL = f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+if DATABASE_URL:
+    engine = create_engine(sync_url(DATABASE_URL), poolclass=InstrumentedQueuePool, **engine_options())
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# --- 비동기 데이터베이스 설정 ---
+# ASYNC_DATABASE_URL 은 이전 설정과의 호환용이다. (예: sqlite+aiosqlite:///./badara_local.db)
+ASYNC_SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL") or os.environ.get("ASYNC_DATABASE_URL") or DATABASE_URL
+
+if ASYNC_SQLALCHEMY_DATABASE_URL:
+    async_engine = create_async_engine(async_url(ASYNC_SQLALCHEMY_DATABASE_URL), poolclass=InstrumentedAsyncQueuePool, **engine_options())
+    # expire_on_commit=False: 커밋 후 응답 직렬화 시 속성 접근이 지연 로딩(I/O)을 일으키지 않도록 한다.
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = AsyncSessionLocal
+
+    if DATABASE_REPLICA_URL:
+        async_replica_engine = create_async_engine(async_url(DATABASE_REPLICA_URL), poolclass=InstrumentedAsyncQueuePool, **engine_options())
+        AsyncReadSessionLocal = async_sessionmaker(bind=async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+async def warm_pool(connections: int) -> int:
+    """비동기 엔진(레플리카 포함)의 커넥션을 connections 개까지 미리 열어 풀에 넣습니다. (pool_size 가 상한)"""
+    opened = 0
+    for target in (async_engine, async_replica_engine):
+        if target is None:
+            continue
+        count = min(connections, target.sync_engine.pool.size())
+        async with AsyncExitStack() as stack:
+            for _ in range(count):
+                conn = await stack.enter_async_context(target.connect())
+                await conn.exec_driver_sql("SELECT 1")
+                opened += 1
+    return opened
+
+
+async def dispose_engines() -> None:
+    """풀의 커넥션을 모두 닫습니다. (종료 시)"""
+    for target in (async_engine, async_replica_engine):
+        if target is not None:
+            await target.dispose()
+    if engine is not None:
+        engine.dispose()
+
+
+def get_pool_stats():
+    """동기/비동기(프라이머리, 레플리카) 엔진의 커넥션 풀 통계를 반환합니다."""
+    return {
+        "sync": pool_stats(engine.pool) if engine is not None else None,
+        "async": pool_stats(async_engine.sync_engine.pool) if async_engine is not None else None,
+        "async_replica": pool_stats(async_replica_engine.sync_engine.pool) if async_replica_engine is not None else None,
+    }
+
 # Dependency to get a DB session
 def get_db():
     if SessionLocal is None:
-        raise Exception("Database is not configured. Set USE_REAL_DB=true.")
+        raise Exception("Database is not configured. Set DATABASE_URL or USE_REAL_DB=true.")
     db = SessionLocal()
     try:
         yield db
@@ -71,4 +168,58 @@ def get_db():
         db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def _client_key(request: Request) -> Optional[str]:
+    return request.headers.get("authorization")
+
+
+# Dependency to get an async DB session
+async def get_async_db(request: Request):
+    """프라이머리 세션. 쓰기를 커밋하면 그 클라이언트의 이후 읽기도 잠시 프라이머리로 보낸다."""
+    if AsyncSessionLocal is None:
+        raise Exception("Async database is not configured. Set DATABASE_URL, ASYNC_DATABASE_URL or USE_REAL_DB=true.")
+    async with AsyncSessionLocal() as db:
+        db.sync_session.info[read_routing.CLIENT_KEY] = _client_key(request)
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+def read_session_factory(request: Request) -> async_sessionmaker:
+    """이 요청의 읽기에 쓸 세션 팩토리. 레플리카가 있으면 레플리카, 없거나 최근에 쓰기를 커밋한 클라이언트이면 프라이머리."""
+    if AsyncReadSessionLocal is not AsyncSessionLocal and read_routing.recent_writers.wrote_recently(_client_key(request)):
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    """레플리카에 연결된 세션인지. (복제 지연으로 방금 커밋된 쓰기가 아직 보이지 않을 수 있다)"""
+    return AsyncReadSessionLocal is not AsyncSessionLocal and db.bind is not async_engine
+
+
+async def get_async_read_db(request: Request, primary: AsyncSession = Depends(get_async_db)):
+    """GET 핸들러용 읽기 전용 세션.
+
+    레플리카가 설정되어 있으면 레플리카를 사용한다. 레플리카가 없거나, READ_YOUR_WRITES_SECONDS 이내에 쓰기를
+    커밋한 클라이언트이면 요청의 프라이머리 세션(인증 의존성과 같은 세션)을 그대로 쓴다. 프라이머리 세션을 하나 더
+    열면 요청당 풀 연결을 2개 잡아 버스트 시 풀이 고갈된다. (세션은 첫 쿼리 때 연결을 가져오므로 쓰지 않으면 비용이 없다)
+    어느 쪽이든 세션에서 쓰기를 시도하면 ReadOnlySessionError.
+    """
+    if AsyncReadSessionLocal is None:
+        raise Exception("Async database is not configured. Set DATABASE_URL, ASYNC_DATABASE_URL or USE_REAL_DB=true.")
+    factory = read_session_factory(request)
+    if factory is AsyncSessionLocal:
+        primary.sync_session.info[read_routing.READ_ONLY_KEY] = True
+        yield primary
+        return
+    async with factory() as db:
+        db.sync_session.info[read_routing.READ_ONLY_KEY] = True
+        try:
+            yield db
+        finally:
+            await db.rollback()
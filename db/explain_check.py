@@ -0,0 +1,150 @@
+"""라우터 핫패스 쿼리에 대해 EXPLAIN 을 실행하고 풀 테이블 스캔이 있으면 실패합니다.
+
+사용법:
+    python -m db.explain_check
+    python -m db.explain_check --url sqlite:///./badara_local.db
+
+MySQL 은 EXPLAIN 의 type=ALL, SQLite 는 EXPLAIN QUERY PLAN 의 인덱스 없는 `SCAN <table>` 을
+풀 스캔으로 판정합니다. MySQL 옵티마이저는 행 수가 매우 적은 테이블에서 인덱스 대신 풀 스캔을
+택하기도 하므로, 샘플 데이터(etc/samplData)를 넣은 DB 에서 실행하십시오.
+"""
+import argparse
+import sys
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+# db.migrate 가 .env 를 읽으므로 entities(db.database) 보다 먼저 import 한다.
+from db.migrate import resolve_engine
+from entities.entities import THoliday, THolidayRule, THospital, TReservation, TScheduleTemplate, TSlotOccupancy, TUser
+from enums.user_type import UserType
+
+SAMPLE_HOSPITAL_ID = 1
+SAMPLE_USER_ID = 1
+
+
+def hot_path_queries() -> dict[str, Select]:
+    """라우터/인증에서 사용하는 쿼리와 동일한 조건의 SELECT 문."""
+    today = date.today()
+    date_range = [today + timedelta(days=i) for i in range(15)]
+    return {
+        "authManager.get_user (login_id)": select(TUser).filter(TUser.login_id == "admin").limit(1),
+        "authManager.get_user_by_line_id": select(TUser).filter(TUser.line_id == "sample_line3").limit(1),
+        "hospitalRouter.get_hospital_info": select(THospital).filter(
+            THospital.hospital_code == "H001", THospital.deleted_flag == False
+        ).limit(1),
+        "slot_engine.load_schedule_rules": select(TScheduleTemplate).filter(
+            TScheduleTemplate.hospital_id == SAMPLE_HOSPITAL_ID,
+            TScheduleTemplate.deleted_flag == False,
+        ).order_by(TScheduleTemplate.weekday, TScheduleTemplate.open_time),
+        "holiday_calendar.get_holiday_calendar (holidays)": select(THoliday.hospital_id, THoliday.holiday_date).filter(
+            THoliday.hospital_id.in_([SAMPLE_HOSPITAL_ID]),
+            THoliday.deleted_flag == False,
+        ),
+        "holiday_calendar.get_holiday_calendar (rules)": select(THolidayRule).filter(
+            THolidayRule.hospital_id.in_([SAMPLE_HOSPITAL_ID]),
+            THolidayRule.deleted_flag == False,
+        ),
+        "reservationRouter.get_available_slots (reservations)": select(
+            TReservation.reservation_date, TReservation.reservation_time
+        ).filter(
+            TReservation.hospital_id == SAMPLE_HOSPITAL_ID,
+            TReservation.reservation_date.in_(date_range),
+            TReservation.deleted_flag == False,
+        ),
+        # slot_ledger.claim_slot 의 조건부 UPDATE 와 같은 조건
+        "slot_ledger.claim_slot": select(TSlotOccupancy.id).filter(
+            TSlotOccupancy.hospital_id == SAMPLE_HOSPITAL_ID,
+            TSlotOccupancy.reservation_date == today,
+            TSlotOccupancy.reservation_time == time(10, 0),
+            TSlotOccupancy.booked_count < 1,
+        ),
+        "reservationRouter.get_my_reservations": select(TReservation).filter(
+            TReservation.user_id == SAMPLE_USER_ID,
+            TReservation.hospital_id == SAMPLE_HOSPITAL_ID,
+            TReservation.deleted_flag == False,
+            TReservation.reservation_at > datetime.combine(today, time(10, 0)),
+        ).order_by(TReservation.created_at.desc()).limit(1),
+        "patientRouter.get_patient_by_id (reservations)": select(TReservation).filter(
+            TReservation.user_id == SAMPLE_USER_ID,
+        ).order_by(TReservation.reservation_at.desc()).limit(10),
+        "reservationRouter.get_hospital_reservations": select(TReservation).filter(
+            TReservation.hospital_id == SAMPLE_HOSPITAL_ID,
+            TReservation.reservation_date.between(today, today + timedelta(days=30)),
+        ).order_by(TReservation.reservation_date, TReservation.reservation_time, TReservation.id).limit(1001),
+        "reservationRouter.get_reservations (system admin)": select(TReservation).filter(
+            TReservation.deleted_flag == False,
+            TReservation.reservation_date.between(today, today + timedelta(days=90)),
+        ).order_by(TReservation.reservation_date, TReservation.reservation_time, TReservation.id).limit(1001),
+        "patientRouter.get_patient_by_mrn": select(TUser).filter(
+            TUser.hospital_id == SAMPLE_HOSPITAL_ID,
+            TUser.user_type == UserType.PATIENT,
+            TUser.deleted_flag == False,
+            TUser.medical_record_no == "MR1",
+        ).limit(1),
+        "patient_import (line_id)": select(TUser.line_id).filter(TUser.line_id.in_(["sample_line3", "sample_line4"])),
+        "patient_import (medical_record_no)": select(TUser.medical_record_no).filter(
+            TUser.hospital_id == SAMPLE_HOSPITAL_ID,
+            TUser.medical_record_no.in_(["MR1", "MR2"]),
+        ),
+        "patientRouter.get_my_hospital_patients": select(
+            TUser.id, TUser.line_id, TUser.user_type, TUser.last_name, TUser.first_name,
+            TUser.contact, TUser.medical_record_no, TUser.last_reserve_date,
+        ).filter(
+            TUser.hospital_id == SAMPLE_HOSPITAL_ID,
+            TUser.user_type == UserType.PATIENT,
+            TUser.deleted_flag == False,
+            or_(
+                TUser.last_name > "A",
+                and_(TUser.last_name == "A", TUser.first_name > "B"),
+                and_(TUser.last_name == "A", TUser.first_name == "B", TUser.id > 0),
+            ),
+        ).order_by(TUser.last_name, TUser.first_name, TUser.id).limit(1001),
+    }
+
+
+def _explain(conn: Connection, stmt: Select) -> list[str]:
+    """풀 스캔으로 판정된 테이블 이름 목록을 반환합니다."""
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").mappings().all()
+        scans = []
+        for row in rows:
+            detail = row["detail"]
+            if detail.startswith("SCAN ") and " USING " not in detail:
+                scans.append(detail.split()[1])
+        return scans
+    rows = conn.exec_driver_sql(f"EXPLAIN {sql}").mappings().all()
+    return [row["table"] for row in rows if (row.get("type") or "").upper() == "ALL"]
+
+
+def check(conn: Connection) -> list[tuple[str, list[str]]]:
+    failures = []
+    for name, stmt in hot_path_queries().items():
+        scans = _explain(conn, stmt)
+        status = "FULL SCAN " + ",".join(scans) if scans else "ok"
+        print(f"{status:30} {name}")
+        if scans:
+            failures.append((name, scans))
+    return failures
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fail when a hot-path router query falls back to a full table scan.")
+    parser.add_argument("--url", help="SQLAlchemy database URL (defaults to the DB_* settings)")
+    args = parser.parse_args(argv)
+
+    engine = resolve_engine(args.url)
+    with engine.connect() as conn:
+        failures = check(conn)
+    if failures:
+        print(f"{len(failures)} hot-path queries fall back to a full table scan.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
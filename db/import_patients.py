@@ -0,0 +1,119 @@
+"""CSV / NDJSON 파일의 환자를 병원에 일괄 등록합니다. (POST /api/me/patients/import 와 같은 처리)
+
+사용법:
+    python -m db.import_patients --hospital-code H001 patients.csv
+    python -m db.import_patients --hospital-id 2 --format ndjson patients.ndjson
+    python -m db.import_patients --hospital-code H001 --encoding cp932 excel_export.csv
+    python -m db.import_patients --hospital-code H001 --url sqlite:///./badara_local.db --errors errors.ndjson patients.csv
+
+--format 을 생략하면 확장자(.csv / .ndjson / .jsonl)로 판단합니다. 처리 결과(건수, 처리 속도)는 표준 출력에,
+행별 오류와 중복은 --errors 파일(NDJSON, 생략 시 표준 오류)에 모두 기록합니다.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from typing import AsyncIterator, Optional
+
+import orjson
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+# db.database 는 import 시점의 환경 변수로 엔진을 만들기 때문에 먼저 .env 를 읽어 둔다.
+load_dotenv()
+
+from db import database
+from entities.entities import THospital
+from utils import patient_import
+
+READ_CHUNK_SIZE = 1 << 16
+
+_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+async def _read_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def _resolve_hospital_id(session: AsyncSession, hospital_id: Optional[int], hospital_code: Optional[str]) -> int:
+    if hospital_id is not None:
+        result = await session.execute(select(THospital.id).filter(THospital.id == hospital_id, THospital.deleted_flag == False))
+    else:
+        result = await session.execute(select(THospital.id).filter(THospital.hospital_code == hospital_code, THospital.deleted_flag == False))
+    found = result.scalar()
+    if found is None:
+        raise SystemExit(f"Hospital not found: {hospital_id if hospital_id is not None else hospital_code}")
+    return found
+
+
+async def run(args: argparse.Namespace) -> patient_import.ImportReport:
+    if args.url:
+        engine = create_async_engine(database.async_url(args.url))
+        session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    elif database.AsyncSessionLocal is not None:
+        engine = database.async_engine
+        session_factory = database.AsyncSessionLocal
+    else:
+        raise SystemExit("Database is not configured. Set USE_REAL_DB=true or pass --url.")
+
+    try:
+        async with session_factory() as session:
+            hospital_id = await _resolve_hospital_id(session, args.hospital_id, args.hospital_code)
+            return await patient_import.import_patients(
+                session, hospital_id, _read_chunks(args.path), args.format, args.encoding,
+                created_by=args.created_by, batch_size=args.batch_size,
+                report=patient_import.ImportReport(max_errors=None),
+            )
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-import patients from a CSV or NDJSON file.")
+    parser.add_argument("path", help="CSV (header row required) or NDJSON file")
+    hospital = parser.add_mutually_exclusive_group(required=True)
+    hospital.add_argument("--hospital-code", help="t_hospital.hospital_code of the target hospital")
+    hospital.add_argument("--hospital-id", type=int, help="t_hospital.id of the target hospital")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="input format (defaults to the file extension)")
+    parser.add_argument("--encoding", choices=("utf-8", "cp932"), default="utf-8",
+                        help="input encoding (cp932 for CSVs saved by Japanese Excel)")
+    parser.add_argument("--batch-size", type=int, default=patient_import.BATCH_SIZE)
+    parser.add_argument("--created-by", default="import", help="value for created_by / updated_by")
+    parser.add_argument("--errors", help="write per-row errors to this NDJSON file instead of stderr")
+    parser.add_argument("--url", help="SQLAlchemy database URL (defaults to the DB_* settings)")
+    args = parser.parse_args(argv)
+
+    if args.format is None:
+        extension = os.path.splitext(args.path)[1].lower()
+        if extension not in _EXTENSIONS:
+            parser.error("cannot infer the input format; pass --format")
+        args.format = _EXTENSIONS[extension]
+
+    try:
+        report = asyncio.run(run(args))
+    except patient_import.ImportFormatError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    out = open(args.errors, "wb") if args.errors else sys.stderr.buffer
+    try:
+        for error in report.errors:
+            out.write(orjson.dumps(error._asdict()) + b"\n")
+    finally:
+        if args.errors:
+            out.close()
+        else:
+            out.flush()
+
+    print(
+        f"received={report.received} created={report.created} duplicates={report.duplicates} failed={report.failed} "
+        f"elapsed={report.elapsed_seconds:.2f}s ({report.rows_per_second:,.0f} rows/s)"
+    )
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""스키마 마이그레이션 실행기.
+
+사용법:
+    python -m db.migrate             # 미적용 마이그레이션을 모두 적용
+    python -m db.migrate --status    # 적용 상태만 출력
+    python -m db.migrate --url sqlite:///./badara_local.db
+
+--url 을 지정하지 않으면 .env 의 DB_* 설정(db.database.engine)을 사용합니다.
+적용 이력은 t_schema_migration 테이블에 기록됩니다.
+"""
+import argparse
+import logging
+import sys
+from datetime import datetime
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.engine import Engine
+
+from db.migrations import load_migrations
+
+# db.database 는 import 시점의 환경 변수로 엔진을 만들기 때문에 먼저 .env 를 읽어 둔다.
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+
+schema_migration = Table(
+    "t_schema_migration",
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False, comment="マイグレーションバージョン"),
+    Column("description", String(255), comment="説明"),
+    Column("applied_at", DateTime, nullable=False, comment="適用日"),
+    comment="スキーママイグレーション履歴",
+)
+
+
+def applied_versions(engine: Engine) -> set[int]:
+    _metadata.create_all(engine, tables=[schema_migration])
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(select(schema_migration.c.version))}
+
+
+def upgrade(engine: Engine) -> list[int]:
+    """미적용 마이그레이션을 버전 순으로 각각 하나의 트랜잭션에서 적용합니다."""
+    done = applied_versions(engine)
+    applied = []
+    for migration in load_migrations():
+        if migration.VERSION in done:
+            continue
+        logger.info("Applying migration %04d: %s", migration.VERSION, migration.DESCRIPTION)
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            conn.execute(schema_migration.insert().values(
+                version=migration.VERSION,
+                description=migration.DESCRIPTION,
+                applied_at=datetime.now(),
+            ))
+        applied.append(migration.VERSION)
+    return applied
+
+
+def resolve_engine(url: Optional[str]) -> Engine:
+    """--url 이 있으면 그 URL 로, 없으면 db.database 의 동기 엔진을 사용합니다."""
+    if url:
+        return create_engine(url)
+    import db.database
+    if db.database.engine is None:
+        raise SystemExit("Database is not configured. Set USE_REAL_DB=true or pass --url.")
+    return db.database.engine
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations.")
+    parser.add_argument("--url", help="SQLAlchemy database URL (defaults to the DB_* settings)")
+    parser.add_argument("--status", action="store_true", help="show applied/pending migrations and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    engine = resolve_engine(args.url)
+
+    if args.status:
+        done = applied_versions(engine)
+        for migration in load_migrations():
+            state = "applied" if migration.VERSION in done else "pending"
+            print(f"{migration.VERSION:04d} {state:8} {migration.DESCRIPTION}")
+        return 0
+
+    applied = upgrade(engine)
+    if applied:
+        logger.info("Applied migrations: %s", ", ".join(f"{v:04d}" for v in applied))
+    else:
+        logger.info("Schema is up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
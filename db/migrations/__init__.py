@@ -0,0 +1,55 @@
+"""버전별 스키마 마이그레이션.
+
+각 마이그레이션은 `v<번호>_<설명>.py` 모듈로 두며, 다음 속성을 가진다.
+
+- VERSION: 정수 버전 (적용 순서)
+- DESCRIPTION: 한 줄 설명
+- upgrade(conn): sqlalchemy Connection 을 받아 스키마를 변경한다.
+
+badara.ddl 로 새로 만든 DB 에서도 그대로 실행될 수 있도록 upgrade 는 멱등하게 작성한다.
+"""
+import importlib
+import pkgutil
+import re
+from types import ModuleType
+from typing import Iterable, List
+
+from sqlalchemy import Column, Index, MetaData, Table, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+_MODULE_PATTERN = re.compile(r"^v(\d+)_\w+$")
+
+
+def load_migrations() -> List[ModuleType]:
+    """패키지 내 마이그레이션 모듈을 VERSION 순으로 반환합니다."""
+    modules = []
+    for info in pkgutil.iter_modules(__path__):
+        if _MODULE_PATTERN.match(info.name):
+            modules.append(importlib.import_module(f"{__name__}.{info.name}"))
+    modules.sort(key=lambda m: m.VERSION)
+    versions = [m.VERSION for m in modules]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return modules
+
+
+def create_index_if_missing(conn: Connection, name: str, table_name: str, columns: Iterable[str], unique: bool = False) -> bool:
+    """인덱스가 없을 때만 생성합니다. 생성했으면 True."""
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(table_name)}
+    if name in existing:
+        return False
+    table = Table(table_name, MetaData(), autoload_with=conn)
+    Index(name, *(table.c[c] for c in columns), unique=unique).create(conn)
+    return True
+
+
+def add_column_if_missing(conn: Connection, table_name: str, column: Column) -> bool:
+    """컬럼이 없을 때만 ALTER TABLE ... ADD COLUMN 으로 추가합니다. 추가했으면 True."""
+    existing = {c["name"] for c in inspect(conn).get_columns(table_name)}
+    if column.name in existing:
+        return False
+    Table(table_name, MetaData(), column)
+    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+    conn.exec_driver_sql(f"ALTER TABLE {table_name} ADD COLUMN {ddl}")
+    return True
@@ -0,0 +1,19 @@
+from sqlalchemy.engine import Connection
+
+from db.migrations import create_index_if_missing
+
+VERSION = 1
+DESCRIPTION = "hot-path indexes for login, slot lookup, holidays and patient list"
+
+INDEXES = [
+    ("IX_User_LineId", "t_user", ["line_id"]),
+    ("IX_User_LoginId", "t_user", ["login_id"]),
+    ("IX_User_PatientList", "t_user", ["hospital_id", "user_type", "deleted_flag", "last_name", "first_name", "id"]),
+    ("IX_Reservation_Slot", "t_reservation", ["hospital_id", "reservation_date", "reservation_time", "deleted_flag"]),
+    ("IX_Holiday_Hospital_Date", "t_holiday", ["hospital_id", "holiday_date"]),
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for name, table_name, columns in INDEXES:
+        create_index_if_missing(conn, name, table_name, columns)
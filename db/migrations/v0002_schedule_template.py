@@ -0,0 +1,32 @@
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, MetaData, String, Table, Time, inspect
+from sqlalchemy.engine import Connection
+
+from db.migrations import create_index_if_missing
+
+VERSION = 2
+DESCRIPTION = "per-hospital schedule templates (t_schedule_template)"
+
+# 이 버전 시점의 테이블 정의. 이후 엔티티(TScheduleTemplate)가 바뀌어도 이 마이그레이션이 만드는 스키마는 바뀌지 않도록
+# ORM 모델을 참조하지 않는다. 컬럼 변경은 새 마이그레이션으로 추가한다.
+_schedule_template = Table(
+    "t_schedule_template", MetaData(),
+    Column("id", Integer, primary_key=True, autoincrement=True, comment="診療スケジュールID"),
+    Column("hospital_id", Integer, nullable=False, comment="病院ID"),
+    Column("weekday", Integer, nullable=False, comment="曜日:0:月 ... 6:日"),
+    Column("open_time", Time, nullable=False, comment="受付開始時間"),
+    Column("close_time", Time, nullable=False, comment="受付終了時間"),
+    Column("slot_minutes", Integer, nullable=False, comment="予約枠の長さ（分）"),
+    Column("capacity", Integer, nullable=False, comment="予約枠あたりの定員"),
+    Column("deleted_flag", Boolean, comment="削除フラグ"),
+    Column("created_at", DateTime, comment="作成日"),
+    Column("created_by", String(255), comment="作成者"),
+    Column("updated_at", DateTime, comment="更新日"),
+    Column("updated_by", String(255), comment="更新者"),
+    Index("IX_ScheduleTemplate_Hospital", "hospital_id", "deleted_flag"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    if not inspect(conn).has_table(_schedule_template.name):
+        _schedule_template.create(conn)
+    create_index_if_missing(conn, "IX_ScheduleTemplate_Hospital", "t_schedule_template", ["hospital_id", "deleted_flag"])
@@ -0,0 +1,19 @@
+import hashlib
+
+from sqlalchemy import Column, String, text
+from sqlalchemy.engine import Connection
+
+from db.migrations import add_column_if_missing
+
+VERSION = 3
+DESCRIPTION = "t_hospital.line_qr_code_hash for content-addressed QR URLs"
+
+
+def upgrade(conn: Connection) -> None:
+    add_column_if_missing(conn, "t_hospital", Column("line_qr_code_hash", String(64), comment="LINEQRコードのSHA-256"))
+    rows = conn.execute(text("SELECT id, line_qr_code FROM t_hospital WHERE line_qr_code_hash IS NULL")).all()
+    for hospital_id, qr in rows:
+        conn.execute(
+            text("UPDATE t_hospital SET line_qr_code_hash = :h WHERE id = :id"),
+            {"h": hashlib.sha256(qr or b"").hexdigest(), "id": hospital_id},
+        )
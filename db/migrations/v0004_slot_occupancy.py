@@ -0,0 +1,38 @@
+from sqlalchemy import CheckConstraint, Column, Date, DateTime, Integer, MetaData, Table, Time, UniqueConstraint, inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 4
+DESCRIPTION = "slot occupancy ledger (t_slot_occupancy) backfilled from t_reservation"
+
+# 이 버전 시점의 테이블 정의. (엔티티 TSlotOccupancy 가 바뀌어도 이 마이그레이션의 결과는 바뀌지 않는다)
+_slot_occupancy = Table(
+    "t_slot_occupancy", MetaData(),
+    Column("id", Integer, primary_key=True, autoincrement=True, comment="予約枠使用状況ID"),
+    Column("hospital_id", Integer, nullable=False, comment="病院ID"),
+    Column("reservation_date", Date, nullable=False, comment="予約日"),
+    Column("reservation_time", Time, nullable=False, comment="予約時間"),
+    Column("booked_count", Integer, nullable=False, comment="予約済み件数"),
+    Column("max_count", Integer, nullable=False, comment="予約上限数（管理者の追加枠を含む）"),
+    Column("updated_at", DateTime, comment="更新日"),
+    UniqueConstraint("hospital_id", "reservation_date", "reservation_time", name="UX_SlotOccupancy_Slot"),
+    CheckConstraint("booked_count >= 0 AND booked_count <= max_count", name="CK_SlotOccupancy_Capacity"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    if not inspect(conn).has_table(_slot_occupancy.name):
+        _slot_occupancy.create(conn)
+    # 원장에 아직 없는 슬롯만 현재 예약 수로 채운다. (기존 데이터가 정원을 넘었어도 CHECK 에 걸리지 않도록 max_count = 예약 수)
+    conn.execute(text("""
+        INSERT INTO t_slot_occupancy (hospital_id, reservation_date, reservation_time, booked_count, max_count)
+        SELECT r.hospital_id, r.reservation_date, r.reservation_time, COUNT(*), COUNT(*)
+        FROM t_reservation r
+        WHERE r.deleted_flag = 0
+          AND NOT EXISTS (
+            SELECT 1 FROM t_slot_occupancy o
+            WHERE o.hospital_id = r.hospital_id
+              AND o.reservation_date = r.reservation_date
+              AND o.reservation_time = r.reservation_time
+          )
+        GROUP BY r.hospital_id, r.reservation_date, r.reservation_time
+    """))
@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+
+from db.migrations import create_index_if_missing
+
+VERSION = 5
+DESCRIPTION = "keyset pagination index for cross-hospital reservation lists"
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_if_missing(conn, "IX_Reservation_Date", "t_reservation", ["reservation_date", "reservation_time", "id"])
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, text
+from sqlalchemy.engine import Connection
+
+from db.migrations import add_column_if_missing, create_index_if_missing
+
+VERSION = 6
+DESCRIPTION = "t_reservation.reservation_at (date + time) backfilled, indexed with user_id"
+
+# SQLite 는 Date/Time 을 'YYYY-MM-DD', 'HH:MM:SS.ffffff' 문자열로 저장하므로 이어 붙이면 DateTime 의 저장 형식과 같아진다.
+_COMBINE = {
+    "mysql": "TIMESTAMP(reservation_date, reservation_time)",
+    "sqlite": "reservation_date || ' ' || reservation_time",
+}
+
+
+def upgrade(conn: Connection) -> None:
+    add_column_if_missing(conn, "t_reservation", Column("reservation_at", DateTime, comment="予約日時"))
+    combine = _COMBINE.get(conn.dialect.name, "CAST(reservation_date AS TIMESTAMP) + reservation_time")
+    conn.execute(text(f"UPDATE t_reservation SET reservation_at = {combine} WHERE reservation_at IS NULL"))
+    create_index_if_missing(conn, "IX_Reservation_UserAt", "t_reservation", ["user_id", "reservation_at"])
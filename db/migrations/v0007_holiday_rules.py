@@ -0,0 +1,29 @@
+from sqlalchemy import Boolean, Column, Date, DateTime, Index, Integer, MetaData, String, Table, inspect
+from sqlalchemy.engine import Connection
+
+VERSION = 7
+DESCRIPTION = "recurring holiday rules (t_holiday_rule: weekly / national / range)"
+
+# 이 버전 시점의 테이블 정의. (엔티티 THolidayRule 이 바뀌어도 이 마이그레이션의 결과는 바뀌지 않는다)
+_holiday_rule = Table(
+    "t_holiday_rule", MetaData(),
+    Column("id", Integer, primary_key=True, autoincrement=True, comment="休日ルールID"),
+    Column("hospital_id", Integer, nullable=False, comment="病院ID"),
+    Column("rule_type", String(20), nullable=False, comment="種類:weekly:毎週, national:祝日, range:期間"),
+    Column("weekday", Integer, comment="曜日:0:月 ... 6:日 (weekly)"),
+    Column("holiday_set", String(20), comment="祝日セット:jp (national)"),
+    Column("start_date", Date, comment="適用開始日 (range は必須)"),
+    Column("end_date", Date, comment="適用終了日 (range は必須)"),
+    Column("name", String(255), comment="名称"),
+    Column("deleted_flag", Boolean, comment="削除フラグ"),
+    Column("created_at", DateTime, comment="作成日"),
+    Column("created_by", String(255), comment="作成者"),
+    Column("updated_at", DateTime, comment="更新日"),
+    Column("updated_by", String(255), comment="更新者"),
+    Index("IX_HolidayRule_Hospital", "hospital_id", "deleted_flag"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    if not inspect(conn).has_table(_holiday_rule.name):
+        _holiday_rule.create(conn)
@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+
+from db.migrations import create_index_if_missing
+
+VERSION = 8
+DESCRIPTION = "per-hospital medical record number index (MRN lookups, patient import de-duplication)"
+
+
+def upgrade(conn: Connection) -> None:
+    create_index_if_missing(conn, "IX_User_MedicalRecordNo", "t_user", ["hospital_id", "medical_record_no"])
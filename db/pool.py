@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def engine_options() -> Dict[str, Any]:
+    """환경 변수에서 엔진 공통 옵션(SQL echo, 커넥션 풀 설정)을 읽어 반환합니다.
+
+    - DB_ECHO: SQL 로그 출력 여부 (기본값 false)
+    - DB_POOL_SIZE: 상시 유지할 커넥션 수 (기본값 5)
+    - DB_MAX_OVERFLOW: pool_size를 초과해 추가로 열 수 있는 커넥션 수 (기본값 10)
+    - DB_POOL_TIMEOUT: 커넥션을 얻기 위해 기다리는 최대 초 (기본값 30)
+    - DB_POOL_RECYCLE: 이 초보다 오래된 커넥션은 재생성 (기본값 1800, MySQL wait_timeout 대비)
+    - DB_POOL_PRE_PING: 체크아웃 시 커넥션 생존 확인 여부 (기본값 true)
+    """
+    return {
+        "echo": _env_bool("DB_ECHO", False),
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+
+
+class PoolTelemetry:
+    """커넥션 체크아웃 대기 시간과 타임아웃 횟수를 누적합니다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            if waited > self.wait_seconds_max:
+                self.wait_seconds_max = waited
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        with self._lock:
+            checkouts = self.checkouts
+            data = {
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / checkouts, 6) if checkouts else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+        data.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+        return data
+
+
+class _TelemetryMixin:
+    """Pool.connect()에 걸린 시간을 대기 시간으로 기록합니다. (pre-ping, 신규 접속 포함)"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.telemetry = PoolTelemetry()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.telemetry.record_timeout()
+            raise
+        self.telemetry.record_checkout(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_TelemetryMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TelemetryMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(pool: Optional[Pool]) -> Optional[Dict[str, Any]]:
+    """풀 상태(checked-out, overflow, 대기 시간, 타임아웃)를 dict로 반환합니다."""
+    telemetry = getattr(pool, "telemetry", None)
+    if telemetry is None:
+        return None
+    return telemetry.snapshot(pool)
@@ -0,0 +1,88 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# 쓰기를 커밋한 클라이언트는 이 시간(초) 동안 읽기도 프라이머리에서 한다. (레플리카 지연 대비)
+READ_YOUR_WRITES_SECONDS = float(os.environ.get("READ_YOUR_WRITES_SECONDS", "5"))
+MAX_CLIENTS = int(os.environ.get("READ_YOUR_WRITES_MAX_CLIENTS", "10000"))
+
+CLIENT_KEY = "read_routing_client"
+READ_ONLY_KEY = "read_routing_read_only"
+_WROTE_KEY = "read_routing_wrote"
+
+
+class ReadOnlySessionError(RuntimeError):
+    """읽기 전용 세션에서 쓰기를 시도했을 때 발생합니다."""
+
+
+class RecentWriters:
+    """최근에 쓰기를 커밋한 클라이언트(Authorization 헤더)를 TTL + LRU 로 보관합니다."""
+
+    def __init__(self, ttl_seconds: float = READ_YOUR_WRITES_SECONDS, max_entries: int = MAX_CLIENTS):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+
+    def mark(self, client: str) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        self._entries[client] = time.monotonic() + self.ttl_seconds
+        self._entries.move_to_end(client)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def wrote_recently(self, client: Optional[str]) -> bool:
+        if client is None:
+            return False
+        expires_at = self._entries.get(client)
+        if expires_at is None:
+            return False
+        if time.monotonic() >= expires_at:
+            del self._entries[client]
+            return False
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+recent_writers = RecentWriters()
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_flush_on_read_only(session: Session, flush_context, instances) -> None:
+    if session.info.get(READ_ONLY_KEY) and (session.new or session.dirty or session.deleted):
+        raise ReadOnlySessionError("flush attempted on a read-only session")
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session: Session, flush_context) -> None:
+    if session.new or session.dirty or session.deleted:
+        session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml_write(state: ORMExecuteState) -> None:
+    # claim_slot, cancel_reservation 처럼 session.execute(update(...)) 로 직접 쓰는 경우
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    if state.session.info.get(READ_ONLY_KEY):
+        raise ReadOnlySessionError("DML executed on a read-only session")
+    state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session) -> None:
+    if session.info.pop(_WROTE_KEY, False):
+        client = session.info.get(CLIENT_KEY)
+        if client is not None:
+            recent_writers.mark(client)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_write_mark(session: Session) -> None:
+    session.info.pop(_WROTE_KEY, None)
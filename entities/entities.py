@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Time, Text, Boolean, func, LargeBinary, ForeignKey
-from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Date, DateTime, Time, Text, Boolean, func, LargeBinary, ForeignKey, Index, UniqueConstraint, CheckConstraint, event
+from sqlalchemy.orm import deferred, relationship
 from db.database import Base
 
 class THoliday(Base):
     __tablename__ = 't_holiday'
+    __table_args__ = (
+        Index('IX_Holiday_Hospital_Date', 'hospital_id', 'holiday_date'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True, comment='定休日ID')
     hospital_id = Column(Integer, nullable=False, comment='病院ID')
     holiday_date = Column(Date, nullable=False, comment='定休日')
@@ -13,13 +18,73 @@ class THoliday(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment='更新日')
     updated_by = Column(String(255), comment='更新者')
 
+class THolidayRule(Base):
+    __tablename__ = 't_holiday_rule'
+    __table_args__ = (
+        Index('IX_HolidayRule_Hospital', 'hospital_id', 'deleted_flag'),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True, comment='休日ルールID')
+    hospital_id = Column(Integer, nullable=False, comment='病院ID')
+    rule_type = Column(String(20), nullable=False, comment='種類:weekly:毎週, national:祝日, range:期間')
+    weekday = Column(Integer, comment='曜日:0:月 ... 6:日 (weekly)')
+    holiday_set = Column(String(20), comment='祝日セット:jp (national)')
+    start_date = Column(Date, comment='適用開始日 (range は必須)')
+    end_date = Column(Date, comment='適用終了日 (range は必須)')
+    name = Column(String(255), comment='名称')
+    deleted_flag = Column(Boolean, default=False, comment='削除フラグ')
+    created_at = Column(DateTime, default=func.now(), comment='作成日')
+    created_by = Column(String(255), comment='作成者')
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment='更新日')
+    updated_by = Column(String(255), comment='更新者')
+
+class TScheduleTemplate(Base):
+    __tablename__ = 't_schedule_template'
+    __table_args__ = (
+        Index('IX_ScheduleTemplate_Hospital', 'hospital_id', 'deleted_flag'),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True, comment='診療スケジュールID')
+    hospital_id = Column(Integer, nullable=False, comment='病院ID')
+    weekday = Column(Integer, nullable=False, comment='曜日:0:月 ... 6:日')
+    open_time = Column(Time, nullable=False, comment='受付開始時間')
+    close_time = Column(Time, nullable=False, comment='受付終了時間')
+    slot_minutes = Column(Integer, nullable=False, default=30, comment='予約枠の長さ（分）')
+    capacity = Column(Integer, nullable=False, default=1, comment='予約枠あたりの定員')
+    deleted_flag = Column(Boolean, default=False, comment='削除フラグ')
+    created_at = Column(DateTime, default=func.now(), comment='作成日')
+    created_by = Column(String(255), comment='作成者')
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment='更新日')
+    updated_by = Column(String(255), comment='更新者')
+
+class TSlotOccupancy(Base):
+    __tablename__ = 't_slot_occupancy'
+    __table_args__ = (
+        UniqueConstraint('hospital_id', 'reservation_date', 'reservation_time', name='UX_SlotOccupancy_Slot'),
+        CheckConstraint('booked_count >= 0 AND booked_count <= max_count', name='CK_SlotOccupancy_Capacity'),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=True, comment='予約枠使用状況ID')
+    hospital_id = Column(Integer, nullable=False, comment='病院ID')
+    reservation_date = Column(Date, nullable=False, comment='予約日')
+    reservation_time = Column(Time, nullable=False, comment='予約時間')
+    booked_count = Column(Integer, nullable=False, default=0, comment='予約済み件数')
+    max_count = Column(Integer, nullable=False, comment='予約上限数（管理者の追加枠を含む）')
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment='更新日')
+
 class TReservation(Base):
     __tablename__ = 't_reservation'
+    __table_args__ = (
+        Index('FK_Reservation_User', 'user_id'),
+        Index('IX_Reservation_Slot', 'hospital_id', 'reservation_date', 'reservation_time', 'deleted_flag'),
+        Index('IX_Reservation_Date', 'reservation_date', 'reservation_time', 'id'),
+        Index('IX_Reservation_UserAt', 'user_id', 'reservation_at'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True, comment='予約id')
     user_id = Column(Integer, ForeignKey('t_user.id'), nullable=False, comment='ユーザーID')
     hospital_id = Column(Integer, nullable=False, comment='病院ID')
     reservation_date = Column(Date, nullable=False, comment='予約日')
     reservation_time = Column(Time, nullable=False, comment='予約時間')
+    # reservation_date + reservation_time 을 합친 값. 미래 예약 조회와 이력 정렬을 인덱스로 처리하기 위한 컬럼이며
+    # ORM 으로 쓸 때는 _sync_reservation_at 이 채운다. (insert(TReservation) 로 직접 넣을 때는 직접 지정)
+    reservation_at = Column(DateTime, comment='予約日時')
     cancel_date = Column(Date, comment='予約キャンセル日')
     treatment = Column(Text, comment='治療内容')
     deleted_flag = Column(Boolean, default=False, comment='削除フラグ')
@@ -30,8 +95,20 @@ class TReservation(Base):
 
     patient = relationship("TUser")
 
+@event.listens_for(TReservation, "before_insert")
+@event.listens_for(TReservation, "before_update")
+def _sync_reservation_at(mapper, connection, target: TReservation) -> None:
+    if target.reservation_date is not None and target.reservation_time is not None:
+        target.reservation_at = datetime.combine(target.reservation_date, target.reservation_time)
+
 class TUser(Base):
     __tablename__ = 't_user'
+    __table_args__ = (
+        Index('IX_User_LineId', 'line_id'),
+        Index('IX_User_LoginId', 'login_id'),
+        Index('IX_User_PatientList', 'hospital_id', 'user_type', 'deleted_flag', 'last_name', 'first_name', 'id'),
+        Index('IX_User_MedicalRecordNo', 'hospital_id', 'medical_record_no'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True, comment='ユーザーID')
     hospital_id = Column(Integer, nullable=False, comment='病院ID')
     medical_record_no = Column(String(255), nullable=True, comment='カルテ番号')
@@ -60,7 +137,9 @@ class THospital(Base):
     address = Column(String(255), nullable=False, comment='住所')
     phone = Column(String(20), nullable=False, comment='連絡先')
     fax = Column(String(20), comment='fax')
-    line_qr_code = Column(LargeBinary, nullable=False, comment='LINEQRコード')
+    # 큰 BLOB 이므로 기본적으로 로드하지 않는다. 필요한 곳에서 undefer(THospital.line_qr_code) 로 읽는다.
+    line_qr_code = deferred(Column(LargeBinary, nullable=False, comment='LINEQRコード'))
+    line_qr_code_hash = Column(String(64), comment='LINEQRコードのSHA-256')
     reservation_policy_header = Column(Text, comment='予約ポリシーヘッダー')
     reservation_policy_body = Column(Text, comment='予約ポリシーボディー')
     treatment = Column(Text, comment='治療内容')
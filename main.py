@@ -1,25 +1,69 @@
-from fastapi import FastAPI
+from dotenv import load_dotenv
+
+# 환경 변수를 읽는 모듈(db.database, 각종 캐시 설정)을 import 하기 전에 .env 를 불러온다.
+load_dotenv()
+
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from fastapi import Depends, FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi import HTTPException
-from starlette.responses import JSONResponse
+from utils.json_response import FastJSONResponse, FastJSONRoute
 from utils.i18n import translate_detail
+from utils import request_metrics
+from auth.ops_access import require_metrics_token
+from auth.password_hashing import password_hashing_pool
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.responses import PlainTextResponse
 from routers import patientRouter, reservationRouter, authRouter, hospitalRouter
-from dotenv import load_dotenv
-import importlib
-import db.database # Import db.database first
-import logging
+from db import database
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# 기동 시 미리 열어 둘 커넥션 수 (0 이면 첫 요청 때 연다. DB_POOL_SIZE 가 상한)
+DB_POOL_WARMUP = int(os.environ.get("DB_POOL_WARMUP", "0"))
+# 기동 시 예약이 많은 병원부터 이 수만큼 공개 정보, 스케줄, 예약 가능 시간(휴일 포함)을 캐시에 올린다. 0 이면 하지 않는다.
+WARMUP_HOSPITALS = int(os.environ.get("WARMUP_HOSPITALS", "200"))
+
 
-# Force reload db.database to ensure latest changes are picked up
-importlib.reload(db.database)
+async def warm_up() -> dict:
+    """커넥션 풀과 자주 쓰는 캐시를 미리 채웁니다. 실패해도 기동은 계속한다. (첫 요청 때 채워진다)"""
+    report = {}
+    if database.AsyncSessionLocal is None:
+        return report
+    try:
+        if DB_POOL_WARMUP > 0:
+            report["connections"] = await database.warm_pool(DB_POOL_WARMUP)
+        if WARMUP_HOSPITALS > 0:
+            now = datetime.now()
+            async with database.AsyncReadSessionLocal() as db:
+                hospital_ids = await reservationRouter.active_hospital_ids(db, now.date(), WARMUP_HOSPITALS)
+                report["hospitals"] = await hospitalRouter.warm_hospital_caches(db, hospital_ids)
+                report["availability"] = await reservationRouter.warm_availability(db, hospital_ids, now)
+    except Exception:
+        logger.exception("startup warm-up failed; continuing with cold caches")
+    return report
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    report = await warm_up()
+    logger.info("startup completed in %.1f ms %s", (time.perf_counter() - started) * 1000, report)
+    yield
+    password_hashing_pool.shutdown()
+    await database.dispose_engines()
+
+
+app = FastAPI(lifespan=lifespan)
+# response_model 이 없는 엔드포인트는 orjson 으로 직렬화한다. (라우터는 각 APIRouter 에서 지정)
+app.router.route_class = FastJSONRoute
 
 # CORS 설정
 origins = [
@@ -33,6 +77,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 가장 바깥에서 라우트별 응답 시간과 DB 비용을 집계한다. (Server-Timing 헤더, GET /metrics)
+app.add_middleware(request_metrics.RequestMetricsMiddleware)
 
 # 라우터 포함
 app.include_router(authRouter.router)
@@ -45,16 +91,34 @@ def read_root():
     return {"message": "Badara Dental Clinic API is running."}
 
 
+@app.get("/health/db-pool", dependencies=[Depends(require_metrics_token)])
+def read_db_pool_stats():
+    """커넥션 풀 통계 (checked-out, overflow, 대기 시간, 타임아웃)를 반환합니다."""
+    return database.get_pool_stats()
+
+
+@app.get("/health/password-hashing", dependencies=[Depends(require_metrics_token)])
+def read_password_hashing_stats():
+    """bcrypt 해시 전용 스레드 풀의 대기열 지표를 반환합니다."""
+    return password_hashing_pool.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_metrics_token)])
+def read_metrics():
+    """라우트별 응답 시간 히스토그램, SQL 실행 횟수/시간, 느린 쿼리 수를 Prometheus 텍스트 형식으로 반환합니다."""
+    return PlainTextResponse(request_metrics.registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_to_japanese(request, exc: HTTPException):
     translated = translate_detail(exc.detail)
-    return JSONResponse(status_code=exc.status_code, content={"detail": translated}, headers=exc.headers)
+    return FastJSONResponse(status_code=exc.status_code, content={"detail": translated}, headers=exc.headers)
 
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_to_japanese(request, exc: RequestValidationError):
     # 利用者向けに簡潔な日本語メッセージのみを返す
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=422,
         content={
             "detail": "入力内容に誤りがあります。ご確認ください。",
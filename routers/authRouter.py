@@ -1,20 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth import authManager
-from db.database import get_db
+from db.database import get_async_db
 from entities.entities import TUser
 from enums.user_type import UserType
 from schemas import Token, User, UserUpdate, LineLoginRequest
+from utils.json_response import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/token/line", response_model=Token)
-async def login_for_access_token_line(request: LineLoginRequest, db: Session = Depends(get_db)):
+async def login_for_access_token_line(request: LineLoginRequest, db: AsyncSession = Depends(get_async_db)):
     """LINE ID로 사용자를 확인하고 액세스 토큰을 발급합니다."""
-    user = authManager.get_user_by_line_id(db, request.line_id)
+    user = await authManager.get_user_by_line_id(db, request.line_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -31,11 +32,11 @@ async def login_for_access_token_line(request: LineLoginRequest, db: Session = D
 
 
 @router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """사용자 로그인 및 액세스 토큰 발급"""
     # form_data.username is the login_id
-    user = authManager.get_user(db, form_data.username)
-    if not user or not authManager.verify_password(form_data.password, user.password):
+    user = await authManager.get_user(db, form_data.username)
+    if not user or not await authManager.verify_password_async(form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -54,7 +55,7 @@ async def read_users_me(current_user: TUser = Depends(authManager.get_current_ac
     return current_user
 
 @router.put("/api/users/me", response_model=User)
-async def update_users_me(user_update: UserUpdate, db: Session = Depends(get_db), current_user: TUser = Depends(authManager.get_current_active_user)):
+async def update_users_me(user_update: UserUpdate, db: AsyncSession = Depends(get_async_db), current_user: TUser = Depends(authManager.get_current_active_user)):
     """현재 로그인한 사용자 정보를 업데이트합니다. (토큰 인증 필요)"""
     update_data = user_update.model_dump(exclude_unset=True)
     
@@ -1,49 +1,155 @@
 import base64
-from typing import Optional
+from typing import Literal, Optional
 from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Body
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form, Body, Request, Query
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 import schemas
 from auth import authManager
-from db.database import get_db
-from entities.entities import THospital, TUser, THoliday
+from db.database import get_async_db, get_async_read_db
+from entities.entities import THospital, TUser, THoliday, THolidayRule, TScheduleTemplate
 from enums.user_type import UserType
-from schemas.hospital import Hospital, Holiday, HolidayCreate
+from schemas.hospital import (
+    Hospital, Holiday, HolidayBulk, HolidayBulkDeleteResult, HolidayBulkResult, HolidayCreate, HolidayRule,
+    HolidayRuleCreate, ScheduleTemplate,
+)
+from utils.availability_cache import invalidate_on_commit
+from utils.holiday_calendar import holiday_calendar_cache
+from utils.http_cache import content_hash, hospital_qr_cache, hospital_response_cache
+from utils.json_response import FastJSONRoute
+from utils.slot_engine import week_schedule_cache
+
+router = APIRouter(route_class=FastJSONRoute)
+
+# line_qr_code 응답 형식: inline = Base64 PNG (기존), url = QR 이미지 엔드포인트 URL
+QrFormat = Literal["inline", "url"]
+QR_FORMATS = ("inline", "url")
+
+# ?v=<해시> 로 요청된 QR 이미지는 내용이 바뀌면 URL 도 바뀌므로 길게 캐시해도 된다.
+QR_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _qr_url(request: Request, hospital: THospital) -> str:
+    url = request.app.url_path_for("get_hospital_line_qr", hospital_code=hospital.hospital_code)
+    if hospital.line_qr_code_hash:
+        url += f"?v={hospital.line_qr_code_hash[:16]}"
+    return url
+
+
+def _hospital_query(qr_format: str):
+    query = select(THospital)
+    if qr_format == "inline":
+        query = query.options(undefer(THospital.line_qr_code))
+    return query
+
+
+def _to_schema(request: Request, hospital: THospital, qr_format: str) -> Hospital:
+    if qr_format == "url":
+        return Hospital.from_entity(hospital, line_qr_code=_qr_url(request, hospital))
+    return Hospital.from_entity(hospital)
+
+
+async def warm_hospital_caches(db: AsyncSession, hospital_ids: list) -> int:
+    """병원 공개 정보(inline 형식)와 LINE QR 이미지 응답을 한 번의 조회로 캐시에 넣습니다. (기동 시 워밍업)"""
+    if not hospital_ids:
+        return 0
+    result = await db.execute(
+        _hospital_query("inline").filter(THospital.id.in_(hospital_ids), THospital.deleted_flag == False)
+    )
+    hospitals = result.scalars().all()
+    for hospital in hospitals:
+        body = Hospital.from_entity(hospital).model_dump_json().encode()
+        hospital_response_cache.set((hospital.hospital_code, "inline"), body)
+        if hospital.line_qr_code is not None:
+            hospital_qr_cache.set(hospital.hospital_code, bytes(hospital.line_qr_code), media_type="image/png")
+    return len(hospitals)
+
+
+def invalidate_hospital_caches(hospital_code: str) -> None:
+    for qr_format in QR_FORMATS:
+        hospital_response_cache.invalidate((hospital_code, qr_format))
+    hospital_qr_cache.invalidate(hospital_code)
 
-router = APIRouter()
 
 @router.get("/api/hospital/{hospital_code}", response_model=Optional[Hospital])
 async def get_hospital_info(
     hospital_code: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    qr_format: QrFormat = Query("inline", description="line_qr_code を Base64 (inline) で返すか、画像 URL (url) で返すか"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """병원 공개 코드로 병원 정보를 조회합니다."""
-    hospital = db.query(THospital).filter(THospital.hospital_code == hospital_code, THospital.deleted_flag == False).first()
-    if not hospital:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hospital not found")
-    
-    return hospital
+    """
+    병원 공개 코드로 병원 정보를 조회합니다.
+    직렬화된 응답은 hospital_code 별로 캐시되며, ETag / If-None-Match 로 304 응답을 지원합니다.
+    """
+    cache_key = (hospital_code, qr_format)
+    cached = hospital_response_cache.get(cache_key)
+    if cached is None:
+        result = await db.execute(
+            _hospital_query(qr_format).filter(THospital.hospital_code == hospital_code, THospital.deleted_flag == False).limit(1)
+        )
+        hospital = result.scalars().first()
+        if not hospital:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hospital not found")
+        body = _to_schema(request, hospital, qr_format).model_dump_json().encode()
+        cached = hospital_response_cache.set(cache_key, body)
+
+    return cached.to_response(request)
+
+
+@router.get("/api/hospital/{hospital_code}/line-qr", name="get_hospital_line_qr")
+async def get_hospital_line_qr(
+    hospital_code: str,
+    request: Request,
+    v: Optional[str] = Query(None, description="QR 画像の内容ハッシュ（先頭16文字）"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    병원의 LINE QR 코드를 PNG 이미지 그대로 반환합니다.
+    ETag 는 이미지 내용의 해시이며, 현재 내용과 일치하는 ?v= 로 요청하면 장기 캐시 헤더를 붙입니다.
+    """
+    cached = hospital_qr_cache.get(hospital_code)
+    if cached is None:
+        result = await db.execute(
+            select(THospital.line_qr_code).filter(THospital.hospital_code == hospital_code, THospital.deleted_flag == False).limit(1)
+        )
+        qr = result.scalar()
+        if qr is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hospital not found")
+        cached = hospital_qr_cache.set(hospital_code, bytes(qr), media_type="image/png")
+
+    cache_control = "no-cache"
+    if v and len(v) >= 16 and cached.etag.strip('"').startswith(v):
+        cache_control = QR_IMMUTABLE_CACHE_CONTROL
+    return cached.to_response(request, cache_control=cache_control)
+
 
 @router.get("/api/hospitals/me", response_model=Hospital)
 async def get_my_hospital_info(
-    db: Session = Depends(get_db),
+    request: Request,
+    qr_format: QrFormat = Query("inline", description="line_qr_code を Base64 (inline) で返すか、画像 URL (url) で返すか"),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
     현재 로그인한 사용자의 병원 정보를 조회합니다.
     """
-    hospital = db.query(THospital).filter(THospital.id == current_user.hospital_id, THospital.deleted_flag == False).first()
+    result = await db.execute(
+        _hospital_query(qr_format).filter(THospital.id == current_user.hospital_id, THospital.deleted_flag == False).limit(1)
+    )
+    hospital = result.scalars().first()
     if not hospital:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hospital not found")
-    
-    return hospital
+
+    return _to_schema(request, hospital, qr_format)
 
 @router.patch("/api/hospitals/me", response_model=Hospital)
 async def update_my_hospital_info(
     hospital_info: schemas.hospital.HospitalUpdate = Body(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
@@ -56,7 +162,8 @@ async def update_my_hospital_info(
             detail="Not authorized to update hospital information"
         )
 
-    hospital_to_update = db.query(THospital).filter(THospital.id == current_user.hospital_id).first()
+    result = await db.execute(_hospital_query("inline").filter(THospital.id == current_user.hospital_id).limit(1))
+    hospital_to_update = result.scalars().first()
 
     if not hospital_to_update:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hospital not found")
@@ -75,6 +182,7 @@ async def update_my_hospital_info(
             else:
                 decoded_value = value # Should not happen if validation is correct
             setattr(hospital_to_update, key, decoded_value)
+            hospital_to_update.line_qr_code_hash = content_hash(decoded_value)
         elif key == "treatment" and value is not None:
             # 리스트로 들어온 치료 항목을 검증하고 콤마로 join하여 DB에 저장
             if not isinstance(value, list):
@@ -87,16 +195,17 @@ async def update_my_hospital_info(
         else:
             setattr(hospital_to_update, key, value)
 
-    db.commit()
-    db.refresh(hospital_to_update)
+    await db.commit()
+    invalidate_hospital_caches(hospital_to_update.hospital_code)
+    await db.refresh(hospital_to_update)
 
-    return hospital_to_update
+    return Hospital.from_entity(hospital_to_update)
 
 
 @router.get("/api/hospitals/me/holidays", response_model=list[Holiday])
 async def get_my_hospital_holidays(
     target_date: date,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
@@ -105,19 +214,19 @@ async def get_my_hospital_holidays(
     start_date = target_date - timedelta(days=10)
     end_date = target_date + timedelta(days=10)
 
-    holidays = db.query(THoliday).filter(
+    result = await db.execute(select(THoliday).filter(
         THoliday.hospital_id == current_user.hospital_id,
         THoliday.holiday_date >= start_date,
         THoliday.holiday_date <= end_date,
         THoliday.deleted_flag == False
-    ).all()
-    return holidays
+    ))
+    return result.scalars().all()
 
 
 @router.post("/api/hospitals/me/holidays", response_model=Holiday)
 async def create_my_hospital_holiday(
     holiday_data: HolidayCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
@@ -136,15 +245,17 @@ async def create_my_hospital_holiday(
         updated_by=current_user.email
     )
     db.add(new_holiday)
-    db.commit()
-    db.refresh(new_holiday)
+    invalidate_on_commit(db, current_user.hospital_id)
+    await db.commit()
+    holiday_calendar_cache.invalidate(current_user.hospital_id)
+    await db.refresh(new_holiday)
     return new_holiday
 
 
 @router.delete("/api/hospitals/me/holidays/{holiday_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_my_hospital_holiday(
     holiday_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
@@ -156,12 +267,236 @@ async def delete_my_hospital_holiday(
             detail="Not authorized to delete holiday"
         )
 
-    holiday_to_delete = db.query(THoliday).filter(THoliday.id == holiday_id, THoliday.hospital_id == current_user.hospital_id).first()
+    result = await db.execute(
+        select(THoliday).filter(THoliday.id == holiday_id, THoliday.hospital_id == current_user.hospital_id).limit(1)
+    )
+    holiday_to_delete = result.scalars().first()
 
     if not holiday_to_delete:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Holiday not found")
 
     holiday_to_delete.deleted_flag = True
-    db.commit()
+    invalidate_on_commit(db, current_user.hospital_id)
+    await db.commit()
+    holiday_calendar_cache.invalidate(current_user.hospital_id)
 
     return
+
+
+@router.post("/api/hospitals/me/holidays/bulk", response_model=HolidayBulkResult)
+async def create_my_hospital_holidays_bulk(
+    holidays: HolidayBulk,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """
+    現在ログインしているユーザーの病院の休日を一括で登録します。
+    holiday_dates (日付の一覧) か start_date〜end_date を指定します。登録済みの日付はそのまま、
+    削除済みの日付は元に戻し、残りを 1 回の INSERT でまとめて登録します。
+    """
+    if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to add holiday"
+        )
+
+    dates = holidays.dates()
+    requested = set(dates)
+    result = await db.execute(select(THoliday.id, THoliday.holiday_date, THoliday.deleted_flag).filter(
+        THoliday.hospital_id == current_user.hospital_id,
+        THoliday.holiday_date.between(dates[0], dates[-1])
+    ))
+    active, deleted_ids = set(), {}
+    for holiday_id, holiday_date, deleted_flag in result.all():
+        if holiday_date not in requested:
+            continue
+        if deleted_flag:
+            deleted_ids.setdefault(holiday_date, holiday_id)
+        else:
+            active.add(holiday_date)
+    restore_ids = [holiday_id for holiday_date, holiday_id in deleted_ids.items() if holiday_date not in active]
+    new_dates = [d for d in dates if d not in active and d not in deleted_ids]
+
+    if restore_ids:
+        await db.execute(
+            update(THoliday).where(THoliday.id.in_(restore_ids)).values(deleted_flag=False, updated_by=current_user.email)
+        )
+    if new_dates:
+        await db.execute(insert(THoliday).values([
+            {"hospital_id": current_user.hospital_id, "holiday_date": d, "deleted_flag": False,
+             "created_by": current_user.email, "updated_by": current_user.email}
+            for d in new_dates
+        ]))
+    if restore_ids or new_dates:
+        invalidate_on_commit(db, current_user.hospital_id)
+        await db.commit()
+        holiday_calendar_cache.invalidate(current_user.hospital_id)
+
+    return HolidayBulkResult(created=len(new_dates), restored=len(restore_ids), existing=len(active))
+
+
+@router.post("/api/hospitals/me/holidays/bulk-delete", response_model=HolidayBulkDeleteResult)
+async def delete_my_hospital_holidays_bulk(
+    holidays: HolidayBulk,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """
+    現在ログインしているユーザーの病院の休日を一括で削除します。(1 回の UPDATE)
+    """
+    if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to delete holiday"
+        )
+
+    if holidays.holiday_dates is not None:
+        date_filter = THoliday.holiday_date.in_(holidays.dates())
+    else:
+        date_filter = THoliday.holiday_date.between(holidays.start_date, holidays.end_date)
+    result = await db.execute(
+        update(THoliday)
+        .where(THoliday.hospital_id == current_user.hospital_id, date_filter, THoliday.deleted_flag == False)
+        .values(deleted_flag=True, updated_by=current_user.email)
+    )
+    if result.rowcount:
+        invalidate_on_commit(db, current_user.hospital_id)
+        await db.commit()
+        holiday_calendar_cache.invalidate(current_user.hospital_id)
+
+    return HolidayBulkDeleteResult(deleted=result.rowcount)
+
+
+@router.get("/api/hospitals/me/holiday-rules", response_model=list[HolidayRule])
+async def get_my_hospital_holiday_rules(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """
+    現在ログインしているユーザーの病院の休日ルール（毎週の休診日・祝日・休業期間）を取得します。
+    """
+    result = await db.execute(select(THolidayRule).filter(
+        THolidayRule.hospital_id == current_user.hospital_id,
+        THolidayRule.deleted_flag == False
+    ).order_by(THolidayRule.id))
+    return result.scalars().all()
+
+
+@router.post("/api/hospitals/me/holiday-rules", response_model=HolidayRule)
+async def create_my_hospital_holiday_rule(
+    rule: HolidayRuleCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """
+    現在ログインしているユーザーの病院に休日ルールを追加します。
+    - weekly: 毎週 weekday 曜日が休診
+    - national: holiday_set (jp) の祝日が休診
+    - range: start_date 〜 end_date が休診
+    weekly / national は start_date, end_date を指定するとその期間だけ適用されます。
+    """
+    if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to add holiday"
+        )
+
+    new_rule = THolidayRule(
+        hospital_id=current_user.hospital_id,
+        **rule.model_dump(),
+        created_by=current_user.email,
+        updated_by=current_user.email
+    )
+    db.add(new_rule)
+    invalidate_on_commit(db, current_user.hospital_id)
+    await db.commit()
+    holiday_calendar_cache.invalidate(current_user.hospital_id)
+    await db.refresh(new_rule)
+    return new_rule
+
+
+@router.delete("/api/hospitals/me/holiday-rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_my_hospital_holiday_rule(
+    rule_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """
+    現在ログインしているユーザーの病院の休日ルールを削除します。
+    """
+    if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to delete holiday"
+        )
+
+    result = await db.execute(select(THolidayRule).filter(
+        THolidayRule.id == rule_id,
+        THolidayRule.hospital_id == current_user.hospital_id,
+        THolidayRule.deleted_flag == False
+    ).limit(1))
+    rule_to_delete = result.scalars().first()
+
+    if not rule_to_delete:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Holiday rule not found")
+
+    rule_to_delete.deleted_flag = True
+    rule_to_delete.updated_by = current_user.email
+    invalidate_on_commit(db, current_user.hospital_id)
+    await db.commit()
+    holiday_calendar_cache.invalidate(current_user.hospital_id)
+
+    return
+
+
+@router.get("/api/hospitals/me/schedule", response_model=list[ScheduleTemplate])
+async def get_my_hospital_schedule(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """
+    現在ログインしているユーザーの病院の診療スケジュール（曜日別の受付時間・予約枠の長さ・定員）を取得します。
+    空の場合は既定のスケジュール（毎日 9:00〜19:00、30分枠、定員1）が使われます。
+    """
+    result = await db.execute(select(TScheduleTemplate).filter(
+        TScheduleTemplate.hospital_id == current_user.hospital_id,
+        TScheduleTemplate.deleted_flag == False
+    ).order_by(TScheduleTemplate.weekday, TScheduleTemplate.open_time))
+    return result.scalars().all()
+
+
+@router.put("/api/hospitals/me/schedule", response_model=list[ScheduleTemplate])
+async def replace_my_hospital_schedule(
+    schedule: list[ScheduleTemplate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """
+    現在ログインしているユーザーの病院の診療スケジュールを、送信された内容で置き換えます。
+    """
+    if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update schedule"
+        )
+
+    await db.execute(
+        update(TScheduleTemplate)
+        .where(TScheduleTemplate.hospital_id == current_user.hospital_id, TScheduleTemplate.deleted_flag == False)
+        .values(deleted_flag=True, updated_by=current_user.email)
+    )
+    new_rows = [
+        TScheduleTemplate(
+            hospital_id=current_user.hospital_id,
+            **item.model_dump(),
+            created_by=current_user.email,
+            updated_by=current_user.email
+        )
+        for item in schedule
+    ]
+    db.add_all(new_rows)
+    invalidate_on_commit(db, current_user.hospital_id)
+    await db.commit()
+    week_schedule_cache.invalidate(current_user.hospital_id)
+
+    return sorted(schedule, key=lambda item: (item.weekday, item.open_time))
@@ -1,22 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from sqlalchemy import or_, and_, func
+from sqlalchemy import or_, and_, func, select
 from datetime import datetime, timedelta
 
 from auth import authManager
-from db.database import get_db
+from db.database import get_async_db, get_async_read_db
 from entities.entities import TUser, THospital, TReservation
-from schemas import User, PatientCreate, UserUpdate, UserType, PatientWithReservations, PatientNameId, UserWithLastReserve, PatientListCursorResponse
-from utils import hashid_manager
+from schemas import User, PatientCreate, UserUpdate, UserType, PatientWithReservations, PatientNameId, PatientListCursorResponse, PatientImportResult
+from utils import hashid_manager, patient_import
 from utils import cursor as cursor_util
+from utils.i18n import translate_detail
+from utils.json_response import FastJSONResponse, FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 @router.post("/api/users/patient", response_model=User, status_code=status.HTTP_201_CREATED)
-async def create_patient_user(user: PatientCreate, db: Session = Depends(get_db)):
+async def create_patient_user(user: PatientCreate, db: AsyncSession = Depends(get_async_db)):
     """새로운 환자(user_type="0") 사용자를 등록합니다."""
-    hospital = db.query(THospital).filter(THospital.hospital_code == user.hospital_code, THospital.deleted_flag == False).first()
+    result = await db.execute(
+        select(THospital).filter(THospital.hospital_code == user.hospital_code, THospital.deleted_flag == False).limit(1)
+    )
+    hospital = result.scalars().first()
     if not hospital:
         raise HTTPException(status_code=400, detail="Hospital with the given code not found.")
 
@@ -26,13 +31,13 @@ async def create_patient_user(user: PatientCreate, db: Session = Depends(get_db)
     )
     
     db.add(new_user)
-    db.flush()
-    db.refresh(new_user)
+    await db.flush()
+    await db.refresh(new_user)
     
     return new_user
 
 @router.put("/api/users/patient/{user_hash_id}", response_model=User)
-async def update_patient_info(user_hash_id: str, user_update: UserUpdate, db: Session = Depends(get_db), current_user: TUser = Depends(authManager.get_current_active_user)):
+async def update_patient_info(user_hash_id: str, user_update: UserUpdate, db: AsyncSession = Depends(get_async_db), current_user: TUser = Depends(authManager.get_current_active_user)):
     """ID로 환자(user_type="0") 사용자 정보를 업데이트합니다. (인증 필요)"""
     user_id = hashid_manager.decode_id(user_hash_id)
     if user_id is None:
@@ -41,7 +46,8 @@ async def update_patient_info(user_hash_id: str, user_update: UserUpdate, db: Se
     if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update patient information")
 
-    user_to_update = db.query(TUser).filter(TUser.id == user_id, TUser.user_type == UserType.PATIENT).first()
+    result = await db.execute(select(TUser).filter(TUser.id == user_id, TUser.user_type == UserType.PATIENT).limit(1))
+    user_to_update = result.scalars().first()
 
     if not user_to_update:
         raise HTTPException(status_code=404, detail="Patient user not found")
@@ -54,25 +60,26 @@ async def update_patient_info(user_hash_id: str, user_update: UserUpdate, db: Se
 
     # medical_record_no 중복 확인
     if 'medical_record_no' in update_data and update_data['medical_record_no'] is not None:
-        existing_patient = db.query(TUser).filter(
+        result = await db.execute(select(TUser.id).filter(
             TUser.hospital_id == user_to_update.hospital_id,
             TUser.medical_record_no == update_data['medical_record_no'],
             TUser.id != user_id
-        ).first()
+        ).limit(1))
+        existing_patient = result.first()
         if existing_patient:
             raise HTTPException(status_code=400, detail="Medical record number already exists for another patient in this hospital.")
 
     for key, value in update_data.items():
         setattr(user_to_update, key, value)
 
-    db.commit()
-    db.refresh(user_to_update)
+    await db.commit()
+    await db.refresh(user_to_update)
     
     return user_to_update
 
 
 @router.get("/api/users/patient/{user_hash_id}", response_model=PatientWithReservations)
-async def get_patient_by_id(user_hash_id: str, db: Session = Depends(get_db), current_user: TUser = Depends(authManager.get_current_active_user)):
+async def get_patient_by_id(user_hash_id: str, db: AsyncSession = Depends(get_async_read_db), current_user: TUser = Depends(authManager.get_current_active_user)):
     """ID로 환자(user_type=\"0\") 사용자 정보를 조회합니다. (인증 필요)"""
     user_id = hashid_manager.decode_id(user_hash_id)
     if user_id is None:
@@ -81,7 +88,8 @@ async def get_patient_by_id(user_hash_id: str, db: Session = Depends(get_db), cu
     if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view patient information")
 
-    patient = db.query(TUser).filter(TUser.id == user_id, TUser.user_type == UserType.PATIENT).first()
+    result = await db.execute(select(TUser).filter(TUser.id == user_id, TUser.user_type == UserType.PATIENT).limit(1))
+    patient = result.scalars().first()
 
     if not patient:
         raise HTTPException(status_code=404, detail="Patient user not found")
@@ -90,7 +98,10 @@ async def get_patient_by_id(user_hash_id: str, db: Session = Depends(get_db), cu
     if current_user.user_type == UserType.HOSPITAL_ADMIN and patient.hospital_id != current_user.hospital_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this patient's information")
 
-    reservations = db.query(TReservation).filter(TReservation.user_id == user_id).order_by(TReservation.reservation_date.desc(), TReservation.reservation_time.desc()).limit(10).all()
+    result = await db.execute(
+        select(TReservation).filter(TReservation.user_id == user_id).order_by(TReservation.reservation_at.desc()).limit(10)
+    )
+    reservations = result.scalars().all()
 
     patient_with_reservations = PatientWithReservations.model_validate(patient)
     patient_with_reservations.reservations = reservations
@@ -101,11 +112,17 @@ async def get_patient_by_id(user_hash_id: str, db: Session = Depends(get_db), cu
 
 
 
+# get_my_hospital_patients 의 select 컬럼 (순서는 응답 조립부와 같아야 한다)
+_PATIENT_LIST_COLUMNS = (
+    TUser.id, TUser.line_id, TUser.user_type, TUser.last_name, TUser.first_name,
+    TUser.contact, TUser.medical_record_no, TUser.last_reserve_date,
+)
+
 @router.get("/api/me/patients", response_model=PatientListCursorResponse)
 async def get_my_hospital_patients(
     limit: int = Query(1000, ge=1, le=2000),
     cursor: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
@@ -117,7 +134,8 @@ async def get_my_hospital_patients(
             detail="Only hospital administrators can view their hospital's patient list"
         )
 
-    base_query = db.query(TUser).filter(
+    # 응답에 필요한 컬럼만 조회한다. (password, email 등은 읽지 않는다)
+    base_query = select(*_PATIENT_LIST_COLUMNS).filter(
         TUser.hospital_id == current_user.hospital_id,
         TUser.user_type == UserType.PATIENT,
         TUser.deleted_flag == False
@@ -141,37 +159,44 @@ async def get_my_hospital_patients(
         except Exception:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="無効なカーソルです。")
 
-    patients = base_query.order_by(TUser.last_name, TUser.first_name, TUser.id).limit(limit + 1).all()
-
-    result = []
-    for p in patients:
-        res_date = None
-        if getattr(p, 'last_reserve_date', None) is not None:
-            # 날짜만 반환: YYYY-MM-DD
-            res_date = p.last_reserve_date.strftime('%Y-%m-%d %H:%M:%S')
-        item = UserWithLastReserve.model_validate(p).model_dump()
-        item.pop('email', None)
-        item.pop('login_id', None)
-        item['last_reserve_date'] = res_date
-        result.append(item)
-
-    hasnext = len(result) > limit
+    result = await db.execute(base_query.order_by(TUser.last_name, TUser.first_name, TUser.id).limit(limit + 1))
+    rows = result.all()
+
+    hasnext = len(rows) > limit
     next_cursor = None
     if hasnext:
-        result = result[:limit]
-        last = patients[limit - 1]
+        rows = rows[:limit]
+        last = rows[-1]
         next_cursor = cursor_util.encode_cursor({
             'last_name': last.last_name or '',
             'first_name': last.first_name or '',
             'id': last.id,
         })
 
-    return {"patients": result, "hasnext": hasnext, "next_cursor": next_cursor}
+    # PatientListCursorResponse 와 같은 형태를 한 번에 만들어 바로 직렬화한다. (중간 Pydantic 모델을 만들지 않는다)
+    hospital_hash_id = hashid_manager.encode_id(current_user.hospital_id)
+    patients = [
+        {
+            'email': None,
+            'line_id': line_id,
+            'login_id': None,
+            'user_type': user_type,
+            'last_name': last_name,
+            'first_name': first_name,
+            'contact': contact,
+            'id': hashid_manager.encode_id(user_id),
+            'hospital_id': hospital_hash_id,
+            'medical_record_no': medical_record_no,
+            'last_reserve_date': last_reserve_date.isoformat(' ', 'seconds') if last_reserve_date is not None else None,
+        }
+        for user_id, line_id, user_type, last_name, first_name, contact, medical_record_no, last_reserve_date in rows
+    ]
+    return FastJSONResponse({"patients": patients, "next_cursor": next_cursor, "hasnext": hasnext})
 
 
 @router.get("/api/me/patients/mrn-unconfirmed", response_model=List[PatientNameId])
 async def list_mrn_unconfirmed_patients(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
@@ -184,8 +209,8 @@ async def list_mrn_unconfirmed_patients(
             detail="Only hospital administrators can query this resource"
         )
 
-    rows = (
-        db.query(TUser.id, TUser.last_name, TUser.first_name)
+    result = await db.execute(
+        select(TUser.id, TUser.last_name, TUser.first_name)
         .filter(
             TUser.hospital_id == current_user.hospital_id,
             TUser.user_type == UserType.PATIENT,
@@ -193,22 +218,63 @@ async def list_mrn_unconfirmed_patients(
             or_(TUser.medical_record_no == None, TUser.medical_record_no == "")
         )
         .order_by(TUser.last_name, TUser.first_name)
-        .all()
     )
+    rows = result.all()
 
-    return [
+    # 직접 조립한 결과이므로 응답 모델 재검증 없이 바로 직렬화한다.
+    return FastJSONResponse([
         {
             "id": hashid_manager.encode_id(r.id),
             "name": f"{(r.last_name or '')}{(r.first_name or '')}",
         }
         for r in rows
-    ]
+    ])
+
+
+@router.post("/api/me/patients/import", response_model=PatientImportResult)
+async def import_my_hospital_patients(
+    request: Request,
+    import_format: patient_import.ImportFormat = Query("csv", alias="format", description="입력 형식 (csv 또는 ndjson)"),
+    encoding: patient_import.ImportEncoding = Query("utf-8", description="문자 코드 (utf-8 또는 Excel 의 cp932)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """
+    병원 관리자가 자신의 병원에 환자를 일괄 등록한다. 요청 본문(CSV 또는 NDJSON)을 읽으면서
+    BATCH_SIZE 행씩 중복을 걸러 내고 일괄 INSERT 로 저장한다. (utils.patient_import)
+    CSV 는 첫 줄이 헤더(line_id, last_name, first_name, contact 필수 / medical_record_no, email 선택)이다.
+    Excel(일본어)에서 저장한 CSV 는 encoding=cp932 로 보낸다. 디코딩할 수 없으면 그 줄 번호와 함께 400.
+    이미 등록된 line_id 와 병원 안의 medical_record_no 는 건너뛰고, 행별 오류와 함께 처리 건수와 처리 속도를 반환한다.
+    """
+    if current_user.user_type != UserType.HOSPITAL_ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only hospital administrators can import patients")
+
+    try:
+        report = await patient_import.import_patients(
+            db, current_user.hospital_id, request.stream(), import_format, encoding, created_by=current_user.email
+        )
+    except patient_import.ImportFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return FastJSONResponse({
+        "received": report.received,
+        "created": report.created,
+        "duplicates": report.duplicates,
+        "failed": report.failed,
+        "errors": [
+            {"line": error.line, "field": error.field, "detail": translate_detail(error.detail)}
+            for error in report.errors
+        ],
+        "errors_truncated": report.errors_truncated,
+        "elapsed_seconds": round(report.elapsed_seconds, 3),
+        "rows_per_second": round(report.rows_per_second, 1),
+    })
 
 
 @router.get("/api/me/patients/by-mrn/{medical_record_no}", response_model=User)
 async def get_patient_by_mrn(
     medical_record_no: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
@@ -217,12 +283,13 @@ async def get_patient_by_mrn(
     if current_user.user_type != UserType.HOSPITAL_ADMIN:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only hospital administrators can query this resource")
 
-    patient = db.query(TUser).filter(
+    result = await db.execute(select(TUser).filter(
         TUser.hospital_id == current_user.hospital_id,
         TUser.user_type == UserType.PATIENT,
         TUser.deleted_flag == False,
         TUser.medical_record_no == medical_record_no
-    ).first()
+    ).limit(1))
+    patient = result.scalars().first()
 
     if not patient:
         # i18n에서日本語に変換される（MRNは表示しない）
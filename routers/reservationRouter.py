@@ -1,108 +1,163 @@
-from datetime import date, datetime, timedelta
-from typing import List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from auth import authManager
-from db.database import get_db
-from entities.entities import TReservation, TUser, THoliday
-from schemas import Reservation, ReservationCreate, UserType, ReservationWithPatient, ReservationCreateForAdmin
-from utils import hashid_manager
+from db.database import get_async_db, get_async_read_db, is_replica_session, read_session_factory
+from db.read_routing import READ_YOUR_WRITES_SECONDS
+from entities.entities import TReservation, TUser
+from schemas import Reservation, ReservationCreate, UserType, ReservationCreateForAdmin, ReservationListCursorResponse, ReservationBatchResult
+from utils import hashid_manager, holiday_calendar, reservation_export, slot_engine, slot_ledger
+from utils import cursor as cursor_util
+from auth.principal_cache import invalidate_user_on_commit
+from utils.availability_cache import availability_cache, invalidate_on_commit
+from utils.i18n import translate_detail
+from utils.json_response import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
+
+# 당일 예약은 현재 시각으로부터 이 시간 이후의 슬롯만 허용
+RESERVATION_LEAD_TIME = timedelta(hours=3)
+
+# 관리자 예약은 슬롯 정원보다 이만큼 더 받을 수 있다. (기본 정원 1 → 관리자는 2건까지)
+ADMIN_EXTRA_CAPACITY = 1
+
+# 예약 가능 시간을 보여 주는 기간 (오늘 포함)
+AVAILABILITY_DAYS = 15
+
+# POST /api/reservations/admin/batch 한 번에 받을 수 있는 예약 수
+MAX_BATCH_RESERVATIONS = 200
+
+
+def _fully_booked_detail(limit: int) -> str:
+    """관리자 예약의 정원 초과 메시지. limit 은 슬롯 정원 + ADMIN_EXTRA_CAPACITY 이다."""
+    return f"Requested time slot is fully booked ({limit} reservations already exist)."
+
+
+def _availability_dates(today: date) -> list:
+    return [today + timedelta(days=i) for i in range(AVAILABILITY_DAYS)]
+
+
+async def active_hospital_ids(db: AsyncSession, today: date, limit: int) -> list:
+    """예약 가능 기간에 예약이 많은 병원부터 최대 limit 곳의 ID 를 반환합니다. (기동 시 워밍업 대상)"""
+    result = await db.execute(
+        select(TReservation.hospital_id).filter(
+            TReservation.reservation_date.between(today, today + timedelta(days=AVAILABILITY_DAYS - 1)),
+            TReservation.deleted_flag == False
+        ).group_by(TReservation.hospital_id).order_by(func.count(TReservation.id).desc()).limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def warm_availability(db: AsyncSession, hospital_ids: list, now: datetime) -> int:
+    """여러 병원의 예약 가능 시간을 예약/스케줄/휴일 각 1회 조회로 계산하여 캐시에 넣습니다. (기동 시 워밍업)"""
+    if not hospital_ids:
+        return 0
+    date_range = _availability_dates(now.date())
+    reservations_result = await db.execute(
+        select(TReservation.hospital_id, TReservation.reservation_date, TReservation.reservation_time).filter(
+            TReservation.hospital_id.in_(hospital_ids),
+            TReservation.reservation_date.in_(date_range),
+            TReservation.deleted_flag == False
+        )
+    )
+    booked = {}
+    for hospital_id, r_date, r_time in reservations_result.all():
+        booked.setdefault(hospital_id, {}).setdefault(r_date, []).append(r_time)
+
+    await slot_engine.warm_week_schedules(db, hospital_ids)
+    await holiday_calendar.warm_holiday_calendars(db, hospital_ids)
+    for hospital_id in hospital_ids:
+        week = await slot_engine.get_week_schedule(db, hospital_id)
+        calendar = await holiday_calendar.get_holiday_calendar(db, hospital_id)
+        available_slots, expires_at = slot_engine.compute_availability(
+            week, date_range, calendar, booked.get(hospital_id, {}), now, RESERVATION_LEAD_TIME
+        )
+        availability_cache.set(hospital_id, {"available_slots": available_slots}, expires_at)
+    return len(hospital_ids)
 
-# 30분 간격으로 오전 9시부터 오후 6시 30분까지 예약 가능 시간 기본값
-DEFAULT_TIME_SLOTS = [
-    (datetime.min + timedelta(hours=h, minutes=m)).time().strftime("%H:%M")
-    for h in range(9, 19)
-    for m in (0, 30)
-]
 
 @router.get("/api/reservations/available_slots")
 async def get_available_slots(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
     향후 15일간의 예약 가능한 시간 슬롯을 동적으로 생성하여 반환합니다.
+    - 슬롯은 병원의 스케줄 템플릿(요일별 진료 시간, 슬롯 길이, 정원)으로 결정됩니다.
     - 휴일 및 예약이 꽉 찬 날은 결과에서 완전히 제외됩니다.
-    - 이미 예약된 시간은 제외됩니다.
+    - 정원만큼 예약된 시간은 제외됩니다.
+    - 결과는 병원별로 캐시되며, 예약/휴일 변경 시 또는 시간 경과로 결과가 바뀌는 시각에 다시 계산됩니다.
     """
-    today = date.today()
     now = datetime.now()
-    three_hours_later = now + timedelta(hours=3)
-    date_range = [today + timedelta(days=i) for i in range(15)]
-    
-    # 1. Get holidays for the hospital
-    holidays_query = db.query(THoliday.holiday_date).filter(
-        THoliday.hospital_id == current_user.hospital_id,
-        THoliday.holiday_date.in_(date_range)
-    ).all()
-    holiday_dates = {h[0] for h in holidays_query}
+    today = now.date()
+    cached = availability_cache.get(current_user.hospital_id, now)
+    if cached is not None:
+        return cached
+    # 조회 도중 다른 요청의 커밋으로 무효화되면 이 결과는 캐시하지 않는다.
+    generation = availability_cache.generation(current_user.hospital_id)
+
+    date_range = _availability_dates(today)
+    week = await slot_engine.get_week_schedule(db, current_user.hospital_id)
+
+    # 1. Get the holiday calendar for the hospital (휴일 + 휴일 규칙, 캐시)
+    calendar = await holiday_calendar.get_holiday_calendar(db, current_user.hospital_id)
 
     # 2. Get existing reservations for the hospital
-    reservations_query = db.query(TReservation.reservation_date, TReservation.reservation_time).filter(
+    reservations_result = await db.execute(select(TReservation.reservation_date, TReservation.reservation_time).filter(
         TReservation.hospital_id == current_user.hospital_id,
         TReservation.reservation_date.in_(date_range),
         TReservation.deleted_flag == False
-    ).all()
-    
+    ))
+
     booked_slots = {}
-    for r_date, r_time in reservations_query:
-        if r_date not in booked_slots:
-            booked_slots[r_date] = set()
-        booked_slots[r_date].add(r_time.strftime("%H:%M"))
+    for r_date, r_time in reservations_result.all():
+        booked_slots.setdefault(r_date, []).append(r_time)
 
     # 3. Build the available slots dictionary, excluding holidays and fully booked days
-    available_slots = {}
-    for day in date_range:
-        if day not in holiday_dates:
-            day_str = day.strftime("%Y-%m-%d")
-            all_slots = set(DEFAULT_TIME_SLOTS)
-            day_booked_slots = booked_slots.get(day, set())
-            available_day_slots = sorted(list(all_slots - day_booked_slots))
-            
-            if day == today:
-                available_day_slots = [
-                    slot for slot in available_day_slots
-                    if datetime.strptime(f"{day_str} {slot}", "%Y-%m-%d %H:%M") > three_hours_later
-                ]
-
-            # Only add the day to the output if there is at least one available slot
-            if available_day_slots:
-                available_slots[day_str] = available_day_slots
-            
-    return {"available_slots": available_slots}
+    available_slots, expires_at = slot_engine.compute_availability(
+        week, date_range, calendar, booked_slots, now, RESERVATION_LEAD_TIME
+    )
+
+    response = {"available_slots": available_slots}
+    # 레플리카에서 읽었으면 무효화 직후(복제 지연 동안)의 결과는 변경 이전일 수 있으므로 캐시하지 않는다.
+    availability_cache.set(
+        current_user.hospital_id, response, expires_at, generation,
+        settle_seconds=READ_YOUR_WRITES_SECONDS if is_replica_session(db) else 0.0,
+    )
+    return response
 
 @router.post("/api/reservations", response_model=Reservation, status_code=status.HTTP_201_CREATED)
 async def create_reservation(
     reservation: ReservationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """새로운 예약을 생성합니다."""
     # user_id와 hospital_id는 토큰에서 가져오므로, 요청 본문에서 제거
 
     # Check if the reservation date is a holiday
-    is_holiday = db.query(THoliday).filter(
-        THoliday.hospital_id == current_user.hospital_id,
-        THoliday.holiday_date == reservation.reservation_date
-    ).first()
-
-    if is_holiday:
+    calendar = await holiday_calendar.get_holiday_calendar(db, current_user.hospital_id)
+    if reservation.reservation_date in calendar:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot make a reservation on a holiday.")
 
-    # Check if the requested time slot is already booked by anyone
-    is_slot_booked = db.query(TReservation).filter(
-        TReservation.hospital_id == current_user.hospital_id,
-        TReservation.reservation_date == reservation.reservation_date,
-        TReservation.reservation_time == reservation.reservation_time,
-        TReservation.deleted_flag == False
-    ).first()
+    # Check the slot exists in the hospital's schedule and still has capacity
+    week = await slot_engine.get_week_schedule(db, current_user.hospital_id)
+    capacity = slot_engine.slot_capacity(week, reservation.reservation_date, reservation.reservation_time)
+    if capacity is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Requested time slot is not available.")
 
-    if is_slot_booked:
+    # 정원 확인과 점유를 예약 원장(t_slot_occupancy)에서 원자적으로 처리한다.
+    claimed = await slot_ledger.claim_slot(
+        db, current_user.hospital_id, reservation.reservation_date, reservation.reservation_time,
+        limit=capacity, max_count=capacity + ADMIN_EXTRA_CAPACITY,
+    )
+    if not claimed:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Requested time slot is not available.")
 
     # 새 예약 생성
@@ -112,22 +167,23 @@ async def create_reservation(
         hospital_id=current_user.hospital_id
     )
     db.add(new_reservation)
-    db.flush()
-    db.refresh(new_reservation)
+    await db.flush()
+    await db.refresh(new_reservation)
 
     # Update last_reserve_date for the current user
     combined_datetime = datetime.combine(new_reservation.reservation_date, new_reservation.reservation_time)
     current_user.last_reserve_date = combined_datetime
     db.add(current_user)
-    db.flush()
-    db.refresh(current_user)
+    await db.flush()
+    await db.refresh(current_user)
+    invalidate_on_commit(db, current_user.hospital_id)
 
     return new_reservation
 
 @router.post("/api/reservations/admin", response_model=Reservation, status_code=status.HTTP_201_CREATED)
 async def create_reservation_for_patient_by_admin(
     reservation: ReservationCreateForAdmin,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """병원 관리자가 환자의 medical_record_no를 사용하여 새로운 예약을 생성합니다."""
@@ -136,35 +192,35 @@ async def create_reservation_for_patient_by_admin(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
     # 2. 관리자 병원 내에서 medical_record_no로 환자 찾기
-    patient_to_reserve = db.query(TUser).filter(
+    result = await db.execute(select(TUser).filter(
         TUser.hospital_id == current_user.hospital_id,
         TUser.medical_record_no == reservation.medical_record_no,
         TUser.user_type == UserType.PATIENT,
         TUser.deleted_flag == False
-    ).first()
+    ).limit(1))
+    patient_to_reserve = result.scalars().first()
 
     if not patient_to_reserve:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Patient with medical record number '{reservation.medical_record_no}' not found in this hospital.")
 
     # 3. 휴일 확인 (create_reservation과 동일)
-    is_holiday = db.query(THoliday).filter(
-        THoliday.hospital_id == current_user.hospital_id,
-        THoliday.holiday_date == reservation.reservation_date
-    ).first()
-
-    if is_holiday:
+    calendar = await holiday_calendar.get_holiday_calendar(db, current_user.hospital_id)
+    if reservation.reservation_date in calendar:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot make a reservation on a holiday.")
 
-    # 4. 예약된 시간 슬롯 확인 (관리자 예약은 동일 시간에 2개까지 허용)
-    booked_slots_count = db.query(TReservation).filter(
-        TReservation.hospital_id == current_user.hospital_id,
-        TReservation.reservation_date == reservation.reservation_date,
-        TReservation.reservation_time == reservation.reservation_time,
-        TReservation.deleted_flag == False
-    ).count()
+    # 4. 예약된 시간 슬롯 확인 (관리자 예약은 슬롯 정원 + ADMIN_EXTRA_CAPACITY 까지 허용)
+    week = await slot_engine.get_week_schedule(db, current_user.hospital_id)
+    capacity = slot_engine.slot_capacity(week, reservation.reservation_date, reservation.reservation_time)
+    if capacity is None:
+        capacity = slot_engine.DEFAULT_CAPACITY
 
-    if booked_slots_count >= 2:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Requested time slot is fully booked (2 reservations already exist).")
+    limit = capacity + ADMIN_EXTRA_CAPACITY
+    claimed = await slot_ledger.claim_slot(
+        db, current_user.hospital_id, reservation.reservation_date, reservation.reservation_time,
+        limit=limit, max_count=limit,
+    )
+    if not claimed:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=_fully_booked_detail(limit))
 
     # 5. 새 예약 생성
     new_reservation = TReservation(
@@ -175,47 +231,198 @@ async def create_reservation_for_patient_by_admin(
         treatment=reservation.treatment
     )
     db.add(new_reservation)
-    db.flush()
-    db.refresh(new_reservation)
+    await db.flush()
+    await db.refresh(new_reservation)
 
     # Update last_reserve_date for the patient
     combined_datetime = datetime.combine(new_reservation.reservation_date, new_reservation.reservation_time)
     patient_to_reserve.last_reserve_date = combined_datetime
     db.add(patient_to_reserve)
-    db.flush()
-    db.refresh(patient_to_reserve)
+    await db.flush()
+    await db.refresh(patient_to_reserve)
+    invalidate_on_commit(db, current_user.hospital_id)
 
     return new_reservation
 
+def _batch_error(index: int, detail: str) -> dict:
+    return {"index": index, "status": "error", "detail": translate_detail(detail)}
+
+@router.post("/api/reservations/admin/batch", response_model=ReservationBatchResult)
+async def create_reservations_for_patients_by_admin(
+    reservations: list[ReservationCreateForAdmin],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """병원 관리자가 여러 환자의 예약을 한 번에 생성합니다.
+
+    각 항목은 POST /api/reservations/admin 과 같은 규칙(환자 MRN, 휴일, 슬롯 정원 + ADMIN_EXTRA_CAPACITY)으로
+    검증하되, 환자/휴일/슬롯 점유는 항목 수와 관계없이 각각 한 번에 조회한다. 같은 슬롯의 항목은 요청 순서대로
+    정원을 채운다. 통과한 항목만 한 트랜잭션에서 생성하고, 결과는 항목별(created / error)로 반환한다.
+    """
+    if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    if len(reservations) > MAX_BATCH_RESERVATIONS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Too many reservations in one batch (max {MAX_BATCH_RESERVATIONS}).")
+
+    hospital_id = current_user.hospital_id
+    results: list = [None] * len(reservations)
+
+    # 1. 환자: MRN 목록으로 한 번에 조회 (같은 MRN 이 여러 명이면 ID 가 작은 환자)
+    patients = {}
+    if reservations:
+        result = await db.execute(select(TUser.medical_record_no, TUser.id).filter(
+            TUser.hospital_id == hospital_id,
+            TUser.medical_record_no.in_({item.medical_record_no for item in reservations}),
+            TUser.user_type == UserType.PATIENT,
+            TUser.deleted_flag == False
+        ).order_by(TUser.id))
+        for medical_record_no, patient_id in result.all():
+            patients.setdefault(medical_record_no, patient_id)
+
+    # 2. 휴일: 휴무일 캘린더 (캐시 미적중 시 휴일/휴일 규칙 각 1회)
+    calendar = await holiday_calendar.get_holiday_calendar(db, hospital_id)
+    valid = []
+    for index, item in enumerate(reservations):
+        patient_id = patients.get(item.medical_record_no)
+        if patient_id is None:
+            results[index] = _batch_error(index, f"Patient with medical record number '{item.medical_record_no}' not found in this hospital.")
+        elif item.reservation_date in calendar:
+            results[index] = _batch_error(index, "Cannot make a reservation on a holiday.")
+        else:
+            valid.append((index, item, patient_id))
+
+    # 3. 슬롯: 현재 예약 수를 한 번에 읽고, 요청 순서대로 정원 안에 드는 항목만 남긴다.
+    week = await slot_engine.get_week_schedule(db, hospital_id)
+    booked = await slot_ledger.load_booked_counts(db, hospital_id, {(item.reservation_date, item.reservation_time) for _, item, _ in valid})
+    limits = {}
+    for slot in booked:
+        capacity = slot_engine.slot_capacity(week, *slot)
+        limits[slot] = (slot_engine.DEFAULT_CAPACITY if capacity is None else capacity) + ADMIN_EXTRA_CAPACITY
+    claims = {}
+    fitting = []
+    for index, item, patient_id in valid:
+        slot = (item.reservation_date, item.reservation_time)
+        if booked[slot] + claims.get(slot, 0) >= limits[slot]:
+            results[index] = _batch_error(index, _fully_booked_detail(limits[slot]))
+            continue
+        claims[slot] = claims.get(slot, 0) + 1
+        fitting.append((index, item, patient_id))
+
+    # 조회 이후 다른 요청이 같은 슬롯을 채웠으면 그 슬롯의 항목은 모두 실패로 처리한다.
+    claimed = await slot_ledger.claim_slots(db, hospital_id, claims, limits)
+    created = []
+    for index, item, patient_id in fitting:
+        slot = (item.reservation_date, item.reservation_time)
+        if slot not in claimed:
+            results[index] = _batch_error(index, _fully_booked_detail(limits[slot]))
+            continue
+        created.append((index, TReservation(
+            user_id=patient_id,
+            hospital_id=hospital_id,
+            reservation_date=item.reservation_date,
+            reservation_time=item.reservation_time,
+            treatment=item.treatment
+        )))
+
+    # 4. 생성: 한 번의 flush 로 INSERT 하고, 환자별 last_reserve_date 는 단건 API 를 순서대로 호출한 것과 같게 갱신한다.
+    if created:
+        db.add_all(reservation for _, reservation in created)
+        await db.flush()
+        last_reserve = {}
+        for _, reservation in created:
+            last_reserve[reservation.user_id] = datetime.combine(reservation.reservation_date, reservation.reservation_time)
+        await db.execute(update(TUser), [
+            {"id": patient_id, "last_reserve_date": last_reserve_date}
+            for patient_id, last_reserve_date in last_reserve.items()
+        ])
+        for patient_id in last_reserve:
+            invalidate_user_on_commit(db, patient_id)
+        invalidate_on_commit(db, hospital_id)
+
+    for index, reservation in created:
+        results[index] = {"index": index, "status": "created", "reservation": Reservation.model_validate({
+            "id": reservation.id,
+            "reservation_date": reservation.reservation_date,
+            "reservation_time": reservation.reservation_time,
+            "treatment": reservation.treatment,
+        })}
+    return {"created": len(created), "failed": len(results) - len(created), "results": results}
+
 @router.get("/api/me/reservations", response_model=Optional[Reservation])
 async def get_my_reservations(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """소속된 병원의 예약 중, 현재 로그인한 사용자의 가장 최근에 만든 예약(미래)을 반환합니다."""
     now = datetime.now()
-    reservation = db.query(TReservation).filter(
+    result = await db.execute(select(TReservation).filter(
         TReservation.user_id == current_user.id,
         TReservation.hospital_id == current_user.hospital_id,
         TReservation.deleted_flag == False,
-        func.concat(TReservation.reservation_date, ' ', TReservation.reservation_time) > now.strftime('%Y-%m-%d %H:%M:%S')
+        TReservation.reservation_at > now
     ).order_by(
         TReservation.created_at.desc()
-    ).first()
-    return reservation
+    ).limit(1))
+    return result.scalars().first()
+
+def _apply_reservation_cursor(query, cursor: Optional[str]):
+    """(reservation_date, reservation_time, id) 순 정렬에서 cursor 다음 행부터 조회하도록 조건을 추가합니다."""
+    if not cursor:
+        return query
+    try:
+        cur = cursor_util.decode_cursor(cursor)
+        c_date = date.fromisoformat(cur['date'])
+        c_time = time.fromisoformat(cur['time'])
+        c_id = int(cur['id'])
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="無効なカーソルです。")
+    return query.filter(
+        or_(
+            TReservation.reservation_date > c_date,
+            and_(TReservation.reservation_date == c_date, TReservation.reservation_time > c_time),
+            and_(TReservation.reservation_date == c_date, TReservation.reservation_time == c_time, TReservation.id > c_id)
+        )
+    )
+
 
-@router.get("/api/reservations", response_model=List[ReservationWithPatient])
+async def _reservation_page(db: AsyncSession, query, limit: int, cursor: Optional[str]) -> dict:
+    """limit + 1 건만 읽어 한 페이지와 다음 페이지 cursor 를 만듭니다."""
+    query = _apply_reservation_cursor(query, cursor).order_by(
+        TReservation.reservation_date, TReservation.reservation_time, TReservation.id
+    ).limit(limit + 1)
+    result = await db.execute(query)
+    reservations = result.scalars().all()
+
+    hasnext = len(reservations) > limit
+    next_cursor = None
+    if hasnext:
+        reservations = reservations[:limit]
+        last = reservations[-1]
+        next_cursor = cursor_util.encode_cursor({
+            'date': last.reservation_date.isoformat(),
+            'time': last.reservation_time.isoformat(),
+            'id': last.id,
+        })
+    return {"reservations": reservations, "hasnext": hasnext, "next_cursor": next_cursor}
+
+
+@router.get("/api/reservations", response_model=ReservationListCursorResponse)
 async def get_reservations(
     from_date: date = Query(..., description="조회 시작일 (YYYY-MM-DD)"),
     to_date: date = Query(..., description="조회 종료일 (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    limit: int = Query(1000, ge=1, le=2000),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
-    """모든 예약 정보를 반환합니다. (관리자만 접근 가능) """
+    """
+    모든 예약 정보를 (예약일, 예약 시간, ID) 순으로 limit 건씩 반환합니다. (관리자만 접근 가능)
+    다음 페이지는 응답의 next_cursor 를 cursor 로 넘겨 조회합니다.
+    """
     if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view all reservations")
     
-    query = db.query(TReservation).options(joinedload(TReservation.patient)).filter(TReservation.deleted_flag == False)
+    query = select(TReservation).options(joinedload(TReservation.patient)).filter(TReservation.deleted_flag == False)
     
     if from_date:
         query = query.filter(TReservation.reservation_date >= from_date)
@@ -225,26 +432,28 @@ async def get_reservations(
     if current_user.user_type == UserType.HOSPITAL_ADMIN:
         query = query.filter(TReservation.hospital_id == current_user.hospital_id)
         
-    reservations = query.all()
-    return reservations
+    return await _reservation_page(db, query, limit, cursor)
 
-@router.get("/api/hospital/reservations", response_model=List[ReservationWithPatient])
+@router.get("/api/hospital/reservations", response_model=ReservationListCursorResponse)
 async def get_hospital_reservations(
     from_date: date = Query(..., description="조회 시작일 (YYYY-MM-DD)"),
     to_date: date = Query(..., description="조회 종료일 (YYYY-MM-DD)"),
     include_cancelled: bool = Query(False, description="취소된 예약을 포함할지 여부"),
-    db: Session = Depends(get_db),
+    limit: int = Query(1000, ge=1, le=2000),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """
     병원 측에서 사용하는 API로, 지정된 기간 동안의 예약 내역을 조회합니다.
     병원 관리자 또는 시스템 관리자만 접근 가능합니다.
+    결과는 (예약일, 예약 시간, ID) 순으로 limit 건씩 반환하며, 다음 페이지는 next_cursor 로 조회합니다.
     """
     # 병원 관리자 또는 시스템 관리자만 접근 가능
     if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-    query = db.query(TReservation).options(joinedload(TReservation.patient)).filter(
+    query = select(TReservation).options(joinedload(TReservation.patient)).filter(
         TReservation.hospital_id == current_user.hospital_id,
         TReservation.reservation_date.between(from_date, to_date)
     )
@@ -252,14 +461,48 @@ async def get_hospital_reservations(
     if not include_cancelled:
         query = query.filter(TReservation.deleted_flag == False, TReservation.cancel_date.is_(None))
 
-    reservations = query.order_by(TReservation.reservation_date, TReservation.reservation_time).all()
-    
-    return reservations
+    return await _reservation_page(db, query, limit, cursor)
+
+@router.get("/api/hospital/reservations/export")
+async def export_hospital_reservations(
+    request: Request,
+    from_date: date = Query(..., description="조회 시작일 (YYYY-MM-DD)"),
+    to_date: date = Query(..., description="조회 종료일 (YYYY-MM-DD)"),
+    export_format: reservation_export.ExportFormat = Query("ndjson", alias="format", description="출력 형식 (ndjson 또는 csv)"),
+    include_cancelled: bool = Query(False, description="취소된 예약을 포함할지 여부"),
+    current_user: TUser = Depends(authManager.get_current_active_user)
+):
+    """
+    지정된 기간의 예약 내역을 NDJSON 또는 CSV 로 스트리밍합니다. (회계용 내보내기)
+    병원 관리자 또는 시스템 관리자만 접근 가능하며, 행은 (예약일, 예약 시간, ID) 순입니다.
+    """
+    if current_user.user_type not in [UserType.HOSPITAL_ADMIN, UserType.SYSTEM_ADMIN]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    query = select(
+        TReservation.id, TReservation.reservation_date, TReservation.reservation_time, TReservation.treatment,
+        TReservation.cancel_date, TReservation.deleted_flag,
+        TUser.id, TUser.medical_record_no, TUser.last_name, TUser.first_name, TUser.contact
+    ).outerjoin(TUser, TUser.id == TReservation.user_id).filter(
+        TReservation.hospital_id == current_user.hospital_id,
+        TReservation.reservation_date.between(from_date, to_date)
+    )
+
+    if not include_cancelled:
+        query = query.filter(TReservation.deleted_flag == False, TReservation.cancel_date.is_(None))
+
+    query = query.order_by(TReservation.reservation_date, TReservation.reservation_time, TReservation.id)
+    filename = f"reservations_{from_date.isoformat()}_{to_date.isoformat()}.{export_format}"
+    return StreamingResponse(
+        reservation_export.stream_export(query, export_format, read_session_factory(request)),
+        media_type=reservation_export.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @router.get("/api/reservations/{reservation_hash_id}", response_model=Reservation)
 async def get_reservation_by_id(
     reservation_hash_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """ID로 특정 예약 정보를 조회합니다."""
@@ -267,7 +510,10 @@ async def get_reservation_by_id(
     if reservation_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
 
-    reservation = db.query(TReservation).filter(TReservation.id == reservation_id, TReservation.deleted_flag == False).first()
+    result = await db.execute(
+        select(TReservation).filter(TReservation.id == reservation_id, TReservation.deleted_flag == False).limit(1)
+    )
+    reservation = result.scalars().first()
     if not reservation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
     
@@ -287,7 +533,7 @@ async def get_reservation_by_id(
 @router.delete("/api/reservations/{reservation_hash_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_reservation(
     reservation_hash_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: TUser = Depends(authManager.get_current_active_user)
 ):
     """ID로 예약을 취소합니다."""
@@ -295,7 +541,10 @@ async def cancel_reservation(
     if reservation_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
 
-    reservation = db.query(TReservation).filter(TReservation.id == reservation_id, TReservation.deleted_flag == False).first()
+    result = await db.execute(
+        select(TReservation).filter(TReservation.id == reservation_id, TReservation.deleted_flag == False).limit(1)
+    )
+    reservation = result.scalars().first()
     if not reservation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
 
@@ -310,6 +559,13 @@ async def cancel_reservation(
     if not (is_patient_self or is_system_admin or is_hospital_admin_in_own_hospital):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to cancel this reservation")
 
-    reservation.deleted_flag = True
-    reservation.cancel_date = date.today() # 취소일을 오늘 날짜로 설정
+    # 같은 예약의 취소 요청이 동시에 와도 슬롯 점유는 한 번만 반환되도록 조건부로 갱신한다.
+    cancelled = await db.execute(update(TReservation).where(
+        TReservation.id == reservation.id,
+        TReservation.deleted_flag == False
+    ).values(deleted_flag=True, cancel_date=date.today())) # 취소일을 오늘 날짜로 설정
+    if cancelled.rowcount == 0:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
+    await slot_ledger.release_slot(db, reservation.hospital_id, reservation.reservation_date, reservation.reservation_time)
+    invalidate_on_commit(db, reservation.hospital_id)
     return
@@ -1,7 +1,7 @@
 from .line import LineLoginRequest
-from .reservation import Reservation, ReservationBase, ReservationCreate, ReservationWithPatient, ReservationCreateForAdmin
+from .reservation import Reservation, ReservationBase, ReservationCreate, ReservationWithPatient, ReservationCreateForAdmin, ReservationListCursorResponse, ReservationBatchResult
 from .token import Token, TokenData
-from .user import User, UserBase, UserCreate, UserUpdate, PatientCreate, HospitalAdminCreate, PatientWithReservations, PatientNameId, UserWithLastReserve, PatientListCursorResponse
+from .user import User, UserBase, UserCreate, UserUpdate, PatientCreate, HospitalAdminCreate, PatientWithReservations, PatientNameId, UserWithLastReserve, PatientListCursorResponse, PatientImportResult
 from .hospital import Hospital
 from enums.user_type import UserType
 
@@ -12,6 +12,8 @@ __all__ = [
     "ReservationCreate",
     "ReservationWithPatient",
     "ReservationCreateForAdmin",
+    "ReservationListCursorResponse",
+    "ReservationBatchResult",
     "Token",
     "TokenData",
     "User",
@@ -26,7 +28,9 @@ __all__ = [
     "PatientNameId",
     "UserWithLastReserve",
     "PatientListCursorResponse",
+    "PatientImportResult",
 ]
 
 PatientWithReservations.model_rebuild()
 ReservationWithPatient.model_rebuild()
+ReservationListCursorResponse.model_rebuild()
@@ -1,10 +1,11 @@
 import base64
-from typing import Optional, Any, List
-from datetime import date
+from typing import Optional, Any, List, Literal
+from datetime import date, time, timedelta
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, field_validator, model_validator
 
 from utils import hashid_manager
+from utils.national_holidays import HOLIDAY_SETS
 
 
 class HospitalBase(BaseModel):
@@ -36,6 +37,101 @@ class HolidayCreate(BaseModel):
 class HolidayDelete(BaseModel):
     id: int
 
+
+# 一括登録・削除で一度に指定できる日数 (2年分)
+MAX_BULK_HOLIDAYS = 731
+
+
+class HolidayBulk(BaseModel):
+    """休日の一括登録・削除。holiday_dates (日付の一覧) か start_date〜end_date (両端を含む) のどちらかを指定する。"""
+    holiday_dates: Optional[List[date]] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    @model_validator(mode='after')
+    def check_dates(self) -> 'HolidayBulk':
+        has_range = self.start_date is not None or self.end_date is not None
+        if self.holiday_dates is None:
+            if self.start_date is None or self.end_date is None:
+                raise ValueError('either holiday_dates or both start_date and end_date are required')
+            if self.start_date > self.end_date:
+                raise ValueError('start_date must not be later than end_date')
+        elif has_range:
+            raise ValueError('specify either holiday_dates or start_date/end_date, not both')
+        elif not self.holiday_dates:
+            raise ValueError('holiday_dates must not be empty')
+        if len(self.dates()) > MAX_BULK_HOLIDAYS:
+            raise ValueError(f'at most {MAX_BULK_HOLIDAYS} dates can be specified at once')
+        return self
+
+    def dates(self) -> List[date]:
+        """指定された日付を重複なしの昇順で返します。"""
+        if self.holiday_dates is not None:
+            return sorted(set(self.holiday_dates))
+        days = (self.end_date - self.start_date).days + 1
+        return [self.start_date + timedelta(days=i) for i in range(min(days, MAX_BULK_HOLIDAYS + 1))]
+
+
+class HolidayBulkResult(BaseModel):
+    created: int    # 新しく登録した日数
+    restored: int   # 削除済みの休日を戻した日数
+    existing: int   # すでに登録されていた日数
+
+
+class HolidayBulkDeleteResult(BaseModel):
+    deleted: int
+
+
+class HolidayRuleCreate(BaseModel):
+    rule_type: Literal['weekly', 'national', 'range']
+    weekday: Optional[int] = None  # weekly: 0:月 ... 6:日
+    holiday_set: Optional[str] = None  # national: jp
+    start_date: Optional[date] = None  # range は必須。weekly / national は適用期間
+    end_date: Optional[date] = None
+    name: Optional[str] = None
+
+    @model_validator(mode='after')
+    def check_rule(self) -> 'HolidayRuleCreate':
+        if self.rule_type == 'weekly' and (self.weekday is None or not 0 <= self.weekday <= 6):
+            raise ValueError('weekday must be between 0 (Monday) and 6 (Sunday)')
+        if self.rule_type == 'national' and self.holiday_set not in HOLIDAY_SETS:
+            raise ValueError(f"holiday_set must be one of: {', '.join(HOLIDAY_SETS)}")
+        if self.rule_type == 'range' and (self.start_date is None or self.end_date is None):
+            raise ValueError('start_date and end_date are required for a range rule')
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError('start_date must not be later than end_date')
+        return self
+
+
+class HolidayRule(HolidayRuleCreate):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class ScheduleTemplate(BaseModel):
+    weekday: int  # 0:月 ... 6:日
+    open_time: time
+    close_time: time
+    slot_minutes: int = 30
+    capacity: int = 1
+
+    @model_validator(mode='after')
+    def check_ranges(self) -> 'ScheduleTemplate':
+        if not 0 <= self.weekday <= 6:
+            raise ValueError('weekday must be between 0 (Monday) and 6 (Sunday)')
+        if self.open_time >= self.close_time:
+            raise ValueError('open_time must be earlier than close_time')
+        if not 5 <= self.slot_minutes <= 240:
+            raise ValueError('slot_minutes must be between 5 and 240')
+        if self.capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        return self
+
+    class Config:
+        from_attributes = True
+
+
 class Hospital(HospitalBase):
     id: str
 
@@ -46,6 +142,16 @@ class Hospital(HospitalBase):
             return hashid_manager.encode_id(v)
         return v
 
+    @classmethod
+    def from_entity(cls, hospital: Any, line_qr_code: Optional[str] = None) -> 'Hospital':
+        """
+        THospital 에서 생성합니다. line_qr_code 를 넘기면 BLOB 대신 그 값(QR 이미지 URL 등)을 사용하므로
+        지연(deferred) 컬럼을 로드하지 않습니다.
+        """
+        data = {name: getattr(hospital, name) for name in cls.model_fields if name != 'line_qr_code'}
+        data['line_qr_code'] = hospital.line_qr_code if line_qr_code is None else line_qr_code
+        return cls.model_validate(data)
+
     @field_validator('line_qr_code', mode='before')
     @classmethod
     def convert_bytes_to_base64(cls, v: Any) -> str:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, field_validator
-from typing import Optional, Any
+from typing import List, Literal, Optional, Any
 from datetime import date, time
 from utils import hashid_manager
 
@@ -31,4 +31,23 @@ class Reservation(ReservationBase):
         from_attributes = True
 
 class ReservationWithPatient(Reservation):
-    patient: 'User'
\ No newline at end of file
+    patient: 'User'
+
+
+class ReservationBatchItemResult(BaseModel):
+    index: int                      # 요청 목록에서의 위치 (0부터)
+    status: Literal['created', 'error']
+    reservation: Optional[Reservation] = None
+    detail: Optional[str] = None    # status == 'error' 일 때의 사유 (단건 API 의 오류 메시지와 같다)
+
+
+class ReservationBatchResult(BaseModel):
+    created: int
+    failed: int
+    results: List[ReservationBatchItemResult]
+
+
+class ReservationListCursorResponse(BaseModel):
+    reservations: List[ReservationWithPatient]
+    next_cursor: Optional[str] = None
+    hasnext: bool = False
@@ -105,3 +105,20 @@ class PatientListCursorResponse(BaseModel):
     patients: List[UserWithLastReserve]
     next_cursor: Optional[str] = None
     hasnext: bool = False
+
+
+class PatientImportError(BaseModel):
+    line: int                       # 입력의 줄 번호 (1부터, CSV 헤더 포함)
+    field: Optional[str] = None
+    detail: str
+
+
+class PatientImportResult(BaseModel):
+    received: int                   # 빈 줄과 CSV 헤더를 뺀 행 수 (= created + duplicates + failed)
+    created: int
+    duplicates: int                 # 이미 등록되었거나 파일 안에서 앞서 나온 line_id / medical_record_no
+    failed: int
+    errors: List[PatientImportError]
+    errors_truncated: bool = False  # errors 는 최대 MAX_REPORTED_ERRORS 건
+    elapsed_seconds: float
+    rows_per_second: float
@@ -0,0 +1,106 @@
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# 워커(프로세스) 간에는 무효화가 전파되지 않으므로, 다른 워커의 예약/휴일 변경이
+# 최대 이 시간(초)까지만 늦게 반영되도록 상한을 둔다. 0 이면 캐시를 사용하지 않는다.
+MAX_AGE_SECONDS = float(os.environ.get("AVAILABILITY_CACHE_TTL_SECONDS", "60"))
+
+_PENDING_KEY = "availability_cache_invalidations"
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "stored_at")
+
+    def __init__(self, value: Any, expires_at: datetime, stored_at: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.stored_at = stored_at
+
+
+class AvailabilityCache:
+    """병원별 예약 가능 슬롯 계산 결과 캐시.
+
+    - 예약 생성/취소, 휴일 추가/삭제 시 해당 병원의 항목을 무효화한다.
+    - 항목마다 expires_at(시간 경과로 결과가 달라지는 시각: 당일 슬롯이 "3시간 후" 기준을
+      넘는 시각 또는 날짜 변경)을 두어, 그 시각이 지나면 다시 계산한다.
+    - 무효화마다 병원별 세대(generation)를 올린다. 조회 전에 generation() 으로 읽은 값을 set() 에 넘기면,
+      조회 중에 무효화가 있었을 때 (무효화 이전 데이터로 계산한) 결과를 캐시하지 않는다.
+    """
+
+    def __init__(self, max_age_seconds: float = MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._entries: Dict[int, _Entry] = {}
+        self._generations: Dict[int, int] = {}
+        self._invalidated_at: Dict[int, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, hospital_id: int, now: datetime) -> Optional[Any]:
+        entry = self._entries.get(hospital_id)
+        if entry is None or now >= entry.expires_at or time.monotonic() - entry.stored_at > self.max_age_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.value
+
+    def generation(self, hospital_id: int) -> int:
+        return self._generations.get(hospital_id, 0)
+
+    def set(
+        self,
+        hospital_id: int,
+        value: Any,
+        expires_at: datetime,
+        generation: Optional[int] = None,
+        settle_seconds: float = 0.0,
+    ) -> None:
+        """generation 이 현재 세대와 다르면(조회 중에 무효화됨) 저장하지 않습니다.
+
+        settle_seconds: 마지막 무효화 후 이 시간(초) 안에는 저장하지 않는다. 복제 지연이 있는 레플리카에서
+        읽은 결과가 방금 커밋된 변경 이전의 값으로 캐시를 다시 채우지 않도록 한다.
+        """
+        if self.max_age_seconds <= 0:
+            return
+        if generation is not None and generation != self.generation(hospital_id):
+            return
+        stored_at = time.monotonic()
+        if settle_seconds > 0 and stored_at - self._invalidated_at.get(hospital_id, float("-inf")) < settle_seconds:
+            return
+        self._entries[hospital_id] = _Entry(value, expires_at, stored_at)
+
+    def invalidate(self, hospital_id: int) -> None:
+        self._generations[hospital_id] = self.generation(hospital_id) + 1
+        self._invalidated_at[hospital_id] = time.monotonic()
+        self._entries.pop(hospital_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+availability_cache = AvailabilityCache()
+
+
+def invalidate_on_commit(db: AsyncSession, hospital_id: int) -> None:
+    """트랜잭션이 커밋된 뒤에 해당 병원의 캐시를 무효화하도록 예약합니다.
+
+    커밋 전에 무효화하면, 그 사이에 들어온 조회가 아직 커밋되지 않은(이전) 데이터로
+    다시 캐시를 채울 수 있기 때문에 커밋 이후에 무효화한다.
+    """
+    db.sync_session.info.setdefault(_PENDING_KEY, set()).add(hospital_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for hospital_id in session.info.pop(_PENDING_KEY, ()):
+        availability_cache.invalidate(hospital_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
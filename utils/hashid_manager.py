@@ -1,6 +1,9 @@
+from functools import lru_cache
 from hashids import Hashids
 import os
 
+from utils.id_codec import HashidsCodec
+
 # .env 파일에서 HASHIDS_SALT 환경 변수를 불러옵니다.
 # 이 값이 설정되어 있지 않으면 애플리케이션이 시작되지 않도록 하여, 
 # 안전하지 않은 기본값으로 실행되는 것을 방지합니다.
@@ -10,16 +13,38 @@ if not SALT:
 
 MIN_LENGTH = 8
 
+# 최근에 인코딩/디코딩한 ID 를 이 개수까지 기억한다. 0 이면 캐시하지 않는다.
+CACHE_SIZE = int(os.environ.get("HASHID_CACHE_SIZE", "65536"))
+
+# fast: utils.id_codec 의 호환 코덱 (같은 문자열을 만든다), hashids: 원래 라이브러리
+CODEC = os.environ.get("HASHID_CODEC", "fast")
+
 hashids = Hashids(salt=SALT, min_length=MIN_LENGTH)
+codec = HashidsCodec(salt=SALT, min_length=MIN_LENGTH)
 
-def encode_id(id_integer: int) -> str:
-    """정수 ID를 해시 ID로 인코딩합니다."""
+def _encode_hashids(id_integer: int) -> str:
     return hashids.encode(id_integer)
 
-def decode_id(id_hash: str) -> int | None:
-    """해시 ID를 정수 ID로 디코딩합니다."""
+def _decode_hashids(id_hash: str) -> int | None:
     decoded_tuple = hashids.decode(id_hash)
     # decode()는 튜플을 반환하므로, 첫 번째 요소를 확인하고 반환합니다.
     if decoded_tuple:
         return decoded_tuple[0]
-    return None
\ No newline at end of file
+    return None
+
+if CODEC == "hashids":
+    _encode, _decode = _encode_hashids, _decode_hashids
+else:
+    _encode, _decode = codec.encode, codec.decode
+
+if CACHE_SIZE > 0:
+    _encode = lru_cache(maxsize=CACHE_SIZE)(_encode)
+    _decode = lru_cache(maxsize=CACHE_SIZE)(_decode)
+
+def encode_id(id_integer: int) -> str:
+    """정수 ID를 해시 ID로 인코딩합니다."""
+    return _encode(id_integer)
+
+def decode_id(id_hash: str) -> int | None:
+    """해시 ID를 정수 ID로 디코딩합니다."""
+    return _decode(id_hash)
@@ -0,0 +1,192 @@
+"""병원별 휴무일 캘린더.
+
+단일 휴일(t_holiday)과 반복 휴일 규칙(t_holiday_rule)을 읽어 HolidayCalendar 로 컴파일하고 병원별로 캐시한다.
+예약 생성과 예약 가능 시간 계산은 `day in calendar` 로 휴무 여부를 판단하므로, 캐시 적중 시에는 쿼리가 없다.
+
+규칙 유형:
+- weekly: 매주 weekday 요일 휴무
+- national: holiday_set 의 국가 공휴일 휴무 (utils.national_holidays)
+- range: start_date ~ end_date (양 끝 포함) 휴무
+weekly / national 규칙도 start_date, end_date 가 있으면 그 기간에만 적용된다.
+"""
+import os
+import time as time_module
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from entities.entities import THoliday, THolidayRule
+from utils.national_holidays import is_national_holiday
+
+RULE_WEEKLY = "weekly"
+RULE_NATIONAL = "national"
+RULE_RANGE = "range"
+RULE_TYPES = (RULE_WEEKLY, RULE_NATIONAL, RULE_RANGE)
+
+# 다른 워커에서의 휴일 변경은 최대 이 시간(초)까지 늦게 반영된다. (availability_cache 와 같은 기본값)
+HOLIDAY_CACHE_TTL_SECONDS = float(os.environ.get("HOLIDAY_CACHE_TTL_SECONDS", "60"))
+
+
+class HolidayRule(NamedTuple):
+    rule_type: str
+    weekday: Optional[int]
+    holiday_set: Optional[str]
+    start_date: Optional[date]
+    end_date: Optional[date]
+
+
+class HolidayCalendar(NamedTuple):
+    """컴파일된 휴무일 캘린더. `day in calendar` 가 휴무 여부이다."""
+    dates: frozenset                          # 단일 휴일
+    weekly_mask: int                          # 기간 제한 없는 weekly 규칙의 요일 비트맵 (bit 0 = 월)
+    ranges: Tuple[Tuple[date, date], ...]     # 겹치거나 이어지는 구간을 합친 휴무 기간, 시작일 순
+    range_starts: Tuple[date, ...]            # ranges 의 시작일 (bisect 용)
+    national_sets: Tuple[str, ...]            # 기간 제한 없는 national 규칙의 세트 코드
+    bounded: Tuple[HolidayRule, ...]          # 기간이 정해진 weekly / national 규칙
+
+    def is_closed(self, day: date) -> bool:
+        if day in self.dates or self.weekly_mask >> day.weekday() & 1:
+            return True
+        i = bisect_right(self.range_starts, day) - 1
+        if i >= 0 and day <= self.ranges[i][1]:
+            return True
+        for holiday_set in self.national_sets:
+            if is_national_holiday(holiday_set, day):
+                return True
+        for rule in self.bounded:
+            if _bounded_rule_matches(rule, day):
+                return True
+        return False
+
+    def __contains__(self, day: object) -> bool:
+        return isinstance(day, date) and self.is_closed(day)
+
+
+def _bounded_rule_matches(rule: HolidayRule, day: date) -> bool:
+    if (rule.start_date and day < rule.start_date) or (rule.end_date and day > rule.end_date):
+        return False
+    if rule.rule_type == RULE_WEEKLY:
+        return day.weekday() == rule.weekday
+    return is_national_holiday(rule.holiday_set, day)
+
+
+def _merge_ranges(ranges: Iterable[Tuple[date, date]]) -> Tuple[Tuple[date, date], ...]:
+    merged: List[List[date]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return tuple((start, end) for start, end in merged)
+
+
+def compile_calendar(dates: Iterable[date], rules: Iterable[HolidayRule]) -> HolidayCalendar:
+    weekly_mask = 0
+    ranges: List[Tuple[date, date]] = []
+    national_sets: List[str] = []
+    bounded: List[HolidayRule] = []
+    for rule in rules:
+        if rule.rule_type == RULE_RANGE:
+            if rule.start_date and rule.end_date and rule.start_date <= rule.end_date:
+                ranges.append((rule.start_date, rule.end_date))
+        elif rule.start_date or rule.end_date:
+            bounded.append(rule)
+        elif rule.rule_type == RULE_WEEKLY:
+            weekly_mask |= 1 << rule.weekday
+        elif rule.rule_type == RULE_NATIONAL and rule.holiday_set not in national_sets:
+            national_sets.append(rule.holiday_set)
+    merged = _merge_ranges(ranges)
+    return HolidayCalendar(
+        dates=frozenset(dates),
+        weekly_mask=weekly_mask,
+        ranges=merged,
+        range_starts=tuple(start for start, _ in merged),
+        national_sets=tuple(national_sets),
+        bounded=tuple(bounded),
+    )
+
+
+EMPTY_CALENDAR = compile_calendar((), ())
+
+
+class HolidayCalendarCache:
+    """병원별 컴파일된 휴무일 캘린더 캐시. 휴일/휴일 규칙 변경 시 invalidate 한다."""
+
+    def __init__(self, max_age_seconds: float = HOLIDAY_CACHE_TTL_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._entries: Dict[int, Tuple[float, HolidayCalendar]] = {}
+
+    def get(self, hospital_id: int) -> Optional[HolidayCalendar]:
+        entry = self._entries.get(hospital_id)
+        if entry is None or time_module.monotonic() - entry[0] > self.max_age_seconds:
+            return None
+        return entry[1]
+
+    def set(self, hospital_id: int, calendar: HolidayCalendar) -> None:
+        if self.max_age_seconds <= 0:
+            return
+        self._entries[hospital_id] = (time_module.monotonic(), calendar)
+
+    def invalidate(self, hospital_id: int) -> None:
+        self._entries.pop(hospital_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+holiday_calendar_cache = HolidayCalendarCache()
+
+_RULE_COLUMNS = (
+    THolidayRule.rule_type,
+    THolidayRule.weekday,
+    THolidayRule.holiday_set,
+    THolidayRule.start_date,
+    THolidayRule.end_date,
+)
+
+
+async def _load(db: AsyncSession, hospital_ids: List[int]) -> Dict[int, HolidayCalendar]:
+    dates: Dict[int, List[date]] = {}
+    result = await db.execute(select(THoliday.hospital_id, THoliday.holiday_date).filter(
+        THoliday.hospital_id.in_(hospital_ids),
+        THoliday.deleted_flag == False
+    ))
+    for hospital_id, holiday_date in result.all():
+        dates.setdefault(hospital_id, []).append(holiday_date)
+
+    rules: Dict[int, List[HolidayRule]] = {}
+    result = await db.execute(select(THolidayRule.hospital_id, *_RULE_COLUMNS).filter(
+        THolidayRule.hospital_id.in_(hospital_ids),
+        THolidayRule.deleted_flag == False
+    ))
+    for hospital_id, *rule in result.all():
+        rules.setdefault(hospital_id, []).append(HolidayRule(*rule))
+
+    calendars = {}
+    for hospital_id in hospital_ids:
+        if hospital_id in dates or hospital_id in rules:
+            calendars[hospital_id] = compile_calendar(dates.get(hospital_id, ()), rules.get(hospital_id, ()))
+        else:
+            calendars[hospital_id] = EMPTY_CALENDAR
+        holiday_calendar_cache.set(hospital_id, calendars[hospital_id])
+    return calendars
+
+
+async def get_holiday_calendar(db: AsyncSession, hospital_id: int) -> HolidayCalendar:
+    """병원의 휴무일 캘린더를 반환합니다. 캐시에 없으면 휴일과 휴일 규칙을 읽어 컴파일합니다."""
+    calendar = holiday_calendar_cache.get(hospital_id)
+    if calendar is None:
+        calendar = (await _load(db, [hospital_id]))[hospital_id]
+    return calendar
+
+
+async def warm_holiday_calendars(db: AsyncSession, hospital_ids: Iterable[int]) -> int:
+    """여러 병원의 휴무일 캘린더를 휴일/규칙 각 1회 조회로 읽어 캐시에 넣습니다. (기동 시 워밍업)"""
+    hospital_ids = list(hospital_ids)
+    if not hospital_ids:
+        return 0
+    await _load(db, hospital_ids)
+    return len(hospital_ids)
@@ -0,0 +1,86 @@
+import hashlib
+import os
+import time
+from typing import Dict, Hashable, Optional
+
+from fastapi import Request
+from starlette.responses import Response
+
+# 다른 워커에서의 갱신이 최대 이 시간(초)까지만 늦게 반영되도록 상한을 둔다. 0 이면 캐시하지 않는다.
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+
+def content_hash(body: bytes) -> str:
+    """본문의 SHA-256 (hex)."""
+    return hashlib.sha256(body).hexdigest()
+
+
+def strong_etag(body: bytes) -> str:
+    """본문 내용으로 강한 ETag 를 만듭니다."""
+    return '"' + content_hash(body)[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더가 etag 와 일치하는지 확인합니다. (If-None-Match 는 약한 비교)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "media_type", "stored_at")
+
+    def __init__(self, body: bytes, media_type: str):
+        self.body = body
+        self.etag = strong_etag(body)
+        self.media_type = media_type
+        self.stored_at = time.monotonic()
+
+    def to_response(self, request: Request, cache_control: str = "no-cache") -> Response:
+        """If-None-Match 가 일치하면 304, 아니면 본문을 그대로 반환합니다."""
+        headers = {"ETag": self.etag, "Cache-Control": cache_control}
+        if etag_matches(request, self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type=self.media_type, headers=headers)
+
+
+class ResponseCache:
+    """직렬화가 끝난 응답 본문을 키별로 보관하는 캐시. 원본 데이터가 바뀌면 invalidate 한다."""
+
+    def __init__(self, max_age_seconds: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._entries: Dict[Hashable, CachedResponse] = {}
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.stored_at > self.max_age_seconds:
+            return None
+        return entry
+
+    def set(self, key: Hashable, body: bytes, media_type: str = "application/json") -> CachedResponse:
+        entry = CachedResponse(body, media_type)
+        if self.max_age_seconds > 0:
+            self._entries[key] = entry
+        return entry
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# 공개 병원 정보 (GET /api/hospital/{hospital_code}), 키: (hospital_code, qr_format)
+hospital_response_cache = ResponseCache()
+
+# LINE QR 코드 이미지 (GET /api/hospital/{hospital_code}/line-qr), 키: hospital_code
+hospital_qr_cache = ResponseCache()
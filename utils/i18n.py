@@ -1,3 +1,4 @@
+import re
 from typing import Any
 
 
@@ -16,12 +17,14 @@ _TRANSLATIONS: dict[str, str] = {
     "Not authorized to add holiday": "休日を追加する権限がありません。",
     "Not authorized to delete holiday": "休日を削除する権限がありません。",
     "Holiday not found": "休日情報が見つかりませんでした。",
+    "Holiday rule not found": "休日ルールが見つかりませんでした。",
+    "Not authorized to update schedule": "診療スケジュールを変更する権限がありません。",
 
     # Reservation
     "Cannot make a reservation on a holiday.": "休日には予約できません。別の日付をお選びください。",
     "Requested time slot is not available.": "その時間帯は予約できません。別の時間をお選びください。",
     "Not authorized": "操作の権限がありません。",
-    "Requested time slot is fully booked (2 reservations already exist).": "その時間帯は満席です。別の時間をお選びください。",
+    "Too many reservations in one batch (max 200).": "一度に登録できる予約は 200 件までです。",
     "Not authorized to view all reservations": "予約一覧を閲覧する権限がありません。",
     "Reservation not found": "予約が見つかりませんでした。",
     "Not authorized to view this reservation": "この予約を閲覧する権限がありません。",
@@ -41,6 +44,19 @@ _TRANSLATIONS: dict[str, str] = {
     "Not authorized to view this patient's information": "この患者情報を閲覧する権限がありません。",
     "Only hospital administrators can view their hospital's patient list": "病院管理者のみが患者一覧を閲覧できます。",
     "Only hospital administrators can query this resource": "病院管理者のみが参照できます。",
+
+    # Patient import
+    "Only hospital administrators can import patients": "病院管理者のみが患者を一括登録できます。",
+    "CSV header must include line_id, last_name, first_name and contact.": "CSV の 1 行目に line_id, last_name, first_name, contact の列名が必要です。",
+    "Invalid row format.": "行の形式が正しくありません。",
+    "Value is too long.": "値が長すぎます。",
+    "For patients, line_id is required.": "LINE ID を入力してください。",
+    "For patients, last_name is required.": "姓を入力してください。",
+    "For patients, first_name is required.": "名を入力してください。",
+    "For patients, contact is required.": "連絡先を入力してください。",
+    "LINE ID is already registered.": "この LINE ID は既に登録されています。",
+    "LINE ID appears more than once in the file.": "この LINE ID はファイル内で重複しています。",
+    "Medical record number appears more than once in the file.": "このカルテ番号はファイル内で重複しています。",
 }
 
 
@@ -59,5 +75,14 @@ def translate_detail(detail: Any) -> Any:
     if detail.startswith(prefix) and detail.endswith(suffix):
         return "該当する患者が見つかりませんでした。"
 
+    # 動的メッセージ: 管理者予約の定員超過 (件数は予約枠の定員によって変わる)
+    if re.fullmatch(r"Requested time slot is fully booked \(\d+ reservations already exist\)\.", detail):
+        return "その時間帯は満席です。別の時間をお選びください。"
+
+    # 動的メッセージ: 一括登録ファイルの文字コード不一致 (行番号は残す)
+    match = re.fullmatch(r"Input could not be decoded as (\S+) \(line (\d+)\)\.", detail)
+    if match:
+        return f"{match.group(2)} 行目の文字コードを {match.group(1)} として読み取れませんでした。encoding をご確認ください。"
+
     # Fallback: return original if not matched
     return detail
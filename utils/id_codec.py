@@ -0,0 +1,159 @@
+"""단일 정수 ID 전용 Hashids 호환 코덱.
+
+hashids 라이브러리(1.x)와 같은 알고리즘으로 같은 문자열을 만들고 읽는다. 따라서 이미
+발급된 ID 를 그대로 디코딩할 수 있다. 라이브러리는 encode/decode 할 때마다 알파벳을
+솔트로 다시 섞는데(_reorder), 그 결과는 첫 글자(lottery)로만 정해진다. 그래서 여기서는
+lottery 별로 한 번만 계산해 두고 재사용한다.
+
+여러 값을 한 문자열에 담는 Hashids 형식은 지원하지 않는다. (decode 시 None)
+"""
+from math import ceil
+from typing import Dict, List, Optional
+
+DEFAULT_ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890"
+_SEPARATORS = "cfhistuCFHISTU"
+_RATIO_SEPARATORS = 3.5
+_RATIO_GUARDS = 12
+
+
+def _reorder(string: str, salt: str) -> str:
+    """hashids._reorder 와 같은 결정적 셔플."""
+    if not salt:
+        return string
+    chars = list(string)
+    len_salt = len(salt)
+    index = integer_sum = 0
+    for i in range(len(chars) - 1, 0, -1):
+        integer = ord(salt[index])
+        integer_sum += integer
+        j = (integer + index + integer_sum) % i
+        chars[i], chars[j] = chars[j], chars[i]
+        index = (index + 1) % len_salt
+    return "".join(chars)
+
+
+class _LotteryTable:
+    """lottery 글자 하나에 대해 미리 계산한 알파벳과 그 역색인."""
+    __slots__ = ("alphabet", "positions", "padding")
+
+    def __init__(self, alphabet: str):
+        self.alphabet = alphabet
+        self.positions = {c: i for i, c in enumerate(alphabet)}
+        # min_length 를 채울 때 쓰는 alphabet = _reorder(alphabet, alphabet) 의 연속 결과 (필요할 때 늘린다)
+        self.padding: List[str] = []
+
+
+class HashidsCodec:
+    """hashids.Hashids(salt, min_length, alphabet) 의 encode(n) / decode(s)[0] 와 같은 결과를 내는 코덱."""
+
+    def __init__(self, salt: str = "", min_length: int = 0, alphabet: str = DEFAULT_ALPHABET):
+        self.salt = salt
+        self.min_length = max(int(min_length), 0)
+
+        separators = "".join(x for x in _SEPARATORS if x in alphabet)
+        alphabet = "".join(x for i, x in enumerate(alphabet) if alphabet.index(x) == i and x not in separators)
+        if len(alphabet) + len(separators) < 16:
+            raise ValueError("Alphabet must contain at least 16 unique characters.")
+
+        separators = _reorder(separators, salt)
+        missing = int(ceil(len(alphabet) / _RATIO_SEPARATORS)) - len(separators)
+        if missing > 0:
+            separators += alphabet[:missing]
+            alphabet = alphabet[missing:]
+
+        alphabet = _reorder(alphabet, salt)
+        num_guards = int(ceil(len(alphabet) / _RATIO_GUARDS))
+        if len(alphabet) < 3:
+            guards = separators[:num_guards]
+            separators = separators[num_guards:]
+        else:
+            guards = alphabet[:num_guards]
+            alphabet = alphabet[num_guards:]
+
+        self._alphabet = alphabet
+        self._guards = guards
+        self._guard_set = frozenset(guards)
+        self._tables: Dict[str, _LotteryTable] = {}
+
+    def _table(self, lottery: str) -> _LotteryTable:
+        table = self._tables.get(lottery)
+        if table is None:
+            alphabet = self._alphabet
+            table = _LotteryTable(_reorder(alphabet, (lottery + self.salt + alphabet)[:len(alphabet)]))
+            self._tables[lottery] = table
+        return table
+
+    def encode(self, value: int) -> str:
+        """음이 아닌 정수를 문자열로 만듭니다. 그 외의 값은 빈 문자열 (hashids 와 동일)."""
+        if not isinstance(value, int) or value < 0:
+            return ""
+        values_hash = value % 100
+        lottery = self._alphabet[values_hash % len(self._alphabet)]
+        table = self._table(lottery)
+
+        alphabet = table.alphabet
+        base = len(alphabet)
+        digits = []
+        number = value
+        while True:
+            digits.append(alphabet[number % base])
+            number //= base
+            if not number:
+                break
+        encoded = lottery + "".join(reversed(digits))
+
+        min_length = self.min_length
+        if len(encoded) >= min_length:
+            return encoded
+
+        guards = self._guards
+        encoded = guards[(values_hash + ord(encoded[0])) % len(guards)] + encoded
+        if len(encoded) < min_length:
+            encoded += guards[(values_hash + ord(encoded[2])) % len(guards)]
+
+        split_at = base // 2
+        round_ = 0
+        while len(encoded) < min_length:
+            if round_ == len(table.padding):
+                previous = table.padding[-1] if table.padding else alphabet
+                table.padding.append(_reorder(previous, previous))
+            padding = table.padding[round_]
+            round_ += 1
+            encoded = padding[split_at:] + encoded + padding[:split_at]
+            excess = len(encoded) - min_length
+            if excess > 0:
+                start = excess // 2
+                encoded = encoded[start:start + min_length]
+        return encoded
+
+    def decode(self, hashid: str) -> Optional[int]:
+        """encode 가 만든 문자열이면 원래 정수를, 아니면 None 을 반환합니다."""
+        if not hashid or not isinstance(hashid, str):
+            return None
+
+        # 가드 문자로 나눈 뒤 가운데(또는 유일한) 부분이 본문
+        body = hashid
+        guard_positions = [i for i, c in enumerate(hashid) if c in self._guard_set]
+        if guard_positions:
+            if len(guard_positions) > 2:
+                body = hashid[:guard_positions[0]]
+            else:
+                end = guard_positions[1] if len(guard_positions) == 2 else len(hashid)
+                body = hashid[guard_positions[0] + 1:end]
+        if len(body) < 2:
+            return None
+
+        lottery = body[0]
+        if lottery not in self._alphabet:
+            return None
+        positions = self._table(lottery).positions
+        base = len(positions)
+        number = 0
+        for c in body[1:]:
+            position = positions.get(c)
+            if position is None:
+                # 구분자가 있으면 여러 값을 담은 Hashids 이다. (미지원)
+                return None
+            number = number * base + position
+
+        return number if self.encode(number) == hashid else None
@@ -0,0 +1,40 @@
+from typing import Any
+
+import orjson
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.routing import APIRoute
+from starlette.responses import JSONResponse
+
+# JSONResponse(json.dumps(..., ensure_ascii=False, separators=(",", ":"))) 와 같은 형태의 바이트를 만든다.
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    """JSON 으로 직렬화합니다. (UTF-8, 공백 없음, date/datetime 은 ISO 8601)"""
+    return orjson.dumps(content, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 으로 직렬화하는 JSONResponse.
+
+    dict 를 반환하는 엔드포인트, 예외 응답, 그리고 라우터에서 직접 조립한 신뢰할 수 있는
+    결과를 응답 모델 재검증 없이 보낼 때(예: 환자 목록) 쓰인다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """response_class 를 지정하지 않은 라우트의 기본 응답 클래스를 FastJSONResponse 로 한다.
+
+    FastAPI(default_response_class=...) 로 지정하면 모든 라우트의 응답 클래스가 "명시"된 것으로
+    취급되어, response_model 이 있는 라우트도 dict 변환 → render 를 거치게 된다. 여기서는
+    기본값(Default) 으로 감싸 두므로 response_model 라우트는 FastAPI 가 Pydantic 으로 바로 JSON
+    바이트를 만드는 경로를 그대로 쓰고, 나머지 라우트만 FastJSONResponse 로 직렬화된다.
+    """
+
+    def __init__(self, path: str, endpoint: Any, *, response_class: Any = Default(JSONResponse), **kwargs: Any):
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = Default(FastJSONResponse)
+        super().__init__(path, endpoint, response_class=response_class, **kwargs)
@@ -0,0 +1,76 @@
+"""휴일 규칙(t_holiday_rule)의 national 유형이 참조하는 국가 공휴일 세트.
+
+외부 패키지 없이 법령의 규칙으로 계산한다. 세트 코드별 함수는 연도를 받아 {날짜: 이름} 을 반환한다.
+
+- jp: 「国民の祝日に関する法律」(2020 년 이후 기준). 춘분/추분은 1980~2099 년에 유효한 근사식으로 구하며,
+  2020/2021 년 올림픽 특례(海の日/スポーツの日/山の日 이동)를 반영한다. 振替休日, 国民の休日 포함.
+"""
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Callable, Dict
+
+
+def _nth_monday(year: int, month: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(7 - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _equinox_day(year: int, base: float) -> int:
+    return int(base + 0.242194 * (year - 1980) - (year - 1980) // 4)
+
+
+# 2020/2021 년 올림픽 특례로 옮겨진 祝日
+_JP_SPECIAL = {
+    2020: {"海の日": date(2020, 7, 23), "スポーツの日": date(2020, 7, 24), "山の日": date(2020, 8, 10)},
+    2021: {"海の日": date(2021, 7, 22), "スポーツの日": date(2021, 7, 23), "山の日": date(2021, 8, 8)},
+}
+
+
+def _japan(year: int) -> Dict[date, str]:
+    special = _JP_SPECIAL.get(year, {})
+    holidays = {
+        date(year, 1, 1): "元日",
+        _nth_monday(year, 1, 2): "成人の日",
+        date(year, 2, 11): "建国記念の日",
+        date(year, 2, 23): "天皇誕生日",
+        date(year, 3, _equinox_day(year, 20.8431)): "春分の日",
+        date(year, 4, 29): "昭和の日",
+        date(year, 5, 3): "憲法記念日",
+        date(year, 5, 4): "みどりの日",
+        date(year, 5, 5): "こどもの日",
+        special.get("海の日", _nth_monday(year, 7, 3)): "海の日",
+        special.get("山の日", date(year, 8, 11)): "山の日",
+        _nth_monday(year, 9, 3): "敬老の日",
+        date(year, 9, _equinox_day(year, 23.2488)): "秋分の日",
+        special.get("スポーツの日", _nth_monday(year, 10, 2)): "スポーツの日",
+        date(year, 11, 3): "文化の日",
+        date(year, 11, 23): "勤労感謝の日",
+    }
+    # 国民の休日: 祝日に挟まれた平日 (9月の敬老の日と秋分の日の間など)
+    for day in sorted(holidays):
+        between = day + timedelta(days=1)
+        if between not in holidays and day + timedelta(days=2) in holidays and between.weekday() != 6:
+            holidays[between] = "国民の休日"
+    # 振替休日: 日曜日の祝日の後の最初の平日
+    for day in sorted(holidays):
+        if day.weekday() == 6:
+            substitute = day + timedelta(days=1)
+            while substitute in holidays:
+                substitute += timedelta(days=1)
+            holidays[substitute] = "振替休日"
+    return holidays
+
+
+HOLIDAY_SETS: Dict[str, Callable[[int], Dict[date, str]]] = {
+    "jp": _japan,
+}
+
+
+@lru_cache(maxsize=256)
+def holidays_for_year(holiday_set: str, year: int) -> Dict[date, str]:
+    """세트의 해당 연도 공휴일 {날짜: 이름}. 알 수 없는 세트 코드는 KeyError."""
+    return HOLIDAY_SETS[holiday_set](year)
+
+
+def is_national_holiday(holiday_set: str, day: date) -> bool:
+    return day in holidays_for_year(holiday_set, day.year)
@@ -0,0 +1,272 @@
+"""환자 일괄 등록 (CSV / NDJSON).
+
+입력을 청크 단위로 읽어 한 줄씩 검증하고, batch_size 행마다 중복 확인 후 한 번의 일괄 INSERT 로 저장한다.
+메모리 사용량은 batch_size 와 파일 안 중복 확인용 집합(line_id, medical_record_no)에 비례하므로 10만 건도 한 번에 처리할 수 있다.
+
+- 검증: PatientCreate 와 같은 규칙 (line_id, last_name, first_name, contact 필수) + t_user 컬럼 길이
+- 중복: line_id 는 전체 사용자(LINE 로그인이 line_id 로 사용자를 찾는다), medical_record_no 는 같은 병원 안에서
+  이미 등록된 값과 파일 안에서 앞서 나온 값을 건너뛴다. 조회는 배치마다 IN 한 번씩이다.
+- 배치마다 커밋한다. 도중에 실패해도 다시 실행하면 이미 등록된 행은 중복으로 건너뛴다.
+
+CSV 는 첫 줄이 헤더이며, 한 행은 한 줄이어야 한다. (따옴표 안의 줄바꿈은 지원하지 않는다)
+"""
+import codecs
+import csv
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Literal, NamedTuple, Optional, Set, Tuple
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from entities.entities import TUser
+from schemas import PatientCreate, UserType
+
+ImportFormat = Literal["csv", "ndjson"]
+
+# utf-8 (BOM 허용) 또는 Excel(일본어)에서 저장한 CSV 의 기본 문자 코드인 cp932 (Shift_JIS)
+ImportEncoding = Literal["utf-8", "cp932"]
+
+_CODECS = {"utf-8": "utf-8-sig", "cp932": "cp932"}
+
+# 한 번의 중복 조회(IN)와 INSERT 로 처리하는 행 수. IN 목록이 SQLite 의 바인드 변수 상한(32766)을 넘지 않아야 한다.
+BATCH_SIZE = 1000
+
+# 응답에 담는 행별 오류의 최대 개수. 건수(failed, duplicates)는 항상 전체를 센다.
+MAX_REPORTED_ERRORS = 1000
+
+COLUMNS = ("line_id", "last_name", "first_name", "contact", "medical_record_no", "email")
+REQUIRED_COLUMNS = ("line_id", "last_name", "first_name", "contact")
+
+_MAX_LENGTHS = {name: TUser.__table__.c[name].type.length for name in COLUMNS}
+
+
+class ImportFormatError(ValueError):
+    """입력 전체를 처리할 수 없는 형식 오류. (CSV 헤더 누락, 문자 코드 불일치 등)
+
+    디코딩 실패 시 그 줄 이전의 배치는 이미 커밋되어 있다. 올바른 encoding 으로 다시 실행하면 중복으로 건너뛴다.
+    """
+
+
+class RowError(NamedTuple):
+    line: int                 # 입력의 줄 번호 (1부터, CSV 헤더 포함)
+    field: Optional[str]
+    detail: str
+
+
+class ImportReport:
+    """일괄 등록 결과. received = created + duplicates + failed."""
+
+    __slots__ = ("received", "created", "duplicates", "failed", "errors", "errors_truncated", "max_errors", "started", "elapsed_seconds")
+
+    def __init__(self, max_errors: Optional[int] = MAX_REPORTED_ERRORS) -> None:
+        self.received = 0
+        self.created = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.errors: List[RowError] = []
+        self.errors_truncated = False
+        self.max_errors = max_errors
+        self.started = time.perf_counter()
+        self.elapsed_seconds = 0.0
+
+    def add_error(self, error: RowError, duplicate: bool = False) -> None:
+        if duplicate:
+            self.duplicates += 1
+        else:
+            self.failed += 1
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append(error)
+        else:
+            self.errors_truncated = True
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.received / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def _decode(decoder: codecs.IncrementalDecoder, chunk: bytes, encoding: ImportEncoding, line_no: int, final: bool = False) -> str:
+    try:
+        return decoder.decode(chunk, final=final)
+    except UnicodeDecodeError as e:
+        # e.object 는 디코더에 남아 있던 바이트 + chunk 이다. 그 앞부분의 줄바꿈 수로 오류 위치의 줄 번호를 구한다.
+        line = line_no + e.object[:e.start].count(b"\n") + 1
+        raise ImportFormatError(f"Input could not be decoded as {encoding} (line {line}).") from e
+
+
+async def iter_lines(chunks: AsyncIterable[bytes], encoding: ImportEncoding = "utf-8") -> AsyncIterator[Tuple[int, str]]:
+    """바이트 청크를 encoding 으로 디코딩해 (줄 번호, 줄) 을 내보냅니다. 빈 줄은 건너뜁니다.
+
+    디코딩할 수 없는 바이트가 있으면 그 줄 번호와 함께 ImportFormatError.
+    """
+    decoder = codecs.getincrementaldecoder(_CODECS[encoding])()
+    pending = ""
+    line_no = 0
+    async for chunk in chunks:
+        pending += _decode(decoder, chunk, encoding, line_no)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_no += 1
+            line = line.rstrip("\r")
+            if line.strip():
+                yield line_no, line
+    pending += _decode(decoder, b"", encoding, line_no, final=True)
+    if pending.strip():
+        yield line_no + 1, pending.rstrip("\r")
+
+
+async def iter_records(
+    chunks: AsyncIterable[bytes], import_format: ImportFormat, encoding: ImportEncoding = "utf-8"
+) -> AsyncIterator[Tuple[int, Any]]:
+    """(줄 번호, 레코드) 를 내보냅니다. 해석할 수 없는 줄의 레코드는 None 입니다."""
+    lines = iter_lines(chunks, encoding)
+    if import_format == "ndjson":
+        async for line_no, line in lines:
+            try:
+                yield line_no, orjson.loads(line)
+            except orjson.JSONDecodeError:
+                yield line_no, None
+        return
+
+    header: Optional[List[str]] = None
+    async for line_no, line in lines:
+        try:
+            row = next(csv.reader([line]))
+        except csv.Error:
+            row = None
+        if header is None:
+            header = [name.strip() for name in row or ()]
+            missing = [name for name in REQUIRED_COLUMNS if name not in header]
+            if missing:
+                raise ImportFormatError("CSV header must include line_id, last_name, first_name and contact.")
+            continue
+        yield line_no, dict(zip(header, row)) if row is not None else None
+
+
+def _clean(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def validate_record(line_no: int, record: Any) -> Tuple[Optional[Dict[str, Any]], Optional[RowError]]:
+    """레코드를 PatientCreate 규칙으로 검증해 t_user 에 넣을 값을 반환합니다."""
+    if not isinstance(record, dict):
+        return None, RowError(line_no, None, "Invalid row format.")
+    values = {name: _clean(record.get(name)) for name in COLUMNS}
+    medical_record_no = values.pop("medical_record_no")
+    if isinstance(medical_record_no, int) and not isinstance(medical_record_no, bool):
+        medical_record_no = str(medical_record_no)
+    try:
+        patient = PatientCreate.model_validate({**values, "user_type": UserType.PATIENT, "hospital_code": None})
+    except ValidationError as e:
+        error = e.errors()[0]
+        field = str(error["loc"][0]) if error["loc"] else None
+        cause = error.get("ctx", {}).get("error")
+        return None, RowError(line_no, field, str(cause) if cause is not None else error["msg"])
+    if medical_record_no is not None and not isinstance(medical_record_no, str):
+        return None, RowError(line_no, "medical_record_no", "Input should be a valid string")
+
+    values = patient.model_dump(include=set(COLUMNS))
+    values["medical_record_no"] = medical_record_no
+    for name, value in values.items():
+        if value is not None and len(value) > _MAX_LENGTHS[name]:
+            return None, RowError(line_no, name, "Value is too long.")
+    return values, None
+
+
+async def _write_batch(
+    db: AsyncSession,
+    hospital_id: int,
+    batch: List[Tuple[int, Dict[str, Any]]],
+    report: ImportReport,
+    created_by: Optional[str],
+) -> None:
+    """이미 등록된 line_id / medical_record_no 를 집합으로 한 번에 조회해 걸러 내고 나머지를 일괄 INSERT 합니다."""
+    line_ids = {values["line_id"] for _, values in batch}
+    result = await db.execute(select(TUser.line_id).filter(TUser.line_id.in_(line_ids)))
+    existing_line_ids = set(result.scalars().all())
+
+    medical_record_nos = {values["medical_record_no"] for _, values in batch if values["medical_record_no"] is not None}
+    existing_mrns: Set[str] = set()
+    if medical_record_nos:
+        result = await db.execute(select(TUser.medical_record_no).filter(
+            TUser.hospital_id == hospital_id,
+            TUser.medical_record_no.in_(medical_record_nos)
+        ))
+        existing_mrns = set(result.scalars().all())
+
+    rows = []
+    for line_no, values in batch:
+        if values["line_id"] in existing_line_ids:
+            report.add_error(RowError(line_no, "line_id", "LINE ID is already registered."), duplicate=True)
+        elif values["medical_record_no"] in existing_mrns:
+            report.add_error(RowError(line_no, "medical_record_no", "Medical record number already exists for another patient in this hospital."), duplicate=True)
+        else:
+            rows.append({
+                **values,
+                "hospital_id": hospital_id,
+                "user_type": UserType.PATIENT,
+                "deleted_flag": False,
+                "created_by": created_by,
+                "updated_by": created_by,
+            })
+    if rows:
+        # 행 목록을 파라미터로 넘기면 컴파일된 INSERT 한 문장을 executemany 로 실행한다. MySQL 드라이버는 이를
+        # 다중 행 INSERT ... VALUES 로 묶어 보낸다. (1000 행짜리 .values(rows) 는 문장 컴파일에만 수백 ms 가 걸린다)
+        # ORM 엔티티가 아닌 테이블에 INSERT 한다. ORM 일괄 INSERT 는 None 인 키를 빼고 키 구성별로 문장을 나눈다.
+        await db.execute(insert(TUser.__table__), rows)
+        await db.commit()
+        report.created += len(rows)
+
+
+async def import_patients(
+    db: AsyncSession,
+    hospital_id: int,
+    chunks: AsyncIterable[bytes],
+    import_format: ImportFormat,
+    encoding: ImportEncoding = "utf-8",
+    created_by: Optional[str] = None,
+    batch_size: int = BATCH_SIZE,
+    report: Optional[ImportReport] = None,
+) -> ImportReport:
+    """CSV / NDJSON 바이트 스트림의 환자를 hospital_id 병원에 등록합니다.
+
+    형식 오류(CSV 헤더 누락, 디코딩 실패)는 ImportFormatError, 행 단위 오류와 중복은 report.errors 에 남긴다.
+    """
+    report = report or ImportReport()
+    seen_line_ids: Set[str] = set()
+    seen_mrns: Set[str] = set()
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    async for line_no, record in iter_records(chunks, import_format, encoding):
+        report.received += 1
+        values, error = validate_record(line_no, record)
+        if error is not None:
+            report.add_error(error)
+            continue
+        # 파일 안의 중복: 먼저 나온 행을 남긴다.
+        if values["line_id"] in seen_line_ids:
+            report.add_error(RowError(line_no, "line_id", "LINE ID appears more than once in the file."), duplicate=True)
+            continue
+        medical_record_no = values["medical_record_no"]
+        if medical_record_no is not None:
+            if medical_record_no in seen_mrns:
+                report.add_error(RowError(line_no, "medical_record_no", "Medical record number appears more than once in the file."), duplicate=True)
+                continue
+            seen_mrns.add(medical_record_no)
+        seen_line_ids.add(values["line_id"])
+
+        batch.append((line_no, values))
+        if len(batch) >= batch_size:
+            await _write_batch(db, hospital_id, batch, report, created_by)
+            batch = []
+
+    if batch:
+        await _write_batch(db, hospital_id, batch, report, created_by)
+    # 이미 등록된 값과의 중복은 배치를 쓸 때 기록되므로 줄 번호 순으로 정리한다.
+    report.errors.sort()
+    report.elapsed_seconds = time.perf_counter() - report.started
+    return report
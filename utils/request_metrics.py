@@ -0,0 +1,211 @@
+"""라우트별 응답 시간 히스토그램과 요청당 SQL 실행 횟수/시간을 수집합니다.
+
+- RequestMetricsMiddleware: 순수 ASGI 미들웨어. 라우트 템플릿(/api/reservations/{reservation_hash_id} 등) 단위로 집계하고,
+  응답 헤더에 Server-Timing (db, app) 을 붙인다.
+- SQL 실행 횟수와 시간은 SQLAlchemy 엔진 이벤트로 요청별 컨텍스트(contextvars)에 누적한다.
+  SLOW_QUERY_MS 이상 걸린 SQL 은 경고 로그로 남긴다.
+- render_prometheus(): Prometheus 텍스트 형식(0.0.4)으로 내보낸다. (main.py 의 GET /metrics)
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "true").strip().lower() in ("1", "true", "yes", "on")
+
+# 초 단위 히스토그램 버킷 (+Inf 는 출력 시 추가)
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 라우트에 매칭되지 않은 요청(404 등)은 경로 대신 이 라벨로 모은다. (라벨 수 폭증 방지)
+UNMATCHED_ROUTE = "<unmatched>"
+
+_QUERY_START_KEY = "request_metrics_query_start"
+
+
+class RequestStats:
+    """한 요청 동안의 SQL 실행 횟수와 누적 시간."""
+
+    __slots__ = ("route", "queries", "db_seconds")
+
+    def __init__(self) -> None:
+        self.route: Optional[str] = None
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_metrics_current", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """현재 요청의 집계 객체. 요청 밖(마이그레이션, 벤치마크 등)에서는 None."""
+    return _current.get()
+
+
+class _RouteSeries:
+    __slots__ = ("bucket_counts", "count", "sum_seconds", "queries", "db_seconds")
+
+    def __init__(self) -> None:
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum_seconds = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+class MetricsRegistry:
+    """(method, route, status) 별 응답 시간 히스토그램과 DB 비용 누계."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str, str], _RouteSeries] = {}
+        self.slow_queries = 0
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        key = (method, route, str(status))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _RouteSeries()
+            index = bisect.bisect_left(BUCKETS, seconds)
+            if index < len(BUCKETS):
+                series.bucket_counts[index] += 1
+            series.count += 1
+            series.sum_seconds += seconds
+            series.queries += stats.queries
+            series.db_seconds += stats.db_seconds
+
+    def record_slow_query(self) -> None:
+        with self._lock:
+            self.slow_queries += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self.slow_queries = 0
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            items = sorted(self._series.items())
+            slow_queries = self.slow_queries
+        lines: List[str] = [
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), series in items:
+            labels = f'method="{method}",route="{_escape(route)}",status="{status}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, series.bucket_counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {series.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {series.sum_seconds:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {series.count}")
+        lines += [
+            "# HELP http_request_db_queries_total SQL statements executed while handling requests.",
+            "# TYPE http_request_db_queries_total counter",
+        ]
+        for (method, route, status), series in items:
+            lines.append(f'http_request_db_queries_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {series.queries}')
+        lines += [
+            "# HELP http_request_db_seconds_total Time spent executing SQL while handling requests.",
+            "# TYPE http_request_db_seconds_total counter",
+        ]
+        for (method, route, status), series in items:
+            lines.append(f'http_request_db_seconds_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {series.db_seconds:.6f}')
+        lines += [
+            f"# HELP db_slow_queries_total SQL statements slower than SLOW_QUERY_MS ({SLOW_QUERY_MS:g} ms).",
+            "# TYPE db_slow_queries_total counter",
+            f"db_slow_queries_total {slow_queries}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_QUERY_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        registry.record_slow_query()
+        route = stats.route if stats is not None else None
+        logger.warning("slow query %.1f ms (route=%s): %s", elapsed * 1000, route, " ".join(statement.split())[:1000])
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_query_timer(exception_context) -> None:
+    # 실패한 SQL 은 after_cursor_execute 가 호출되지 않으므로 시작 시각을 버린다.
+    conn = exception_context.connection
+    if conn is not None:
+        starts = conn.info.get(_QUERY_START_KEY)
+        if starts:
+            starts.pop()
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """요청마다 응답 시간과 DB 비용을 집계하고 Server-Timing 헤더를 붙이는 ASGI 미들웨어."""
+
+    def __init__(self, app, server_timing: bool = SERVER_TIMING) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                stats.route = _route_template(scope)
+                if self.server_timing:
+                    # 스트리밍 응답은 헤더 전송 시점까지의 값이다.
+                    app_ms = (time.perf_counter() - started) * 1000
+                    value = f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", app;dur={app_ms:.1f}'
+                    message["headers"] = list(message.get("headers", ())) + [(b"server-timing", value.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            registry.observe(
+                scope["method"], stats.route or _route_template(scope), status_code,
+                time.perf_counter() - started, stats,
+            )
@@ -0,0 +1,86 @@
+"""예약 내역 내보내기 (GET /api/hospital/reservations/export).
+
+서버 측 커서로 BATCH_SIZE 행씩 읽어 NDJSON 또는 CSV 바이트로 스트리밍한다. 메모리 사용량은 기간과 관계없이 BATCH_SIZE 에 비례한다.
+CSV 는 Excel 에서 열리는 것을 전제로 UTF-8 BOM 을 붙이고, 수식으로 해석될 수 있는 셀(=, +, -, @, 탭, CR 로 시작)은
+앞에 ' 를 붙여 문자열로 만든다. 이름·연락처·진료 내용은 환자가 직접 입력한 값이기 때문이다. (CSV injection)
+"""
+import csv
+import io
+from typing import Any, AsyncIterator, Literal, Sequence
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from utils import hashid_manager, json_response
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# 한 번에 서버 측 커서에서 가져와 직렬화하는 행 수. 메모리 사용량은 이 값에 비례한다.
+BATCH_SIZE = 1000
+
+# export 쿼리의 select 컬럼 순서와 같아야 한다.
+COLUMNS = (
+    "id", "reservation_date", "reservation_time", "treatment", "cancel_date", "deleted_flag",
+    "patient_id", "medical_record_no", "last_name", "first_name", "contact",
+)
+
+
+def _to_record(row: Sequence) -> dict:
+    record = dict(zip(COLUMNS, row))
+    record["id"] = hashid_manager.encode_id(record["id"])
+    if record["patient_id"] is not None:
+        record["patient_id"] = hashid_manager.encode_id(record["patient_id"])
+    for key in ("reservation_date", "reservation_time", "cancel_date"):
+        if record[key] is not None:
+            record[key] = record[key].isoformat()
+    record["deleted_flag"] = bool(record["deleted_flag"])
+    return record
+
+
+# Excel 등이 셀 값을 수식으로 해석하는 첫 글자
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value: Any) -> Any:
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _ndjson_chunk(rows: Sequence[Sequence]) -> bytes:
+    return b"".join(json_response.dumps(_to_record(row)) + b"\n" for row in rows)
+
+
+def _csv_chunk(rows: Sequence[Sequence], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\r\n")
+    if header:
+        writer.writerow(COLUMNS)
+    writer.writerows([_csv_cell(value) for value in _to_record(row).values()] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_export(
+    stmt: Select, export_format: ExportFormat, session_factory: async_sessionmaker, batch_size: int = BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """stmt 결과를 batch_size 행씩 서버 측 커서로 읽어 NDJSON/CSV 바이트로 내보냅니다.
+
+    응답 전송이 끝날 때까지 커서를 유지해야 하므로 요청 세션이 아닌 별도 세션을 연다. session_factory 는
+    database.read_session_factory(request) 로 get_async_read_db 와 같은 레플리카/프라이머리 판단을 거친 것을 넘긴다.
+    """
+    if export_format == "csv":
+        # Excel 에서 UTF-8 로 열리도록 BOM 과 헤더를 먼저 보낸다.
+        yield "\ufeff".encode("utf-8") + _csv_chunk((), header=True)
+
+    async with session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            if export_format == "csv":
+                yield _csv_chunk(rows)
+            else:
+                yield _ndjson_chunk(rows)
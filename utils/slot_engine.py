@@ -0,0 +1,243 @@
+"""병원별 진료 스케줄 템플릿을 정수 비트맵으로 컴파일하여 예약 가능 슬롯을 계산합니다.
+
+하루의 슬롯은 시작 시각 순으로 인덱스를 가지며, i 번째 비트가 i 번째 슬롯을 나타낸다.
+예약 가능 여부는 `open_mask & ~full_mask & ~cutoff_mask` 같은 비트 연산으로 구한다.
+"""
+import os
+import time as time_module
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Container, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from entities.entities import TScheduleTemplate
+
+# 템플릿이 없는 병원의 기본값: 월~일 9:00~19:00, 30분 간격, 슬롯당 1건
+DEFAULT_OPEN_TIME = time(9, 0)
+DEFAULT_CLOSE_TIME = time(19, 0)
+DEFAULT_SLOT_MINUTES = 30
+DEFAULT_CAPACITY = 1
+
+SCHEDULE_CACHE_TTL_SECONDS = float(os.environ.get("SCHEDULE_CACHE_TTL_SECONDS", "300"))
+
+
+class ScheduleRule(NamedTuple):
+    """한 요일의 진료 시간대 하나. (weekday: 0=월 ... 6=일)"""
+    weekday: int
+    open_time: time
+    close_time: time
+    slot_minutes: int
+    capacity: int
+
+
+class DaySchedule(NamedTuple):
+    """한 요일의 컴파일된 슬롯 정보."""
+    starts: Tuple[int, ...]        # 슬롯 시작 시각 (자정부터의 초), 오름차순
+    labels: Tuple[str, ...]        # "HH:MM"
+    capacity: Tuple[int, ...]      # 슬롯별 정원
+    index: Dict[int, int]          # 시작 시각(초) -> 비트 인덱스
+    open_mask: int                 # 모든 슬롯 비트가 1
+
+
+EMPTY_DAY = DaySchedule((), (), (), {}, 0)
+
+
+def _seconds(t: time) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+def compile_day(rules: Iterable[ScheduleRule]) -> DaySchedule:
+    slots: Dict[int, int] = {}
+    for rule in rules:
+        step = rule.slot_minutes * 60
+        start = _seconds(rule.open_time)
+        end = _seconds(rule.close_time)
+        while start + step <= end:
+            slots[start] = max(slots.get(start, 0), rule.capacity)
+            start += step
+    if not slots:
+        return EMPTY_DAY
+    starts = tuple(sorted(slots))
+    return DaySchedule(
+        starts=starts,
+        labels=tuple(f"{s // 3600:02d}:{s % 3600 // 60:02d}" for s in starts),
+        capacity=tuple(slots[s] for s in starts),
+        index={s: i for i, s in enumerate(starts)},
+        open_mask=(1 << len(starts)) - 1,
+    )
+
+
+def compile_week(rules: Iterable[ScheduleRule]) -> Tuple[DaySchedule, ...]:
+    """요일별(0=월 ... 6=일) DaySchedule 튜플을 만듭니다."""
+    by_weekday: List[List[ScheduleRule]] = [[] for _ in range(7)]
+    for rule in rules:
+        by_weekday[rule.weekday].append(rule)
+    return tuple(compile_day(day_rules) for day_rules in by_weekday)
+
+
+DEFAULT_RULES = [
+    ScheduleRule(weekday, DEFAULT_OPEN_TIME, DEFAULT_CLOSE_TIME, DEFAULT_SLOT_MINUTES, DEFAULT_CAPACITY)
+    for weekday in range(7)
+]
+DEFAULT_WEEK = compile_week(DEFAULT_RULES)
+
+
+def full_mask(day: DaySchedule, booked_times: Iterable[time]) -> int:
+    """예약 건수가 정원에 도달한 슬롯의 비트맵을 반환합니다. 템플릿 밖의 시각은 무시합니다."""
+    counts: Dict[int, int] = {}
+    mask = 0
+    for t in booked_times:
+        i = day.index.get(_seconds(t))
+        if i is None:
+            continue
+        n = counts.get(i, 0) + 1
+        counts[i] = n
+        if n >= day.capacity[i]:
+            mask |= 1 << i
+    return mask
+
+
+def cutoff_mask(day: DaySchedule, cutoff_seconds: int) -> int:
+    """시작 시각이 cutoff_seconds 이하인(이미 지난/너무 임박한) 슬롯의 비트맵."""
+    return (1 << bisect_right(day.starts, cutoff_seconds)) - 1
+
+
+def mask_labels(day: DaySchedule, mask: int) -> List[str]:
+    labels = []
+    while mask:
+        low = mask & -mask
+        labels.append(day.labels[low.bit_length() - 1])
+        mask ^= low
+    return labels
+
+
+def first_slot(day: DaySchedule, mask: int) -> Optional[int]:
+    """mask 에서 가장 이른 슬롯의 시작 시각(초). 없으면 None."""
+    if not mask:
+        return None
+    return day.starts[(mask & -mask).bit_length() - 1]
+
+
+def slot_capacity(week: Tuple[DaySchedule, ...], day: date, t: time) -> Optional[int]:
+    """해당 날짜/시각 슬롯의 정원. 템플릿에 없는 시각이면 None."""
+    schedule = week[day.weekday()]
+    i = schedule.index.get(_seconds(t))
+    if i is None:
+        return None
+    return schedule.capacity[i]
+
+
+def compute_availability(
+    week: Tuple[DaySchedule, ...],
+    days: Iterable[date],
+    closed_days: Container[date],
+    booked: Dict[date, List[time]],
+    now: datetime,
+    lead_time: timedelta,
+) -> Tuple[Dict[str, List[str]], datetime]:
+    """기간 내 예약 가능 슬롯과, 시간 경과로 결과가 바뀌는 시각(expires_at)을 반환합니다.
+
+    - closed_days 에 포함된 날(set 또는 holiday_calendar.HolidayCalendar)과 가능한 슬롯이 없는 날은 결과에서 제외된다.
+    - 당일은 now + lead_time 이후에 시작하는 슬롯만 포함한다.
+    """
+    today = now.date()
+    cutoff = now + lead_time
+    expires_at = datetime.combine(today + timedelta(days=1), time.min)
+    result: Dict[str, List[str]] = {}
+    for day in days:
+        if day in closed_days:
+            continue
+        schedule = week[day.weekday()]
+        mask = schedule.open_mask & ~full_mask(schedule, booked.get(day, ()))
+        if day == today:
+            if cutoff.date() > today:
+                mask = 0
+            else:
+                mask &= ~cutoff_mask(schedule, _seconds(cutoff.time()))
+            start = first_slot(schedule, mask)
+            if start is not None:
+                expires_at = min(expires_at, datetime.combine(today, time.min) + timedelta(seconds=start) - lead_time)
+        if mask:
+            result[day.strftime("%Y-%m-%d")] = mask_labels(schedule, mask)
+    return result, expires_at
+
+
+class WeekScheduleCache:
+    """병원별 컴파일된 주간 스케줄 캐시. 템플릿 변경 시 invalidate 한다."""
+
+    def __init__(self, max_age_seconds: float = SCHEDULE_CACHE_TTL_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._entries: Dict[int, Tuple[float, Tuple[DaySchedule, ...]]] = {}
+
+    def get(self, hospital_id: int) -> Optional[Tuple[DaySchedule, ...]]:
+        entry = self._entries.get(hospital_id)
+        if entry is None or time_module.monotonic() - entry[0] > self.max_age_seconds:
+            return None
+        return entry[1]
+
+    def set(self, hospital_id: int, week: Tuple[DaySchedule, ...]) -> None:
+        self._entries[hospital_id] = (time_module.monotonic(), week)
+
+    def invalidate(self, hospital_id: int) -> None:
+        self._entries.pop(hospital_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+week_schedule_cache = WeekScheduleCache()
+
+
+async def load_schedule_rules(db: AsyncSession, hospital_id: int) -> List[ScheduleRule]:
+    """병원의 스케줄 템플릿 행을 ScheduleRule 목록으로 읽습니다."""
+    result = await db.execute(
+        select(
+            TScheduleTemplate.weekday,
+            TScheduleTemplate.open_time,
+            TScheduleTemplate.close_time,
+            TScheduleTemplate.slot_minutes,
+            TScheduleTemplate.capacity,
+        ).filter(
+            TScheduleTemplate.hospital_id == hospital_id,
+            TScheduleTemplate.deleted_flag == False,
+        ).order_by(TScheduleTemplate.weekday, TScheduleTemplate.open_time)
+    )
+    return [ScheduleRule(*row) for row in result.all()]
+
+
+async def get_week_schedule(db: AsyncSession, hospital_id: int) -> Tuple[DaySchedule, ...]:
+    """컴파일된 주간 스케줄을 반환합니다. 템플릿이 없으면 기본 스케줄을 사용합니다."""
+    week = week_schedule_cache.get(hospital_id)
+    if week is None:
+        rules = await load_schedule_rules(db, hospital_id)
+        week = compile_week(rules) if rules else DEFAULT_WEEK
+        week_schedule_cache.set(hospital_id, week)
+    return week
+
+
+async def warm_week_schedules(db: AsyncSession, hospital_ids: Iterable[int]) -> int:
+    """여러 병원의 주간 스케줄을 한 번의 조회로 읽어 캐시에 넣습니다. (기동 시 워밍업)"""
+    hospital_ids = list(hospital_ids)
+    if not hospital_ids:
+        return 0
+    result = await db.execute(
+        select(
+            TScheduleTemplate.hospital_id,
+            TScheduleTemplate.weekday,
+            TScheduleTemplate.open_time,
+            TScheduleTemplate.close_time,
+            TScheduleTemplate.slot_minutes,
+            TScheduleTemplate.capacity,
+        ).filter(
+            TScheduleTemplate.hospital_id.in_(hospital_ids),
+            TScheduleTemplate.deleted_flag == False,
+        ).order_by(TScheduleTemplate.hospital_id, TScheduleTemplate.weekday, TScheduleTemplate.open_time)
+    )
+    rules: Dict[int, List[ScheduleRule]] = {}
+    for hospital_id, *rule in result.all():
+        rules.setdefault(hospital_id, []).append(ScheduleRule(*rule))
+    for hospital_id in hospital_ids:
+        week_schedule_cache.set(hospital_id, compile_week(rules[hospital_id]) if hospital_id in rules else DEFAULT_WEEK)
+    return len(hospital_ids)
@@ -0,0 +1,125 @@
+from datetime import date, time
+from typing import Dict, Iterable, Set, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from entities.entities import TSlotOccupancy
+
+_table = TSlotOccupancy.__table__
+_c = _table.c
+
+
+def _slot_filter(hospital_id: int, reservation_date: date, reservation_time: time):
+    return (
+        _c.hospital_id == hospital_id,
+        _c.reservation_date == reservation_date,
+        _c.reservation_time == reservation_time,
+    )
+
+
+def _insert_if_missing(dialect_name: str, values):
+    """슬롯 행이 없을 때만 만드는 INSERT. 동시에 같은 행을 만들려는 요청이 있어도 오류가 나지 않는다.
+
+    values 는 한 행(dict) 또는 여러 행(list of dict, 다중 행 INSERT 한 문장)이다.
+    """
+    if dialect_name == "mysql":
+        stmt = mysql.insert(_table).values(values)
+        return stmt.on_duplicate_key_update(hospital_id=stmt.inserted.hospital_id)
+    if dialect_name == "sqlite":
+        return sqlite.insert(_table).values(values).on_conflict_do_nothing()
+    raise NotImplementedError(f"Unsupported dialect for slot ledger: {dialect_name}")
+
+
+async def claim_slot(
+    db: AsyncSession,
+    hospital_id: int,
+    reservation_date: date,
+    reservation_time: time,
+    limit: int,
+    max_count: int,
+) -> bool:
+    """슬롯의 예약 수를 1 늘립니다. 이미 limit 건 이상이면 False.
+
+    조건부 UPDATE 한 문장으로 확인과 증가를 동시에 하므로, 동시에 들어온 예약도
+    행 잠금 순서대로 처리되어 정원을 넘지 않는다. max_count 는 CHECK 제약으로
+    DB 가 보장하는 상한이며 limit <= max_count 여야 한다.
+    """
+    if limit <= 0:
+        return False
+
+    # 행을 먼저 만들고(이미 있으면 그대로) UPDATE 한다. 없는 키를 UPDATE 하면 InnoDB(REPEATABLE READ)는
+    # 유니크 인덱스에 갭 락을 잡고, 같은 슬롯의 첫 예약 두 건이 서로의 INSERT 를 기다려 교착(1213)에 빠진다.
+    await db.execute(_insert_if_missing(db.bind.dialect.name, {
+        "hospital_id": hospital_id,
+        "reservation_date": reservation_date,
+        "reservation_time": reservation_time,
+        "booked_count": 0,
+        "max_count": max_count,
+    }))
+    result = await db.execute(update(_table).where(
+        *_slot_filter(hospital_id, reservation_date, reservation_time),
+        _c.booked_count < limit,
+    ).values(booked_count=_c.booked_count + 1, max_count=max_count))
+    return bool(result.rowcount)
+
+Slot = Tuple[date, time]
+
+
+async def load_booked_counts(db: AsyncSession, hospital_id: int, slots: Iterable[Slot]) -> Dict[Slot, int]:
+    """여러 슬롯의 현재 예약 수를 한 번의 조회로 읽습니다. 원장에 행이 없는 슬롯은 0."""
+    counts = {slot: 0 for slot in slots}
+    if not counts:
+        return counts
+    result = await db.execute(select(_c.reservation_date, _c.reservation_time, _c.booked_count).where(
+        _c.hospital_id == hospital_id,
+        _c.reservation_date.in_({reservation_date for reservation_date, _ in counts}),
+    ))
+    for reservation_date, reservation_time, booked_count in result.all():
+        if (reservation_date, reservation_time) in counts:
+            counts[(reservation_date, reservation_time)] = booked_count
+    return counts
+
+
+async def claim_slots(db: AsyncSession, hospital_id: int, claims: Dict[Slot, int], limits: Dict[Slot, int]) -> Set[Slot]:
+    """여러 슬롯의 예약 수를 슬롯별로 claims[slot] 만큼 늘리고, 성공한 슬롯의 집합을 반환합니다.
+
+    없는 슬롯 행은 다중 행 INSERT 한 문장으로 만든 뒤, 슬롯마다 claim_slot 과 같은 조건부 UPDATE
+    (booked_count + n <= limit) 로 늘린다. 한 슬롯의 n 건은 모두 성공하거나 모두 실패한다.
+    limits[slot] 은 DB 의 상한(max_count)으로도 쓰인다. (관리자 예약: 정원 + ADMIN_EXTRA_CAPACITY)
+
+    INSERT 와 UPDATE 모두 슬롯 순서(정렬)로 행을 잠근다. 요청의 항목 순서대로 잠그면 겹치는 슬롯을
+    다른 순서로 보낸 두 요청이 서로의 행 잠금을 기다려 교착에 빠진다.
+    """
+    if not claims:
+        return set()
+    slots = sorted(claims)
+    await db.execute(_insert_if_missing(db.bind.dialect.name, [
+        {
+            "hospital_id": hospital_id,
+            "reservation_date": reservation_date,
+            "reservation_time": reservation_time,
+            "booked_count": 0,
+            "max_count": limits[(reservation_date, reservation_time)],
+        }
+        for reservation_date, reservation_time in slots
+    ]))
+    claimed = set()
+    for slot in slots:
+        n = claims[slot]
+        result = await db.execute(update(_table).where(
+            *_slot_filter(hospital_id, *slot),
+            _c.booked_count + n <= limits[slot],
+        ).values(booked_count=_c.booked_count + n, max_count=limits[slot]))
+        if result.rowcount:
+            claimed.add(slot)
+    return claimed
+
+
+async def release_slot(db: AsyncSession, hospital_id: int, reservation_date: date, reservation_time: time) -> None:
+    """예약 취소 시 슬롯의 예약 수를 1 줄입니다."""
+    await db.execute(update(_table).where(
+        *_slot_filter(hospital_id, reservation_date, reservation_time),
+        _c.booked_count > 0,
+    ).values(booked_count=_c.booked_count - 1))